@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Latency of sklearn vs compiled random-forest inference by batch size
+
+Trains a forest the way FishLocationPredictor does (or loads one with
+--model), compiles it with CompiledForest and reports p50/p99 latency of
+both predict paths for each batch size, checking that every prediction is
+bit-identical.
+
+    python benchmarks/bench_compiled_forest.py --batches 1 10 100 1000 10000
+    python benchmarks/bench_compiled_forest.py --model models/trained_models/tuna/default/<version>.joblib
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import joblib
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from ai_models.compiled_forest import CompiledForest
+from ai_models.fish_predictor import FEATURES, COMPILED_MAX_ROWS, fit_random_forest
+from ai_models.training_features import TrainingFeatureBuilder
+from data_processing.data_cleaner import DataCleaner
+from data_processing.satellite_loader import SatelliteDataLoader
+
+
+def training_frame(days: int, resolution: float):
+    aoi = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+    start = datetime(2024, 1, 1)
+    end = start + timedelta(days=days - 1)
+    cells = SatelliteDataLoader(use_cache=False).load_gridded_data(start, end, aoi, resolution).to_frame()
+    return TrainingFeatureBuilder().build(DataCleaner().clean_ocean_data(cells))
+
+
+def latencies(predict, X, repeats: int) -> np.ndarray:
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        timings[i] = time.perf_counter() - start
+    return timings * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', help='joblib file of a trained forest (default: train one)')
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--resolution', type=float, default=1.0)
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 10, 100, 1000, 10000])
+    parser.add_argument('--budget', type=float, default=3.0, help='seconds per batch size and mode')
+    args = parser.parse_args()
+
+    data = training_frame(args.days, args.resolution)
+    if args.model:
+        model = joblib.load(args.model)
+    else:
+        print(f"🌲 Training on {len(data):,} rows...")
+        model, _ = fit_random_forest(data[FEATURES], data['tuna_probability'])
+
+    start = time.perf_counter()
+    compiled = CompiledForest.from_sklearn(model)
+    print(f"⚙️ Compiled {compiled.n_trees} trees, {len(compiled.value):,} nodes, depth "
+          f"{compiled.max_depth} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = np.random.default_rng(0)
+    print(f"\n{'batch':>6} {'sklearn p50':>12} {'p99':>8} {'compiled p50':>13} {'p99':>8} "
+          f"{'speedup':>8} {'identical':>10}")
+    for batch in args.batches:
+        X = data[FEATURES].iloc[rng.integers(0, len(data), batch)]
+        X_array = X.to_numpy()
+        identical = np.array_equal(model.predict(X), compiled.predict(X_array))
+
+        # Size the repeat count so each mode gets roughly the same time budget
+        probe = latencies(model.predict, X, 3).mean() / 1000
+        repeats = int(np.clip(args.budget / max(probe, 1e-6), 20, 2000))
+        reference = latencies(model.predict, X, repeats)
+        fast = latencies(compiled.predict, X_array, repeats)
+        ref50, ref99 = np.percentile(reference, [50, 99])
+        fast50, fast99 = np.percentile(fast, [50, 99])
+        print(f"{batch:>6} {ref50:>10.2f}ms {ref99:>6.2f}ms {fast50:>11.2f}ms {fast99:>6.2f}ms "
+              f"{ref50 / fast50:>7.1f}x {'✅' if identical else '❌':>9}")
+
+    print(f"\n'auto' inference uses the compiled forest up to {COMPILED_MAX_ROWS} rows")
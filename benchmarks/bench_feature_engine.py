@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Daily feature refresh: incremental update vs recomputing the history
+
+Backfills OceanFeatureEngine over --history-days of gridded data, then
+adds --new-days more days one at a time with update() and compares each
+against rebuilding every feature from scratch with transform() over the
+whole history, checking both give the same fields.
+
+    python benchmarks/bench_feature_engine.py --history-days 365 --resolution 0.25
+    python benchmarks/bench_feature_engine.py --history-days 730 --resolution 0.1 --new-days 3
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from data_processing.feature_engine import OceanFeatureEngine
+from data_processing.satellite_loader import SatelliteDataLoader
+
+AOI = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+
+
+def state_mb(engine: OceanFeatureEngine) -> float:
+    arrays = [array for name in engine.variables
+              for array in (engine.rolling[name].buffer, engine.rolling[name].sums,
+                            engine.rolling[name].counts, engine.climatology[name].sums,
+                            engine.climatology[name].counts)]
+    return sum(array.nbytes for array in arrays) / 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--history-days', type=int, default=365)
+    parser.add_argument('--new-days', type=int, default=5)
+    parser.add_argument('--resolution', type=float, default=0.25)
+    parser.add_argument('--climatology-years', type=int, default=2)
+    args = parser.parse_args()
+
+    loader = SatelliteDataLoader(use_cache=False)
+    start = datetime(2023, 1, 1)
+    end = start + timedelta(days=args.history_days + args.new_days - 1)
+    grid = loader.load_gridded_data(start, end, AOI, args.resolution)
+    reference = loader.load_gridded_data(start - timedelta(days=365 * args.climatology_years),
+                                         start - timedelta(days=1), AOI, args.resolution)
+    history = args.history_days
+    print(f"🗺️ {grid.shape[1]}x{grid.shape[2]} grid at {args.resolution}°, {history} days of history, "
+          f"climatology from {args.climatology_years} years")
+
+    engine = OceanFeatureEngine.for_grid(grid).fit_climatology(reference)
+    began = time.perf_counter()
+    engine.transform(type(grid)(grid.dates[:history], grid.lats, grid.lons,
+                                {name: cube[:history] for name, cube in grid.variables.items()},
+                                grid.resolution))
+    print(f"📚 Backfill transform: {time.perf_counter() - began:.2f}s, engine state {state_mb(engine):.1f} MB")
+
+    incremental, recompute, worst = [], [], 0.0
+    for t in range(history, history + args.new_days):
+        day = pd.Timestamp(grid.dates[t]).to_pydatetime()
+        began = time.perf_counter()
+        features = engine.update(day, {name: grid[name][t] for name in engine.variables})
+        incremental.append(time.perf_counter() - began)
+
+        began = time.perf_counter()
+        fresh = OceanFeatureEngine.for_grid(grid).fit_climatology(reference)
+        window = type(grid)(grid.dates[:t + 1], grid.lats, grid.lons,
+                            {name: cube[:t + 1] for name, cube in grid.variables.items()}, grid.resolution)
+        full = fresh.transform(window)
+        recompute.append(time.perf_counter() - began)
+
+        for name, field in features.items():
+            worst = max(worst, float(np.nanmax(np.abs(field - full[name][-1]))))
+
+    step, rebuild = np.median(incremental), np.median(recompute)
+    print(f"\n{'per new day':<28}{'median ms':>12}")
+    print(f"{'incremental update()':<28}{step * 1000:>12.1f}")
+    print(f"{'recompute transform()':<28}{rebuild * 1000:>12.1f}   ({rebuild / step:.0f}x slower)")
+    print(f"\n✅ max |incremental - recomputed| over {len(features)} features: {worst:.2e}")
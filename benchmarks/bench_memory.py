@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Memory footprint of the gridded load → clean → features → predict pipeline
+
+Runs a multi-year per-cell backfill through every stage and reports each
+stage's output frame size (deep, strings included), the size the same
+frame would have with the wide float64/int64/object dtypes, and the
+tracemalloc peak and wall time of the whole run.
+
+    python benchmarks/bench_memory.py --years 2
+    python benchmarks/bench_memory.py --years 1 --resolution 0.5 --train-days 30
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from ai_models.fish_predictor import FishLocationPredictor, FEATURES, fit_random_forest
+from ai_models.training_features import TrainingFeatureBuilder
+from data_processing.data_cleaner import DataCleaner
+from data_processing.satellite_loader import SatelliteDataLoader
+
+AOI = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+
+
+def frame_mb(frame: pd.DataFrame) -> float:
+    return frame.memory_usage(deep=True, index=True).sum() / 1e6
+
+
+def widen(frame: pd.DataFrame) -> pd.DataFrame:
+    """The same frame with float64 floats, int64 ints and object strings"""
+    wide = {}
+    for column, values in frame.items():
+        if isinstance(values.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(values):
+            wide[column] = values.astype(object)
+        elif pd.api.types.is_float_dtype(values):
+            wide[column] = values.astype(np.float64)
+        elif pd.api.types.is_integer_dtype(values):
+            wide[column] = values.astype(np.int64)
+        else:
+            wide[column] = values
+    return pd.DataFrame(wide, index=frame.index)
+
+
+def run_pipeline(start: datetime, days: int, resolution: float, species: list, model_dir: str):
+    loader = SatelliteDataLoader(use_cache=False)
+    cleaner = DataCleaner()
+    predictor = FishLocationPredictor(model_dir)
+    stages, timings = {}, {}
+
+    began = time.perf_counter()
+    stages['load'] = loader.load_gridded_data(start, start + timedelta(days=days - 1), AOI,
+                                              resolution).to_frame()
+    timings['load'] = time.perf_counter() - began
+
+    began = time.perf_counter()
+    stages['clean'] = cleaner.clean_ocean_data(stages['load'])
+    timings['clean'] = time.perf_counter() - began
+
+    began = time.perf_counter()
+    stages['features'] = cleaner.create_fishing_features(stages['clean'])
+    timings['features'] = time.perf_counter() - began
+
+    began = time.perf_counter()
+    stages['predict'] = predictor.predict_species_batch(stages['features'], species)
+    timings['predict'] = time.perf_counter() - began
+    return stages, timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=float, default=2.0)
+    parser.add_argument('--resolution', type=float, default=1.0)
+    parser.add_argument('--species', nargs='+', default=['tuna', 'skipjack'])
+    parser.add_argument('--train-days', type=int, default=0,
+                        help='train and publish a forest per species first (default: heuristic predictor)')
+    args = parser.parse_args()
+
+    days = int(round(args.years * 365))
+    start = datetime(2022, 1, 1)
+    with tempfile.TemporaryDirectory() as model_dir:
+        if args.train_days:
+            cells = SatelliteDataLoader(use_cache=False).load_gridded_data(
+                start, start + timedelta(days=args.train_days - 1), AOI, 1.0).to_frame()
+            training = TrainingFeatureBuilder().build(DataCleaner().clean_ocean_data(cells))
+            publisher = FishLocationPredictor(model_dir)
+            for name in args.species:
+                model, _ = fit_random_forest(training[FEATURES], training[f'{name}_probability'],
+                                             {'n_estimators': 20})
+                publisher.registry.publish(model, name)
+
+        tracemalloc.start()
+        stages, timings = run_pipeline(start, days, args.resolution, args.species, model_dir)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    rows = len(stages['load'])
+    print(f"🗺️ {days} days at {args.resolution}° → {rows:,} cells, species {args.species}")
+    print(f"{'stage':<10}{'columns':>9}{'frame MB':>11}{'wide MB':>10}{'ratio':>8}{'seconds':>10}")
+    for name, frame in stages.items():
+        compact, wide = frame_mb(frame), frame_mb(widen(frame))
+        print(f"{name:<10}{frame.shape[1]:>9}{compact:>11.1f}{wide:>10.1f}{wide / compact:>7.1f}x"
+              f"{timings[name]:>10.2f}")
+    print(f"\n📊 tracemalloc peak {peak / 1e6:.1f} MB ({peak / rows:.0f} bytes/cell), "
+          f"total {sum(timings.values()):.2f}s")
+    print("dtypes:", ', '.join(f"{column}={dtype}" for column, dtype in stages['predict'].dtypes.items()))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Lookup-table vs exact prediction for gridded nationwide maps
+
+Trains a forest like FishLocationPredictor (or loads one with --model),
+precomputes its PredictionLUT and reports build time, the max / p99 /
+mean absolute error against the exact model, and the time to predict a
+full 0.05° Indonesia map both ways.
+
+    python benchmarks/bench_prediction_lut.py --map-days 3
+    python benchmarks/bench_prediction_lut.py --sst-step 0.02 --chlorophyll-step 0.005
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import joblib
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from ai_models.fish_predictor import FishLocationPredictor, FEATURES, fit_random_forest
+from ai_models.prediction_lut import PredictionLUT, LUT_DEFAULTS
+from ai_models.training_features import TrainingFeatureBuilder
+from data_processing.data_cleaner import DataCleaner
+from data_processing.satellite_loader import SatelliteDataLoader
+
+AOI = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+
+
+def ocean_frame(start: datetime, days: int, resolution: float):
+    end = start + timedelta(days=days - 1)
+    cells = SatelliteDataLoader(use_cache=False).load_gridded_data(start, end, AOI, resolution).to_frame()
+    return DataCleaner().clean_ocean_data(cells)
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def report(name: str, lut: PredictionLUT, build_seconds: float, exact_seconds: float,
+           lut_seconds: float, map_error: float, rows: int):
+    print(f"\n{name}")
+    print(f"  table {lut.table.shape} ({lut.table.nbytes / 1e6:.1f} MB), built in {build_seconds:.1f}s")
+    print(f"  error vs exact (build sample): max {lut.error['max']:.4f}  p99 {lut.error['p99']:.4f}  "
+          f"mean {lut.error['mean']:.5f}")
+    print(f"  {rows:,}-cell map: exact {exact_seconds * 1000:.0f} ms, lut {lut_seconds * 1000:.0f} ms "
+          f"({exact_seconds / lut_seconds:.0f}x), max map error {map_error:.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', help='joblib file of a trained forest (default: train one)')
+    parser.add_argument('--train-days', type=int, default=60)
+    parser.add_argument('--map-days', type=int, default=3)
+    parser.add_argument('--map-resolution', type=float, default=0.05)
+    parser.add_argument('--sst-step', type=float, default=LUT_DEFAULTS['sst_step'])
+    parser.add_argument('--chlorophyll-step', type=float, default=LUT_DEFAULTS['chlorophyll_step'])
+    args = parser.parse_args()
+
+    options = {'sst_step': args.sst_step, 'chlorophyll_step': args.chlorophyll_step}
+    ocean_map = ocean_frame(datetime(2024, 3, 1), args.map_days, args.map_resolution)
+    print(f"🗺️ Map: {len(ocean_map):,} cells ({args.map_days} days at {args.map_resolution}°)")
+
+    # Random forest
+    training = TrainingFeatureBuilder().build(ocean_frame(datetime(2024, 1, 1), args.train_days, 1.0))
+    if args.model:
+        model = joblib.load(args.model)
+    else:
+        model, _ = fit_random_forest(training[FEATURES], training['tuna_probability'])
+    # No gate here: the bench reports the error whether or not the table would be served
+    predictor = FishLocationPredictor(os.path.join(ROOT, 'models', 'bench_lut'),
+                                      lut_options={**options, 'max_error': np.inf})
+    predictor._add_calendar_features(ocean_map)
+    X_map = ocean_map[FEATURES]
+
+    lut, build_seconds = timed(predictor.build_lut, model, 'tuna', 'default', 'bench', sample=training)
+    expected, exact_seconds = timed(predictor._exact_predict, model, X_map)
+    approx, lut_seconds = timed(lut.predict, X_map['sst'].to_numpy(), X_map['chlorophyll'].to_numpy(),
+                                X_map['month'].to_numpy(), exact=predictor._feature_predict(model))
+    report('FishLocationPredictor (random forest)', lut, build_seconds, exact_seconds, lut_seconds,
+           float(np.abs(approx - expected).max()), len(ocean_map))
+    os.remove(predictor.lut_path('tuna', 'default', 'bench'))
+    gate = LUT_DEFAULTS['max_error']
+    print(f"\nFishLocationPredictor(inference='lut') serves the table only if max error <= {gate} "
+          f"(lut_options['max_error']): {'passes' if lut.max_error <= gate else 'fails, build_lut raises'}")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Startup cost: cold import, warm-up and first-request latency in fresh interpreters
+
+Every measurement runs in a new ``python -X importtime`` process so module
+caches never carry over. Reports the wall time to import the dashboard
+app, the heaviest imports it pulls in, the first compliance and
+prediction requests with and without warm_up(), and a full ``run.py``.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 5 --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Child process: times each phase with perf_counter and prints one JSON line
+PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {src!r})
+timings = {{}}
+start = time.perf_counter()
+from dashboard import app as dashboard
+timings['import'] = time.perf_counter() - start
+if {warm!r}:
+    start = time.perf_counter()
+    dashboard.warm_up()
+    timings['warm_up'] = time.perf_counter() - start
+client = dashboard.app.test_client()
+requests = [
+    ('compliance', '/api/compliance-check', {{'species': 'tuna', 'date': '2024-03-01',
+        'gear_type': 'longline', 'proposed_catch': 500.0, 'lon': 110.0, 'lat': -3.0}}),
+    ('prediction', '/api/fish-prediction', {{'species': 'tuna', 'start_date': '2024-03-01',
+        'end_date': '2024-03-31'}}),
+]
+for name, path, body in requests:
+    start = time.perf_counter()
+    status = client.post(path, json=body).status_code
+    timings[f'first_{{name}}'] = time.perf_counter() - start
+    assert status == 200, (path, status)
+timings['modules'] = {{name: name in sys.modules for name in ('pandas', 'sklearn', 'joblib')}}
+print('PROBE ' + json.dumps(timings))
+"""
+
+
+def run_probe(warm: bool) -> tuple:
+    """(timings dict, importtime lines) from one fresh interpreter"""
+    code = PROBE.format(src=os.path.join(ROOT, 'src'), warm=warm)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    line = next(line for line in result.stdout.splitlines() if line.startswith('PROBE '))
+    return json.loads(line[len('PROBE '):]), result.stderr.splitlines()
+
+
+def cumulative_imports(importtime_lines: list) -> dict:
+    """Top-level module -> cumulative import microseconds from -X importtime output"""
+    totals = {}
+    for line in importtime_lines:
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith('  '):  # nested import, already counted in its parent
+            continue
+        totals[name.strip()] = totals.get(name.strip(), 0) + int(cumulative)
+    return totals
+
+
+def time_script(path: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, path], cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='fresh processes per scenario')
+    parser.add_argument('--top', type=int, default=10, help='heaviest top-level imports to list')
+    parser.add_argument('--output', help='write the median timings as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for warm in (False, True):
+        scenario = 'warm_up' if warm else 'lazy'
+        runs = [run_probe(warm) for _ in range(args.repeat)]
+        phases = [key for key in runs[0][0] if key != 'modules']
+        results[scenario] = {phase: float(np.median([timings[phase] for timings, _ in runs]))
+                             for phase in phases}
+        print(f"\n🚀 {scenario} ({args.repeat} fresh processes, median)")
+        for phase, seconds in results[scenario].items():
+            print(f"  {phase:<20} {seconds * 1000:9.1f} ms")
+        if not warm:
+            print(f"  loaded after first requests: {runs[-1][0]['modules']}")
+            imports = cumulative_imports(runs[-1][1])
+            print(f"\n📦 Heaviest top-level imports (whole process)")
+            for name, micros in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+                print(f"  {name:<40} {micros / 1000:9.1f} ms")
+
+    results['run.py'] = float(np.median([time_script(os.path.join(ROOT, 'run.py'))
+                                         for _ in range(args.repeat)]))
+    print(f"\n🖥️ run.py end to end: {results['run.py'] * 1000:.0f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"💾 Timings written to {args.output}")
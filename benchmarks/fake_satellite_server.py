@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Local stand-in for a remote ERDDAP-style satellite tile server
+
+Serves ``/{variable}/{resolution}/{YYYYMMDD}/{row}_{col}.npy`` tiles with the
+same deterministic values SatelliteDataLoader synthesizes, over HTTP/1.1
+keep-alive with Range support. Latency and a share of failed requests
+(503s and connections dropped mid-body) can be injected to exercise the
+fetcher's pooling, retry and resume paths; ``faults`` scripts the outcome
+of the first requests exactly, for tests.
+
+    python benchmarks/fake_satellite_server.py --port 8765 --latency 0.02
+"""
+import argparse
+import collections
+import io
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from data_processing.satellite_loader import SatelliteDataLoader
+
+TILE_PATTERN = re.compile(r'^/(sst|chlorophyll)/([0-9.]+)/(\d{8})/(-?\d+)_(-?\d+)\.npy$')
+RANGE_PATTERN = re.compile(r'^bytes=(\d+)-$')
+
+
+class FakeSatelliteServer:
+    """Threaded HTTP tile server running in the background of the current process"""
+
+    def __init__(self, port: int = 0, tile_size: int = 128, latency_seconds: float = 0.0,
+                 failure_rate: float = 0.0, seed: int = 7, faults: list = None):
+        self.tile_size = tile_size
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.counters = {'requests': 0, 'connections': 0, 'range_requests': 0,
+                         'errors': 0, 'dropped': 0, 'bytes': 0}
+        self._random = random.Random(seed)
+        self._scripted = collections.deque(faults or [])
+        self._lock = threading.Lock()
+        self._workdir = tempfile.TemporaryDirectory()
+        self._loader = SatelliteDataLoader(self._workdir.name, use_cache=False)
+        self._tile_body = lru_cache(maxsize=1024)(self._render_tile)
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _render_tile(self, variable: str, resolution: float, day: str, row: int, col: int) -> bytes:
+        size = self.tile_size
+        date = np.array([np.datetime64(f"{day[:4]}-{day[4:6]}-{day[6:]}", 'D')])
+        tile = self._loader._synthesize(variable, date, np.arange(row * size, (row + 1) * size),
+                                        np.arange(col * size, (col + 1) * size), resolution)[0]
+        buffer = io.BytesIO()
+        np.save(buffer, tile)
+        return buffer.getvalue()
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self.counters[name] += value
+
+    def _fault(self):
+        """None, 'error' (503) or 'drop' (close mid-body): scripted faults first, then drawn at failure_rate"""
+        with self._lock:
+            if self._scripted:
+                return self._scripted.popleft()
+            draw = self._random.random()
+        if draw >= self.failure_rate:
+            return None
+        return 'error' if draw < self.failure_rate / 2 else 'drop'
+
+    def _handler_class(self):
+        server = self
+
+        class TileHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                server._count(connections=1)
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server._count(requests=1)
+                if server.latency_seconds:
+                    time.sleep(server.latency_seconds)
+                match = TILE_PATTERN.match(self.path)
+                if match is None:
+                    self._reply(404, b'not found')
+                    return
+                variable, resolution, day, row, col = match.groups()
+                body = server._tile_body(variable, float(resolution), day, int(row), int(col))
+
+                fault = server._fault()
+                if fault == 'error':
+                    server._count(errors=1)
+                    self._reply(503, b'busy')
+                    return
+
+                start = 0
+                requested = RANGE_PATTERN.match(self.headers.get('Range', ''))
+                if requested:
+                    server._count(range_requests=1)
+                    start = int(requested.group(1))
+                    if start >= len(body):
+                        self._reply(416, b'')
+                        return
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+                else:
+                    self.send_response(200)
+                payload = body[start:]
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.end_headers()
+
+                if fault == 'drop':
+                    # Send part of the body, then hang up without finishing it
+                    server._count(dropped=1, bytes=len(payload) // 2)
+                    self.wfile.write(payload[:len(payload) // 2])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(payload)
+                server._count(bytes=len(payload))
+
+            def _reply(self, status: int, body: bytes):
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return TileHandler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._workdir.cleanup()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake satellite tile server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds added per request')
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    with FakeSatelliteServer(args.port, latency_seconds=args.latency,
+                             failure_rate=args.failure_rate) as server:
+        print(f"🛰️ Serving fake satellite tiles at {server.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"\n{server.stats()}")
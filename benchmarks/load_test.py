@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Load test for the dashboard API against a local instance
+
+Either targets an already running server (--url) or spawns
+src/dashboard/serve.py once per worker count in --spawn and compares
+throughput, so scaling with cores is visible in one run:
+
+    python benchmarks/load_test.py --spawn 1,2,4 --concurrency 16 --requests 800
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --concurrency 8
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from urllib.parse import urlparse
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SERVE = os.path.join(ROOT, 'src', 'dashboard', 'serve.py')
+
+
+def _payload(i: int, unique: bool) -> bytes:
+    """Fish-prediction request; unique date windows keep the response cache out of the way"""
+    start = date(2024, 1, 1) + timedelta(days=(i % 300) if unique else 0)
+    return json.dumps({
+        'species': 'tuna',
+        'start_date': start.isoformat(),
+        'end_date': (start + timedelta(days=30)).isoformat()
+    }).encode()
+
+
+def _client(args):
+    url, offset, count, unique = args
+    target = urlparse(url)
+    connection = http.client.HTTPConnection(target.hostname, target.port, timeout=60)
+    latencies, errors = [], 0
+    for i in range(offset, offset + count):
+        start = time.perf_counter()
+        connection.request('POST', '/api/fish-prediction', body=_payload(i, unique),
+                           headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        errors += response.status != 200
+    connection.close()
+    return latencies, errors
+
+
+def run_load(url: str, concurrency: int, requests: int, unique: bool = True) -> dict:
+    per_client = max(1, requests // concurrency)
+    jobs = [(url, c * per_client, per_client, unique) for c in range(concurrency)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(concurrency) as pool:
+        results = pool.map(_client, jobs)
+    elapsed = time.perf_counter() - start
+    latencies = np.concatenate([np.asarray(r[0]) for r in results]) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': sum(r[1] for r in results),
+        'seconds': elapsed,
+        'throughput_rps': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99))
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 120):
+    target = urlparse(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection(target.hostname, target.port, timeout=2)
+            connection.request('GET', '/ready')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"server at {url} not ready after {timeout}s")
+
+
+def spawn_and_load(workers: int, args) -> dict:
+    port = _free_port()
+    url = f'http://127.0.0.1:{port}'
+    server = subprocess.Popen([sys.executable, SERVE, '--workers', str(workers),
+                               '--bind', f'127.0.0.1:{port}'], cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(url)
+        run_load(url, args.concurrency, args.concurrency * 2, not args.repeat)  # warm-up
+        return run_load(url, args.concurrency, args.requests, not args.repeat)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='existing server to target')
+    parser.add_argument('--spawn', default='1,2,4', help='worker counts to spawn and compare')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--repeat', action='store_true',
+                        help='send identical requests (measures the response cache)')
+    args = parser.parse_args()
+
+    print(f"🖥️ {multiprocessing.cpu_count()} CPU cores available")
+    if args.url:
+        _wait_ready(args.url)
+        result = run_load(args.url, args.concurrency, args.requests, not args.repeat)
+        print(json.dumps(result, indent=2))
+        return
+
+    baseline = None
+    for workers in [int(w) for w in args.spawn.split(',')]:
+        result = spawn_and_load(workers, args)
+        baseline = baseline or result['throughput_rps']
+        print(f"👷 {workers} workers: {result['throughput_rps']:.1f} req/s "
+              f"(x{result['throughput_rps'] / baseline:.2f}), p50 {result['p50_ms']:.1f} ms, "
+              f"p99 {result['p99_ms']:.1f} ms, errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
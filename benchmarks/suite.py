@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Benchmark suite for every pipeline stage and the dashboard endpoints
+
+Sweeps input size (days x grid cells x species) through the loader,
+cleaner, training, prediction and compliance stages, then load-tests the
+Flask routes through the test client. Each case reports throughput,
+p50/p95/p99 latency and peak traced memory; results are written as a JSON
+baseline that ``compare`` diffs against a later run:
+
+    python benchmarks/suite.py run --output benchmarks/baselines/local.json
+    python benchmarks/suite.py run --quick --output /tmp/after.json
+    python benchmarks/suite.py compare benchmarks/baselines/quick.json /tmp/after.json
+
+``compare`` exits with status 1 when any case's p50 latency or peak memory
+grew beyond the threshold, so it can gate CI. Back-to-back runs of the
+same code on a shared machine vary by up to ~25%, hence the 0.3 default;
+compare baselines recorded on the same hardware.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+AOI = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+START = datetime(2024, 3, 1)
+SPECIES = ['tuna', 'skipjack']
+
+# (days, resolution in degrees, number of species)
+FULL_SIZES = [(7, 1.0, 1), (30, 1.0, 1), (30, 0.5, 2), (90, 0.5, 2)]
+QUICK_SIZES = [(7, 1.0, 1), (30, 0.5, 2)]
+
+
+def measure(function, rows: int, budget: float, min_repeats: int = 3,
+            max_repeats: int = 200, trace_memory: bool = True) -> dict:
+    """Time repeated calls within a time budget, then one traced call for peak memory"""
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_repeats and (len(timings) < min_repeats or
+                                          time.perf_counter() - started < budget):
+        begin = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - begin)
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        function()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+    timings = np.array(timings) * 1000
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        'rows': rows,
+        'repeats': len(timings),
+        'mean_ms': float(timings.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'throughput_per_s': rows / (p50 / 1000) if p50 > 0 else None,
+        'peak_mb': peak_mb
+    }
+
+
+def stage_cases(sizes: list, budget: float, workdir: str) -> dict:
+    """Loader → cleaner → training → prediction → compliance, one case per stage and size"""
+    from data_processing.satellite_loader import SatelliteDataLoader
+    from data_processing.data_cleaner import DataCleaner
+    from ai_models.fish_predictor import FishLocationPredictor
+    from regulatory_engine.compliance_checker import FisheriesCompliance
+
+    results = {}
+    compliance = FisheriesCompliance()
+
+    for days, resolution, n_species in sizes:
+        species = SPECIES[:n_species]
+        end = START + timedelta(days=days - 1)
+        label = f"days={days},res={resolution:g},species={n_species}"
+        loader = SatelliteDataLoader(os.path.join(workdir, 'satellite'), resolution=resolution,
+                                     use_cache=False)
+        cleaner = DataCleaner()
+        predictor = FishLocationPredictor(os.path.join(workdir, f'models-{label}'))
+
+        daily = loader.load_historical_data(START, end, AOI)
+        cells = loader.load_gridded_data(START, end, AOI).to_frame()
+        cleaned = cleaner.clean_ocean_data(cells)
+        training = predictor.prepare_training_data(cleaned)
+
+        def record(stage, function, rows, **options):
+            key = f"{stage}[{label}]"
+            results[key] = {'stage': stage, 'days': days, 'resolution': resolution,
+                            'species': n_species, **measure(function, rows, budget, **options)}
+            print(f"  {key:<58} p50 {results[key]['p50_ms']:>9.2f} ms")
+
+        record('load_historical_data', lambda: loader.load_historical_data(START, end, AOI), len(daily))
+        record('load_gridded_data', lambda: loader.load_gridded_data(START, end, AOI).to_frame(), len(cells))
+        record('clean_ocean_data', lambda: cleaner.clean_ocean_data(cells), len(cells))
+        record('prepare_training_data', lambda: predictor.prepare_training_data(cleaned), len(cleaned))
+
+        def train_all():
+            for name in species:
+                predictor.train_model(training, name)
+        with _quiet():
+            record('train_model', train_all, len(training) * n_species, min_repeats=1, max_repeats=1,
+                   trace_memory=False)
+
+        def predict_all():
+            for name in species:
+                predictor.predict_fish_locations(cleaned.copy(), name)
+        record('predict_fish_locations', predict_all, len(cleaned) * n_species)
+        record('predict_species_batch', lambda: predictor.predict_species_batch(cleaned, species),
+               len(cleaned) * n_species)
+
+        trips = pd.DataFrame({
+            'species': np.resize(['tuna', 'skipjack', 'anchovy'], len(cleaned)),
+            'date': cleaned['date'].to_numpy(),
+            'gear_type': np.resize(['longline', 'purse_seine', 'trawl'], len(cleaned)),
+            'proposed_catch': np.resize([500.0, 8000.0, 25000.0], len(cleaned)),
+            'lon': cleaned['lon'].to_numpy(),
+            'lat': cleaned['lat'].to_numpy()
+        })
+        record('check_batch', lambda: compliance.check_batch(trips), len(trips))
+
+    def single_checks():
+        for lon in np.linspace(95, 141, 100):
+            compliance.check_fishing_approval('tuna', [lon, -2.0], START, 'longline', 500.0)
+    key = 'check_fishing_approval[calls=100]'
+    results[key] = {'stage': 'check_fishing_approval', **measure(single_checks, 100, budget)}
+    print(f"  {key:<58} p50 {results[key]['p50_ms']:>9.2f} ms")
+    return results
+
+
+class _quiet:
+    """Silence progress and fallback prints while timing"""
+
+    def __enter__(self):
+        self._stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+
+    def __exit__(self, *exc):
+        sys.stdout.close()
+        sys.stdout = self._stdout
+
+
+def endpoint_cases(requests: int, concurrency: int) -> dict:
+    """Load-test the Flask routes through the test client from concurrent threads"""
+    from dashboard import app as dashboard
+    with _quiet():
+        dashboard.warm_up()
+
+    def prediction_body(i, unique):
+        start = START + timedelta(days=(i % 200) if unique else 0)
+        return {'species': 'tuna', 'start_date': start.strftime('%Y-%m-%d'),
+                'end_date': (start + timedelta(days=30)).strftime('%Y-%m-%d')}
+
+    def compliance_body(i, unique):
+        return {'species': 'tuna', 'date': '2024-03-01', 'gear_type': 'longline',
+                'proposed_catch': 500.0 + (i if unique else 0), 'lon': 110.0, 'lat': -3.0}
+
+    routes = [
+        ('GET /ready', 'get', '/ready', None),
+        ('GET /api/dashboard-stats', 'get', '/api/dashboard-stats', None),
+        ('POST /api/compliance-check (cold)', 'post', '/api/compliance-check',
+         lambda i: compliance_body(i, True)),
+        ('POST /api/compliance-check (cached)', 'post', '/api/compliance-check',
+         lambda i: compliance_body(i, False)),
+        ('POST /api/fish-prediction (cold)', 'post', '/api/fish-prediction',
+         lambda i: prediction_body(i, True)),
+        ('POST /api/fish-prediction (cached)', 'post', '/api/fish-prediction',
+         lambda i: prediction_body(i, False)),
+        ('GET /tiles (warm)', 'get', '/tiles/tuna/2024-03-01/5/25/16.png', None),
+    ]
+
+    results = {}
+    for name, method, path, body in routes:
+        dashboard.response_cache.clear()
+        latencies = [[] for _ in range(concurrency)]
+        errors = [0] * concurrency
+        per_client = max(1, requests // concurrency)
+
+        def client(c):
+            test_client = dashboard.app.test_client()
+            for i in range(c * per_client, (c + 1) * per_client):
+                begin = time.perf_counter()
+                if method == 'get':
+                    response = test_client.get(path)
+                else:
+                    response = test_client.post(path, json=body(i))
+                latencies[c].append(time.perf_counter() - begin)
+                errors[c] += response.status_code != 200
+
+        with _quiet():
+            started = time.perf_counter()
+            threads = [threading.Thread(target=client, args=(c,)) for c in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - started
+
+        timings = np.concatenate([np.array(values) for values in latencies]) * 1000
+        p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+        key = f"endpoint {name}"
+        results[key] = {'stage': 'endpoint', 'route': name, 'concurrency': concurrency,
+                        'rows': len(timings), 'repeats': len(timings),
+                        'mean_ms': float(timings.mean()), 'p50_ms': float(p50),
+                        'p95_ms': float(p95), 'p99_ms': float(p99),
+                        'throughput_per_s': len(timings) / wall, 'errors': int(sum(errors)),
+                        'peak_mb': None}
+        print(f"  {key:<58} p50 {p50:>9.2f} ms  {len(timings) / wall:>7.0f} req/s  "
+              f"{sum(errors)} errors")
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+
+def run(args):
+    sizes = QUICK_SIZES if args.quick else FULL_SIZES
+    output = os.path.abspath(args.output)
+    # Work from a scratch directory so models, caches and tiles start empty
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        print(f"🧪 Pipeline stages ({len(sizes)} sizes)")
+        results = stage_cases(sizes, args.budget, workdir)
+        print(f"\n🌐 Endpoints ({args.requests} requests x {args.concurrency} threads)")
+        results.update(endpoint_cases(args.requests, args.concurrency))
+        os.chdir(ROOT)
+
+    report = {'meta': {**metadata(), 'quick': args.quick}, 'results': results}
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+    print(f"\n💾 {len(results)} cases written to {output}")
+
+
+def compare(args) -> int:
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    regressions = []
+    print(f"{'case':<60} {'base p50':>10} {'now p50':>10} {'change':>8} {'peak MB':>14}")
+    for key in sorted(set(baseline['results']) & set(current['results'])):
+        before, after = baseline['results'][key], current['results'][key]
+        change = after['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0.0
+        slower = change > args.threshold and after['p50_ms'] - before['p50_ms'] > args.min_ms
+        memory = ''
+        heavier = False
+        if before.get('peak_mb') and after.get('peak_mb'):
+            growth = after['peak_mb'] / before['peak_mb'] - 1
+            heavier = growth > args.threshold and after['peak_mb'] - before['peak_mb'] > args.min_mb
+            memory = f"{before['peak_mb']:.1f}→{after['peak_mb']:.1f}"
+        flag = ' ❌' if slower or heavier else ''
+        print(f"{key:<60} {before['p50_ms']:>10.2f} {after['p50_ms']:>10.2f} {change:>+7.0%} "
+              f"{memory:>14}{flag}")
+        if slower or heavier:
+            regressions.append(key)
+
+    missing = sorted(set(baseline['results']) - set(current['results']))
+    if missing:
+        print(f"\n⚠️ {len(missing)} baseline cases not in the current run: {', '.join(missing)}")
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressions beyond {args.threshold:.0%}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline and endpoint benchmark suite")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the suite and write a JSON baseline')
+    run_parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'baselines', 'local.json'))
+    run_parser.add_argument('--quick', action='store_true', help='smaller size sweep')
+    run_parser.add_argument('--budget', type=float, default=1.0, help='seconds of repeats per case')
+    run_parser.add_argument('--requests', type=int, default=200, help='requests per endpoint')
+    run_parser.add_argument('--concurrency', type=int, default=4)
+
+    compare_parser = commands.add_parser('compare', help='flag slowdowns against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.3,
+                                help='relative p50 / peak memory growth that counts as a regression')
+    compare_parser.add_argument('--min-ms', type=float, default=1.0,
+                                help='ignore latency changes smaller than this')
+    compare_parser.add_argument('--min-mb', type=float, default=1.0,
+                                help='ignore memory changes smaller than this')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(compare(args))
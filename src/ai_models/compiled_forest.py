@@ -0,0 +1,114 @@
+import numpy as np
+
+
+class CompiledForest:
+    """A fitted RandomForestRegressor flattened into contiguous node arrays
+
+    All trees share one set of ``feature`` / ``threshold`` / ``left`` /
+    ``right`` / ``value`` arrays (each tree's node ids are offset by its
+    position), and leaves point at themselves. Prediction walks every
+    (tree, row) pair one level per step with NumPy gathers, so a handful of
+    rows costs a few dozen array operations instead of sklearn's input
+    validation and per-tree dispatch.
+
+    Results are bit-identical to ``RandomForestRegressor.predict``: inputs
+    are rounded to float32 like sklearn does before comparing with the
+    float64 thresholds, and the per-tree values are summed in tree order
+    before dividing by the number of trees.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, value: np.ndarray, missing_left: np.ndarray,
+                 roots: np.ndarray, max_depth: int, n_features: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.has_missing = bool(missing_left.any())
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, model) -> 'CompiledForest':
+        """Flatten a fitted single-output RandomForestRegressor"""
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("only single-output forests can be compiled")
+
+        sizes = np.array([tree.node_count for tree in trees], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        feature, threshold, left, right, value, missing_left = [], [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count, dtype=np.int64)
+            is_leaf = tree.children_left < 0
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            value.append(tree.value[:, 0, 0])
+            missing = getattr(tree, 'missing_go_to_left', None)
+            missing_left.append(np.zeros(tree.node_count, dtype=bool) if missing is None
+                                else (np.asarray(missing) != 0) & ~is_leaf)
+
+        # 32-bit node ids halve the memory traffic of every gather
+        index_dtype = np.int32 if sizes.sum() < 2 ** 31 else np.int64
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=index_dtype),
+            threshold=np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(left), dtype=index_dtype),
+            right=np.ascontiguousarray(np.concatenate(right), dtype=index_dtype),
+            value=np.ascontiguousarray(np.concatenate(value), dtype=np.float64),
+            missing_left=np.ascontiguousarray(np.concatenate(missing_left)),
+            roots=offsets.astype(index_dtype),
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features=model.n_features_in_
+        )
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf node id reached by every (tree, row), shape (n_trees, n_rows)"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"expected {self.n_features} features, got shape {X.shape}")
+        n_rows = X.shape[0]
+        flat = X.reshape(-1)
+        row_base = np.arange(n_rows, dtype=np.intp) * self.n_features
+
+        nodes = np.repeat(self.roots, n_rows)
+        rows = np.tile(row_base, self.n_trees)
+        leaves = np.empty(self.n_trees * n_rows, dtype=np.intp)
+        active = np.arange(self.n_trees * n_rows, dtype=np.intp)
+
+        for _ in range(self.max_depth):
+            next_nodes = self.left[nodes]
+            at_leaf = next_nodes == nodes
+            finished = np.count_nonzero(at_leaf)
+            if finished == len(nodes):
+                break
+            if finished * 4 > len(nodes):
+                # Retire finished (tree, row) pairs once they are a sizeable share;
+                # until then leaves simply loop onto themselves
+                leaves[active[at_leaf]] = nodes[at_leaf]
+                inner = ~at_leaf
+                active, nodes, rows, next_nodes = (active[inner], nodes[inner], rows[inner],
+                                                   next_nodes[inner])
+            x = flat[rows + self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if self.has_missing:
+                go_left |= np.isnan(x) & self.missing_left[nodes]
+            nodes = np.where(go_left, next_nodes, self.right[nodes])
+
+        leaves[active] = nodes
+        return leaves.reshape(self.n_trees, n_rows)
+
+    def predict(self, X) -> np.ndarray:
+        """Mean of the trees' leaf values, summed in tree order like sklearn"""
+        leaf_values = self.value[self.apply(X)]
+        total = np.add.accumulate(leaf_values, axis=0)[-1]
+        return total / self.n_trees
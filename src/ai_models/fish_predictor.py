@@ -1,11 +1,9 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error
-import joblib
 import os
 import sys
+import threading
+import weakref
 
 # Add parent directory to Python path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,115 +12,296 @@ sys.path.insert(0, src_dir)
 
 from data_processing.satellite_loader import SatelliteDataLoader
 from data_processing.data_cleaner import DataCleaner
+from data_processing.schema import FLOAT32_DECIMALS, RECOMMENDATION_DTYPE, apply_schema
+from ai_models.training_features import TrainingFeatureBuilder
+from ai_models.model_registry import ModelRegistry
+from ai_models.compiled_forest import CompiledForest
+from ai_models.prediction_lut import PredictionLUT, LUT_DEFAULTS
+from utils.metrics import metrics, timed
+
+FEATURES = ['sst', 'chlorophyll', 'month', 'season']
+RECOMMENDATION_BINS = [0.4, 0.7]
+
+PREDICTIONS = metrics.counter('fisheries_predictions_total',
+                              'Predicted rows by species and recommendation',
+                              labels=('species', 'recommendation'))
+
+def recommendation_labels(probability) -> pd.Categorical:
+    """Vectorized binning: > 0.7 HIGH, > 0.4 MEDIUM, otherwise LOW, at the published precision"""
+    probability = np.round(np.asarray(probability, dtype=float), FLOAT32_DECIMALS)
+    codes = np.digitize(probability, RECOMMENDATION_BINS, right=True).astype(np.int8)
+    codes[np.isnan(probability)] = 0
+    return pd.Categorical.from_codes(codes, dtype=RECOMMENDATION_DTYPE)
+
+def _count_predictions(species: str, recommendations):
+    """Add one prediction run's rows to fisheries_predictions_total"""
+    if not metrics.enabled:
+        return
+    for recommendation, count in pd.Series(recommendations).value_counts().items():
+        if count:
+            PREDICTIONS.inc(int(count), species=species, recommendation=recommendation)
+
+# Largest batch served by the compiled forest in 'auto' inference mode; above
+# it sklearn's C traversal is faster than NumPy gathers over the node arrays
+COMPILED_MAX_ROWS = 256
+
+# min_samples_leaf=50 stops the trees fitting per-cell noise: held-out MAE
+# drops (0.081 vs 0.086 fully grown), exact prediction is ~4x faster and the
+# forest becomes smooth enough for PredictionLUT to meet its 0.05 max-error
+# gate (0.035 vs 0.29), so inference='lut' actually serves tables
+DEFAULT_HYPERPARAMS = {'n_estimators': 100, 'min_samples_leaf': 50, 'random_state': 42, 'test_size': 0.2}
+
+def fit_random_forest(X: pd.DataFrame, y, hyperparams: dict = None):
+    """Fit the forest on a train split and return (model, held-out MAE)"""
+    # scikit-learn takes over a second to import; only training and unpickling need it
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error
+    from sklearn.model_selection import train_test_split
+
+    params = {**DEFAULT_HYPERPARAMS, **(hyperparams or {})}
+    test_size = params.pop('test_size')
+    
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=params.get('random_state', 42)
+    )
+    
+    model = RandomForestRegressor(**params)
+    model.fit(X_train, y_train)
+    
+    y_pred = model.predict(X_test)
+    return model, mean_absolute_error(y_test, y_pred)
 
 class FishLocationPredictor:
-    def __init__(self, model_dir: str = "models/trained_models"):
+    def __init__(self, model_dir: str = "models/trained_models", registry: ModelRegistry = None,
+                 inference: str = 'auto', lut_options: dict = None):
+        if inference not in ('auto', 'compiled', 'sklearn', 'lut'):
+            raise ValueError(f"unknown inference mode: {inference}")
         self.model_dir = model_dir
         self.model = None
-        os.makedirs(model_dir, exist_ok=True)
+        self.registry = registry or ModelRegistry(model_dir)
+        self.feature_builder = TrainingFeatureBuilder()
+        self.inference = inference
+        self.lut_options = {**LUT_DEFAULTS, **(lut_options or {})}
+        self._compiled = weakref.WeakKeyDictionary()
+        self._luts = {}
+        self._lut_locks = {}
+        self._lut_locks_guard = threading.Lock()
     
     def prepare_training_data(self, ocean_data: pd.DataFrame, 
                             historical_catch: pd.DataFrame = None) -> pd.DataFrame:
         """Prepare training data with features for fish prediction"""
         
         # For demo, we'll create synthetic training data
-        np.random.seed(42)
-        
-        training_data = []
-        for _, row in ocean_data.iterrows():
-            sst = row['sst']
-            chlorophyll = row['chlorophyll']
-            
-            # Fish probability based on ocean conditions
-            tuna_probability = np.clip(
-                (sst - 25) * 0.1 + (chlorophyll - 0.5) * 0.2 + np.random.normal(0, 0.1),
-                0, 1
-            )
-            
-            skipjack_probability = np.clip(
-                (sst - 24) * 0.08 + (chlorophyll - 0.6) * 0.15 + np.random.normal(0, 0.1),
-                0, 1
-            )
-            
-            training_data.append({
-                'date': row['date'],
-                'sst': sst,
-                'chlorophyll': chlorophyll,
-                'tuna_probability': tuna_probability,
-                'skipjack_probability': skipjack_probability,
-                'month': row['date'].month,
-                'season': (row['date'].month % 12 + 3) // 3
-            })
-        
-        return pd.DataFrame(training_data)
-    
-    def train_model(self, training_data: pd.DataFrame, target_species: str = 'tuna'):
+        return self.feature_builder.build(ocean_data)
+    
+    def iter_training_batches(self, ocean_chunks, batch_size: int = 100_000):
+        """Stream training batches of bounded size from a frame or iterable of chunks"""
+        return self.feature_builder.iter_batches(ocean_chunks, batch_size)
+    
+    @timed('predictor.train')
+    def train_model(self, training_data: pd.DataFrame, target_species: str = 'tuna',
+                    region: str = 'default'):
         """Train machine learning model to predict fish locations"""
         
-        features = ['sst', 'chlorophyll', 'month', 'season']
-        X = training_data[features]
+        X = training_data[FEATURES]
         y = training_data[f'{target_species}_probability']
         
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
-        
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.model.fit(X_train, y_train)
-        
-        y_pred = self.model.predict(X_test)
-        mae = mean_absolute_error(y_test, y_pred)
+        self.model, mae = fit_random_forest(X, y)
         
         print(f"✅ Model trained for {target_species}")
         print(f"📊 Mean Absolute Error: {mae:.3f}")
         
-        model_path = os.path.join(self.model_dir, f'{target_species}_predictor.joblib')
-        joblib.dump(self.model, model_path)
+        version = self.registry.publish(self.model, target_species, region)
+        model_path = self.registry.model_path(target_species, region, version)
         print(f"💾 Model saved to: {model_path}")
         
+        if self.inference == 'lut':
+            self.prepare_lut(self.model, target_species, region, version, sample=training_data)
+        
         return mae
     
+    @timed('predictor.predict')
     def predict_fish_locations(self, ocean_conditions: pd.DataFrame, 
-                             species: str = 'tuna') -> pd.DataFrame:
+                             species: str = 'tuna', region: str = 'default') -> pd.DataFrame:
         """Predict fish probability for given ocean conditions"""
         
-        if self.model is None:
-            model_path = os.path.join(self.model_dir, f'{species}_predictor.joblib')
-            if os.path.exists(model_path):
-                self.model = joblib.load(model_path)
-            else:
-                print("⚠️ No trained model found. Using heuristic prediction.")
-                return self._heuristic_prediction(ocean_conditions, species)
+        model = self.registry.get(species, region)
+        if model is None:
+            print("⚠️ No trained model found. Using heuristic prediction.")
+            return self._heuristic_prediction(ocean_conditions, species)
         
-        features = ['sst', 'chlorophyll', 'month', 'season']
+        self._add_calendar_features(ocean_conditions)
         
-        if 'month' not in ocean_conditions.columns and 'date' in ocean_conditions.columns:
-            ocean_conditions['month'] = ocean_conditions['date'].dt.month
-            ocean_conditions['season'] = (ocean_conditions['month'] % 12 + 3) // 3
+        X_pred = ocean_conditions[FEATURES]
+        predictions = self._model_predict(model, X_pred, species, region)
         
-        X_pred = ocean_conditions[features]
-        predictions = self.model.predict(X_pred)
+        results = ocean_conditions.copy(deep=False)
+        probability = predictions.astype(np.float32)
+        results[f'{species}_probability'] = probability
+        results['recommendation'] = recommendation_labels(probability)
+        _count_predictions(species, results['recommendation'])
         
-        results = ocean_conditions.copy()
-        results[f'{species}_probability'] = predictions
-        results['recommendation'] = results[f'{species}_probability'].apply(
-            lambda x: 'HIGH' if x > 0.7 else 'MEDIUM' if x > 0.4 else 'LOW'  # Fixed typo: LOVY → LOW
-        )
+        return results
+    
+    @timed('predictor.predict_batch')
+    def predict_species_batch(self, ocean_conditions: pd.DataFrame, species_list: list,
+                              region: str = 'default') -> pd.DataFrame:
+        """Predict several species in one pass over a shared feature matrix
+        
+        Returns one wide frame with ``{species}_probability`` and
+        ``{species}_recommendation`` columns per species.
+        """
+        results = ocean_conditions.copy(deep=False)
+        self._add_calendar_features(results)
+        X_pred = results[FEATURES]
+        
+        for species in species_list:
+            model = self.registry.get(species, region)
+            if model is None:
+                results[f'{species}_probability'] = self._heuristic_probability(results, species)
+                results[f'{species}_recommendation'] = 'HEURISTIC'
+                apply_schema(results, [f'{species}_probability', f'{species}_recommendation'])
+            else:
+                predictions = self._model_predict(model, X_pred, species, region)
+                probability = predictions.astype(np.float32)
+                results[f'{species}_probability'] = probability
+                results[f'{species}_recommendation'] = recommendation_labels(probability)
+            _count_predictions(species, results[f'{species}_recommendation'])
         
         return results
     
-    def _heuristic_prediction(self, ocean_conditions: pd.DataFrame, species: str) -> pd.DataFrame:
-        """Fallback heuristic prediction when no model is trained"""
-        results = ocean_conditions.copy()
+    def _model_predict(self, model, X_pred: pd.DataFrame, species: str = None,
+                       region: str = 'default') -> np.ndarray:
+        """Predict through the lookup table if enabled and accurate enough, else exactly"""
+        if self.inference == 'lut' and species is not None:
+            lut = self.lut(model, species, region)
+            if lut is not None:
+                return lut.predict(X_pred['sst'].to_numpy(), X_pred['chlorophyll'].to_numpy(),
+                                   X_pred['month'].to_numpy(),
+                                   exact=self._feature_predict(model))
+        return self._exact_predict(model, X_pred)
+    
+    def _exact_predict(self, model, X_pred: pd.DataFrame) -> np.ndarray:
+        """Predict with the compiled forest for small batches, sklearn otherwise"""
+        from sklearn.ensemble import RandomForestRegressor  # already loaded by unpickling the model
+        use_compiled = isinstance(model, RandomForestRegressor) and (
+            self.inference == 'compiled' or
+            (self.inference in ('auto', 'lut') and len(X_pred) <= COMPILED_MAX_ROWS)
+        )
+        if not use_compiled:
+            return model.predict(X_pred)
+        return self.compile(model).predict(X_pred.to_numpy())
+    
+    def compile(self, model) -> CompiledForest:
+        """Flattened node arrays for model, built once per model object"""
+        compiled = self._compiled.get(model)
+        if compiled is None:
+            compiled = self._compiled[model] = CompiledForest.from_sklearn(model)
+        return compiled
+    
+    def _feature_predict(self, model):
+        """predict(sst, chlorophyll, month, season) over plain arrays, as PredictionLUT expects"""
+        def predict(sst, chlorophyll, month, season):
+            X = pd.DataFrame({'sst': sst, 'chlorophyll': chlorophyll,
+                              'month': month, 'season': season})[FEATURES]
+            return self._exact_predict(model, X)
+        return predict
+    
+    def lut_path(self, species: str, region: str, version: str) -> str:
+        return self.registry.model_path(species, region, version)[:-len('.joblib')] + '.lut.npz'
+    
+    def _lut_lock(self, key: tuple) -> threading.RLock:
+        with self._lut_locks_guard:
+            return self._lut_locks.setdefault(key, threading.RLock())
+    
+    def build_lut(self, model, species: str, region: str = 'default', version: str = None,
+                  sample: pd.DataFrame = None) -> PredictionLUT:
+        """Precompute and save the lookup table for one model version
         
+        Raises ValueError (and saves nothing) if the table misses
+        lut_options['max_error'] against the exact model.
+        """
+        version = version or self.registry.latest_version(species, region)
+        key = (species, region, version)
+        options = self.lut_options
+        with self._lut_lock(key):
+            lut = PredictionLUT.build(
+                self._feature_predict(model),
+                sst_range=options['sst_range'], sst_step=options['sst_step'],
+                chlorophyll_range=options['chlorophyll_range'],
+                chlorophyll_step=options['chlorophyll_step'], sample=sample
+            )
+            if lut.max_error > options['max_error']:
+                self._luts[key] = None
+                raise ValueError(f"lookup table for {species}/{region} {version} has max error "
+                                 f"{lut.max_error:.4f} (p99 {lut.error['p99']:.4f}) > {options['max_error']}")
+            lut.save(self.lut_path(species, region, version))
+            self._luts[key] = lut
+        return lut
+    
+    def prepare_lut(self, model, species: str, region: str = 'default', version: str = None,
+                    sample: pd.DataFrame = None):
+        """Load or build the lookup table ahead of serving; None if it misses max_error
+        
+        Called after training and from the dashboard's warm_up(), so the
+        request path only ever loads a finished table.
+        """
+        version = version or self.registry.latest_version(species, region)
+        key = (species, region, version)
+        with self._lut_lock(key):
+            lut = self.lut(model, species, region, version)
+            if lut is not None or key in self._luts:
+                return lut
+            try:
+                lut = self.build_lut(model, species, region, version, sample=sample)
+            except ValueError as e:
+                print(f"⚠️ {e}; serving the exact model")
+                return None
+        print(f"📐 Lookup table built for {species}/{region}, max error {lut.max_error:.4f} "
+              f"(p99 {lut.error['p99']:.4f}) vs the exact model")
+        return lut
+    
+    def lut(self, model, species: str, region: str = 'default', version: str = None):
+        """Saved lookup table of the latest model version, or None if there is none that meets max_error
+        
+        Never builds a table: until prepare_lut() has run for a version,
+        its predictions come from the exact model.
+        """
+        version = version or self.registry.latest_version(species, region)
+        key = (species, region, version)
+        if key not in self._luts:
+            path = self.lut_path(species, region, version)
+            if not os.path.exists(path):
+                return None
+            with self._lut_lock(key):
+                if key not in self._luts:
+                    lut = PredictionLUT.load(path)
+                    if lut.max_error > self.lut_options['max_error']:
+                        print(f"⚠️ Lookup table for {species}/{region} has max error {lut.max_error:.4f} "
+                              f"> {self.lut_options['max_error']}; using the exact model")
+                        lut = None
+                    self._luts[key] = lut
+        return self._luts[key]
+    
+    def _add_calendar_features(self, ocean_conditions: pd.DataFrame):
+        if 'month' not in ocean_conditions.columns and 'date' in ocean_conditions.columns:
+            ocean_conditions['month'] = ocean_conditions['date'].dt.month.astype(np.int8)
+            ocean_conditions['season'] = (ocean_conditions['month'] % 12 + 3) // 3
+    
+    def _heuristic_probability(self, ocean_conditions: pd.DataFrame, species: str):
         if species == 'tuna':
-            results['tuna_probability'] = np.clip(
-                (results['sst'] - 25) * 0.1 + (results['chlorophyll'] - 0.5) * 0.2, 0, 1
+            return np.clip(
+                (ocean_conditions['sst'] - 25) * 0.1 + (ocean_conditions['chlorophyll'] - 0.5) * 0.2, 0, 1
             )
-        else:
-            results[f'{species}_probability'] = 0.5
-            
+        return 0.5
+    
+    def _heuristic_prediction(self, ocean_conditions: pd.DataFrame, species: str) -> pd.DataFrame:
+        """Fallback heuristic prediction when no model is trained"""
+        results = ocean_conditions.copy(deep=False)
+        results[f'{species}_probability'] = self._heuristic_probability(results, species)
         results['recommendation'] = 'HEURISTIC'
+        apply_schema(results, [f'{species}_probability', 'recommendation'])
+        _count_predictions(species, results['recommendation'])
         return results
 
 # Example usage dengan error handling
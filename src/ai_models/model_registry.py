@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+class ModelRegistry:
+    """Holds one trained model per (species, region, version)
+
+    Models live on disk as ``{model_dir}/{species}/{region}/{version}.joblib``;
+    the legacy ``{species}_predictor.joblib`` files are picked up as version
+    "0" of the "default" region. Loaded models are kept in an LRU of at most
+    ``max_models`` entries. ``mmap_mode`` maps plain NumPy arrays in the
+    pickle read-only, but scikit-learn trees copy their node arrays when
+    unpickled, so every process holds its own copy of a forest. Models load
+    outside the registry lock, one load at a time per key. The latest version of each (species, region) is re-read from disk at
+    most every ``rescan_seconds``, so long-running servers pick up models
+    published by other processes.
+    """
+
+    def __init__(self, model_dir: str = "models/trained_models", max_models: int = 8,
+                 mmap_mode: str = 'r', rescan_seconds: float = 5.0):
+        self.model_dir = model_dir
+        self.max_models = max_models
+        self.mmap_mode = mmap_mode
+        self.rescan_seconds = rescan_seconds
+        self.load_times = {}
+        self._models = OrderedDict()
+        self._latest = {}
+        self._checked = {}
+        self._lock = threading.RLock()
+        self._load_locks = {}
+
+    def model_path(self, species: str, region: str = 'default', version: str = None) -> str:
+        if region == 'default' and version == '0':
+            return os.path.join(self.model_dir, f'{species}_predictor.joblib')
+        return os.path.join(self.model_dir, species, region, f'{version}.joblib')
+
+    def available(self) -> dict:
+        """Scan model_dir for every (species, region) and its sorted versions"""
+        found = {}
+        if not os.path.isdir(self.model_dir):
+            return found
+        for entry in os.listdir(self.model_dir):
+            path = os.path.join(self.model_dir, entry)
+            if entry.endswith('_predictor.joblib'):
+                found.setdefault((entry[:-len('_predictor.joblib')], 'default'), []).append('0')
+            elif os.path.isdir(path):
+                for region in os.listdir(path):
+                    region_dir = os.path.join(path, region)
+                    if not os.path.isdir(region_dir):
+                        continue
+                    versions = [name[:-len('.joblib')] for name in os.listdir(region_dir)
+                                if name.endswith('.joblib')]
+                    if versions:
+                        found.setdefault((entry, region), []).extend(versions)
+        return {key: sorted(versions) for key, versions in found.items()}
+
+    def versions(self, species: str, region: str = 'default') -> list:
+        """Sorted versions of one (species, region) on disk, without scanning the whole model_dir"""
+        found = []
+        if region == 'default' and os.path.exists(self.model_path(species, region, '0')):
+            found.append('0')
+        region_dir = os.path.join(self.model_dir, species, region)
+        if os.path.isdir(region_dir):
+            found.extend(name[:-len('.joblib')] for name in os.listdir(region_dir)
+                         if name.endswith('.joblib'))
+        return sorted(found)
+
+    def latest_version(self, species: str, region: str = 'default') -> str:
+        """Newest version on disk (None if there is none), re-checked every rescan_seconds"""
+        key = (species, region)
+        with self._lock:
+            now = time.monotonic()
+            if key not in self._latest or now - self._checked.get(key, 0.0) >= self.rescan_seconds:
+                versions = self.versions(species, region)
+                self._latest[key] = versions[-1] if versions else None
+                self._checked[key] = now
+            return self._latest[key]
+
+    def get(self, species: str, region: str = 'default', version: str = None):
+        """Return the requested (default: latest) model, loading it if needed; None if absent"""
+        version = version or self.latest_version(species, region)
+        if version is None:
+            return None
+        key = (species, region, version)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        # Unpickling takes a while: other keys stay servable, and concurrent
+        # requests for this key wait for the one load and then reuse it
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+            try:
+                return self._load(key)
+            finally:
+                with self._lock:
+                    self._load_locks.pop(key, None)
+
+    def _load(self, key: tuple):
+        path = self.model_path(*key)
+        if not os.path.exists(path):
+            return None
+        import joblib  # deferred: joblib (and the sklearn classes it unpickles) load with the first model
+        start = time.perf_counter()
+        model = joblib.load(path, mmap_mode=self.mmap_mode)
+        with self._lock:
+            self.load_times[key] = time.perf_counter() - start
+            self._insert(key, model)
+        return model
+
+    def _insert(self, key: tuple, model):
+        self._models[key] = model
+        self._models.move_to_end(key)
+        while len(self._models) > self.max_models:
+            self._models.popitem(last=False)
+
+    def preload(self) -> list:
+        """Load the latest model of every discovered (species, region), up to max_models"""
+        loaded = []
+        for (species, region), versions in sorted(self.available().items()):
+            if len(loaded) >= self.max_models:
+                break
+            with self._lock:
+                self._latest[(species, region)] = versions[-1]
+                self._checked[(species, region)] = time.monotonic()
+            if self.get(species, region, versions[-1]) is not None:
+                loaded.append((species, region, versions[-1]))
+        return loaded
+
+    def refresh(self) -> list:
+        """Pick up models published by other processes; returns keys that changed version"""
+        changed = []
+        with self._lock:
+            for (species, region), versions in self.available().items():
+                self._checked[(species, region)] = time.monotonic()
+                if self._latest.get((species, region)) != versions[-1]:
+                    self._latest[(species, region)] = versions[-1]
+                    changed.append((species, region, versions[-1]))
+        for key in changed:
+            self.get(*key)
+        return changed
+
+    def publish(self, model, species: str, region: str = 'default', version: str = None) -> str:
+        """Atomically write a new model version and swap it in as the latest"""
+        import joblib
+        version = version or datetime.now().strftime('%Y%m%d%H%M%S%f')
+        path = self.model_path(species, region, version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._insert((species, region, version), model)
+            self._latest[(species, region)] = version
+            self._checked[(species, region)] = time.monotonic()
+        return version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'loaded': [list(key) for key in self._models],
+                'latest': {f'{species}/{region}': version
+                           for (species, region), version in self._latest.items()},
+                'load_seconds': {'/'.join(key): seconds for key, seconds in self.load_times.items()}
+            }
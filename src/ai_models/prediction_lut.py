@@ -0,0 +1,153 @@
+import numpy as np
+import os
+
+# Default grid: 0.05 °C x 0.01 mg/m³ x 12 months covers Indonesian waters
+# with about one million precomputed points (4 MB as float32)
+LUT_DEFAULTS = {
+    'sst_range': (20.0, 34.0),
+    'sst_step': 0.05,
+    'chlorophyll_range': (0.0, 3.0),
+    'chlorophyll_step': 0.01,
+    'max_error': 0.05,
+}
+
+
+def season_of(month):
+    return (np.asarray(month) % 12 + 3) // 3
+
+
+class PredictionLUT:
+    """Model probabilities precomputed on a dense (month, sst, chlorophyll) grid
+
+    Queries are answered by bilinear interpolation in sst/chlorophyll within
+    the query's month plane: four gathers and a few multiply-adds per row,
+    whatever the model behind it. ``error`` holds the max / p99 / mean
+    absolute difference to the exact model measured when the table was built.
+    """
+
+    def __init__(self, table: np.ndarray, sst_start: float, sst_step: float,
+                 chlorophyll_start: float, chlorophyll_step: float, error: dict = None):
+        self.table = np.ascontiguousarray(table, dtype=np.float32)
+        self.sst_start = sst_start
+        self.sst_step = sst_step
+        self.chlorophyll_start = chlorophyll_start
+        self.chlorophyll_step = chlorophyll_step
+        self.error = error or {}
+
+    @property
+    def max_error(self) -> float:
+        return self.error.get('max', np.inf)
+
+    @property
+    def sst_axis(self) -> np.ndarray:
+        return self.sst_start + self.sst_step * np.arange(self.table.shape[1])
+
+    @property
+    def chlorophyll_axis(self) -> np.ndarray:
+        return self.chlorophyll_start + self.chlorophyll_step * np.arange(self.table.shape[2])
+
+    @classmethod
+    def build(cls, predict, sst_range=None, sst_step: float = None, chlorophyll_range=None,
+              chlorophyll_step: float = None, sample=None, error_samples: int = 100_000,
+              batch_rows: int = 250_000, seed: int = 0) -> 'PredictionLUT':
+        """Evaluate predict(sst, chlorophyll, month, season) -> probabilities on the grid
+
+        The error is measured against ``sample`` (a dict or frame with sst,
+        chlorophyll and month) if given, else on uniform random points.
+        """
+        sst_range = sst_range or LUT_DEFAULTS['sst_range']
+        sst_step = sst_step or LUT_DEFAULTS['sst_step']
+        chlorophyll_range = chlorophyll_range or LUT_DEFAULTS['chlorophyll_range']
+        chlorophyll_step = chlorophyll_step or LUT_DEFAULTS['chlorophyll_step']
+        n_sst = int(round((sst_range[1] - sst_range[0]) / sst_step)) + 1
+        n_chlorophyll = int(round((chlorophyll_range[1] - chlorophyll_range[0]) / chlorophyll_step)) + 1
+
+        sst = sst_range[0] + sst_step * np.arange(n_sst)
+        chlorophyll = chlorophyll_range[0] + chlorophyll_step * np.arange(n_chlorophyll)
+        month, sst_grid, chlorophyll_grid = np.meshgrid(np.arange(1, 13), sst, chlorophyll,
+                                                        indexing='ij')
+        month, sst_grid, chlorophyll_grid = month.ravel(), sst_grid.ravel(), chlorophyll_grid.ravel()
+        table = np.empty(month.size, dtype=np.float32)
+        for start in range(0, month.size, batch_rows):
+            rows = slice(start, start + batch_rows)
+            table[rows] = predict(sst_grid[rows], chlorophyll_grid[rows], month[rows],
+                                  season_of(month[rows]))
+
+        lut = cls(table.reshape(12, n_sst, n_chlorophyll), sst_range[0], sst_step,
+                  chlorophyll_range[0], chlorophyll_step)
+        lut.error = lut.measure_error(predict, sample, error_samples, seed)
+        return lut
+
+    def measure_error(self, predict, sample=None, n_samples: int = 100_000, seed: int = 0) -> dict:
+        """Absolute error against the exact model on in-range points"""
+        if sample is None:
+            rng = np.random.default_rng(seed)
+            sst = rng.uniform(self.sst_axis[0], self.sst_axis[-1], n_samples)
+            chlorophyll = rng.uniform(self.chlorophyll_axis[0], self.chlorophyll_axis[-1], n_samples)
+            month = rng.integers(1, 13, n_samples)
+        else:
+            sst = np.asarray(sample['sst'], dtype=np.float64)[:n_samples]
+            chlorophyll = np.asarray(sample['chlorophyll'], dtype=np.float64)[:n_samples]
+            month = np.asarray(sample['month'])[:n_samples]
+
+        approx, inside = self.lookup(sst, chlorophyll, month)
+        if not inside.any():
+            return {'max': np.inf, 'p99': np.inf, 'mean': np.inf, 'samples': 0}
+        exact = np.asarray(predict(sst[inside], chlorophyll[inside], month[inside],
+                                   season_of(month[inside])), dtype=np.float64)
+        error = np.abs(approx[inside] - exact)
+        return {'max': float(error.max()), 'p99': float(np.percentile(error, 99)),
+                'mean': float(error.mean()), 'samples': int(inside.sum())}
+
+    def lookup(self, sst, chlorophyll, month):
+        """Interpolated probabilities plus a mask of rows inside the grid
+
+        Rows outside the grid (or with NaN / invalid month) get NaN and
+        False in the mask, so callers can send just those to the exact model.
+        """
+        n_sst, n_chlorophyll = self.table.shape[1:]
+        fs = (np.asarray(sst, dtype=np.float64) - self.sst_start) / self.sst_step
+        fc = (np.asarray(chlorophyll, dtype=np.float64) - self.chlorophyll_start) / self.chlorophyll_step
+        month = np.nan_to_num(np.asarray(month, dtype=np.float64))
+        inside = ((fs >= 0) & (fs <= n_sst - 1) & (fc >= 0) & (fc <= n_chlorophyll - 1) &
+                  (month >= 1) & (month <= 12))
+
+        i = np.clip(np.floor(np.nan_to_num(fs)), 0, n_sst - 2).astype(np.intp)
+        j = np.clip(np.floor(np.nan_to_num(fc)), 0, n_chlorophyll - 2).astype(np.intp)
+        ws = np.clip(fs - i, 0.0, 1.0)
+        wc = np.clip(fc - j, 0.0, 1.0)
+        base = (np.clip(month, 1, 12).astype(np.intp) - 1) * (n_sst * n_chlorophyll) + i * n_chlorophyll + j
+
+        flat = self.table.reshape(-1)
+        low = flat[base] * (1 - wc) + flat[base + 1] * wc
+        high = flat[base + n_chlorophyll] * (1 - wc) + flat[base + n_chlorophyll + 1] * wc
+        values = low * (1 - ws) + high * ws
+        values[~inside] = np.nan
+        return values, inside
+
+    def predict(self, sst, chlorophyll, month, exact=None) -> np.ndarray:
+        """Interpolated probabilities; rows off the grid go to exact(...) if given"""
+        values, inside = self.lookup(sst, chlorophyll, month)
+        if exact is not None and not inside.all():
+            outside = ~inside
+            month = np.asarray(month)
+            values[outside] = exact(np.asarray(sst)[outside], np.asarray(chlorophyll)[outside],
+                                    month[outside], season_of(month[outside]))
+        return values
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            np.savez(file, table=self.table,
+                     axes=np.array([self.sst_start, self.sst_step,
+                                    self.chlorophyll_start, self.chlorophyll_step]),
+                     error=np.array([self.error.get(name, np.inf)
+                                     for name in ('max', 'p99', 'mean', 'samples')]))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PredictionLUT':
+        with np.load(path) as data:
+            error = dict(zip(('max', 'p99', 'mean', 'samples'), data['error'].tolist()))
+            return cls(data['table'], *data['axes'].tolist(), error=error)
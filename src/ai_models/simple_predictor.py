@@ -1,40 +1,44 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from ai_models.fish_predictor import recommendation_labels
+from data_processing.schema import apply_schema
 
 class SimpleFishPredictor:
     def __init__(self):
         pass
     
-    def predict(self, ocean_data: pd.DataFrame, species: str = 'tuna') -> pd.DataFrame:
-        """Simple heuristic-based fish prediction"""
-        results = ocean_data.copy()
-        
-        if 'date' in results.columns:
-            results['month'] = results['date'].dt.month
-        
-        # Simple rules-based prediction
+    def probability(self, sst, chlorophyll, species: str = 'tuna') -> np.ndarray:
+        """Rules-based probability from arrays of sst and chlorophyll"""
+        sst = np.asarray(sst, dtype=np.float64)
+        chlorophyll = np.asarray(chlorophyll, dtype=np.float64)
         if species == 'tuna':
             # Tuna like warm waters (26-30°C) with moderate chlorophyll
-            results['probability'] = np.clip(
-                (results['sst'] - 25) * 0.1 + (results['chlorophyll'] - 0.5) * 0.2, 
-                0, 1
-            )
+            return np.clip((sst - 25) * 0.1 + (chlorophyll - 0.5) * 0.2, 0, 1)
         elif species == 'skipjack':
             # Skipjack prefer slightly cooler waters
-            results['probability'] = np.clip(
-                (results['sst'] - 24) * 0.08 + (results['chlorophyll'] - 0.6) * 0.15,
-                0, 1
-            )
-        else:
-            results['probability'] = 0.5
+            return np.clip((sst - 24) * 0.08 + (chlorophyll - 0.6) * 0.15, 0, 1)
+        return np.full(sst.shape, 0.5)
+    
+    def predict(self, ocean_data: pd.DataFrame, species: str = 'tuna') -> pd.DataFrame:
+        """Simple heuristic-based fish prediction"""
+        results = ocean_data.copy(deep=False)
+        
+        if 'date' in results.columns:
+            results['month'] = results['date'].dt.month.astype(np.int8)
         
-        # Add recommendation
-        results['recommendation'] = results['probability'].apply(
-            lambda x: 'HIGH' if x > 0.7 else 'MEDIUM' if x > 0.4 else 'LOW'
-        )
+        # Simple rules-based prediction; labels come from the published float32 value
+        probability = self.probability(results['sst'], results['chlorophyll'], species).astype(np.float32)
+        results['probability'] = probability
+        results['recommendation'] = recommendation_labels(probability)
         
-        return results
+        return apply_schema(results, ['probability', 'recommendation'])
 
 if __name__ == "__main__":
     # Test dengan sample data
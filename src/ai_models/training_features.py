@@ -0,0 +1,64 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from data_processing.schema import apply_schema
+
+# Synthetic label response per species:
+# probability = (sst - sst_offset) * sst_weight + (chlorophyll - chl_offset) * chl_weight
+SPECIES_RESPONSE = {
+    'tuna': (25.0, 0.1, 0.5, 0.2),
+    'skipjack': (24.0, 0.08, 0.6, 0.15),
+}
+
+
+class TrainingFeatureBuilder:
+    """Vectorized builder for model features and synthetic training labels"""
+
+    def __init__(self, species: tuple = ('tuna', 'skipjack'), noise_std: float = 0.1,
+                 seed: int = 42):
+        self.species = tuple(species)
+        self.noise_std = noise_std
+        self.seed = seed
+
+    def build(self, ocean_data: pd.DataFrame) -> pd.DataFrame:
+        """Build the full training frame with whole-column operations"""
+        return self._build_batch(ocean_data, np.random.RandomState(self.seed))
+
+    def iter_batches(self, source, batch_size: int = 100_000):
+        """Yield training batches of at most batch_size rows
+
+        source is a DataFrame or any iterable of DataFrame chunks (e.g. one per
+        month of a multi-year backfill). A single seeded stream is carried across
+        batches, so concatenating the batches reproduces build() on the same rows.
+        """
+        rng = np.random.RandomState(self.seed)
+        chunks = [source] if isinstance(source, pd.DataFrame) else source
+        for chunk in chunks:
+            for start in range(0, len(chunk), batch_size):
+                yield self._build_batch(chunk.iloc[start:start + batch_size], rng)
+
+    def _build_batch(self, ocean_data: pd.DataFrame, rng: np.random.RandomState) -> pd.DataFrame:
+        dates = pd.to_datetime(ocean_data['date'])
+        sst = ocean_data['sst'].to_numpy()
+        chlorophyll = ocean_data['chlorophyll'].to_numpy()
+        # One (rows x species) draw keeps the per-row species order of the noise stream
+        noise = rng.normal(0, self.noise_std, size=(len(ocean_data), len(self.species)))
+
+        batch = {'date': dates.to_numpy(), 'sst': sst, 'chlorophyll': chlorophyll}
+        for i, species in enumerate(self.species):
+            sst_offset, sst_weight, chl_offset, chl_weight = SPECIES_RESPONSE[species]
+            batch[f'{species}_probability'] = np.clip(
+                (sst - sst_offset) * sst_weight + (chlorophyll - chl_offset) * chl_weight + noise[:, i],
+                0, 1
+            )
+        month = dates.dt.month.to_numpy(np.int8)
+        batch['month'] = month
+        batch['season'] = (month % 12 + 3) // 3
+
+        return apply_schema(pd.DataFrame(batch))
@@ -0,0 +1,237 @@
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import sys
+import time
+import yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.insert(0, src_dir)
+
+from ai_models.fish_predictor import FEATURES, DEFAULT_HYPERPARAMS, fit_random_forest
+from ai_models.model_registry import ModelRegistry
+from regulatory_engine.spatial_index import ZoneIndex
+
+PROJECT_ROOT = os.path.abspath(os.path.join(current_dir, '..', '..'))
+MANIFEST_NAME = 'training_manifest.json'
+
+def load_model_config(config_path: str = "config/model_config.yaml") -> dict:
+    if not os.path.isabs(config_path) and not os.path.exists(config_path):
+        config_path = os.path.join(PROJECT_ROOT, config_path)
+    try:
+        with open(config_path, 'r') as file:
+            return yaml.safe_load(file) or {}
+    except Exception as e:
+        print(f"Error loading model config: {e}")
+        return {}
+
+def assign_regions(frame: pd.DataFrame, areas: list, unassigned: str = 'unassigned') -> np.ndarray:
+    """Management-area name per row from its lon/lat"""
+    index = ZoneIndex(areas)
+    zone_ids = index.locate_points(frame['lon'], frame['lat'])
+    names = np.array(index.names + [unassigned], dtype=object)
+    return names[zone_ids]
+
+
+class _SharedArrays:
+    """Shared-memory copies of the training arrays, attached by name in workers"""
+
+    def __init__(self, arrays: dict):
+        self.blocks = []
+        self.specs = {}
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+def _train_job(specs: dict, species: str, species_index: int, region: str, region_code: int,
+               hyperparams: dict, model_dir: str) -> dict:
+    """Worker: attach to the shared matrix, fit one (species, region) model, publish it"""
+    start = time.perf_counter()
+    blocks = {name: shared_memory.SharedMemory(name=spec[0]) for name, spec in specs.items()}
+    try:
+        views = {name: np.ndarray(spec[1], dtype=spec[2], buffer=blocks[name].buf)
+                 for name, spec in specs.items()}
+        if region_code < 0:
+            rows = np.arange(views['X'].shape[0])
+        else:
+            rows = np.flatnonzero(views['regions'] == region_code)
+        X = pd.DataFrame(views['X'][rows], columns=FEATURES)
+        y = views['Y'][rows, species_index]
+        del views
+    finally:
+        for block in blocks.values():
+            block.close()
+
+    model, mae = fit_random_forest(X, y, hyperparams)
+    version = ModelRegistry(model_dir).publish(model, species, region)
+    return {'rows': len(rows), 'mae': float(mae), 'version': version,
+            'seconds': time.perf_counter() - start}
+
+
+class TrainingOrchestrator:
+    """Trains one model per (species, region) on a process pool
+
+    The feature matrix is copied once into shared memory and every job
+    attaches to it by name instead of receiving a pickled copy. Jobs whose
+    training rows and hyperparameters hash the same as the last published
+    model are skipped; models are written atomically through ModelRegistry.
+
+    By default that is the all-rows 'default' region, which serving uses,
+    plus every management area present in the training data's ``region``
+    column; a requested region without rows is reported as failed.
+    """
+
+    def __init__(self, model_dir: str = "models/trained_models", max_workers: int = None,
+                 hyperparams: dict = None, registry: ModelRegistry = None):
+        config = load_model_config().get('training') or {}
+        self.model_dir = model_dir
+        self.max_workers = max_workers or config.get('max_workers') or os.cpu_count()
+        self.hyperparams = {**DEFAULT_HYPERPARAMS, **(config.get('hyperparams') or {}),
+                            **(hyperparams or {})}
+        self.registry = registry or ModelRegistry(model_dir)
+        self.manifest_path = os.path.join(model_dir, MANIFEST_NAME)
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: dict):
+        os.makedirs(self.model_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def run(self, training_data: pd.DataFrame, species: list, regions: list = None,
+            force: bool = False) -> list:
+        """Train every (species, region) job; returns one report dict per job"""
+        # The forest fits on float32 features anyway; sharing them as float32 halves the block
+        X = np.ascontiguousarray(training_data[FEATURES].to_numpy(np.float32))
+        Y = np.ascontiguousarray(
+            training_data[[f'{name}_probability' for name in species]].to_numpy(np.float64)
+        )
+        if 'region' in training_data.columns:
+            region_values = pd.Categorical(training_data['region'])
+            codes = region_values.codes.astype(np.int32)
+            categories = list(region_values.categories)
+        else:
+            codes = np.zeros(len(training_data), dtype=np.int32)
+            categories = []
+        if regions is None:
+            # Serving reads the 'default' (all rows) model; per-area models are trained alongside it
+            regions = ['default'] + [name for name in categories if name != 'unassigned']
+
+        manifest = self._load_manifest()
+        params_key = json.dumps([FEATURES, self.hyperparams], sort_keys=True)
+        jobs, reports = [], []
+        for region in regions:
+            if region != 'default' and region not in categories:
+                reports.extend({'species': name, 'region': region, 'status': 'failed',
+                                'error': f"no training rows for region {region}", 'seconds': 0.0}
+                               for name in species)
+                continue
+            region_code = -1 if region == 'default' else categories.index(region)
+            rows = np.arange(len(X)) if region_code < 0 else np.flatnonzero(codes == region_code)
+            region_hash = hashlib.sha256(params_key.encode())
+            region_hash.update(X[rows].tobytes())
+            for species_index, name in enumerate(species):
+                content_hash = region_hash.copy()
+                content_hash.update(Y[rows, species_index].tobytes())
+                digest = content_hash.hexdigest()
+                key = f'{name}/{region}'
+                previous = manifest.get(key, {})
+                if (not force and previous.get('hash') == digest and
+                        os.path.exists(self.registry.model_path(name, region, previous.get('version')))):
+                    reports.append({'species': name, 'region': region, 'status': 'skipped',
+                                    'rows': len(rows), 'version': previous['version'], 'seconds': 0.0})
+                    continue
+                jobs.append((name, species_index, region, region_code, digest))
+
+        if jobs:
+            shared = _SharedArrays({'X': X, 'Y': Y, 'regions': codes})
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+                    futures = {
+                        pool.submit(_train_job, shared.specs, name, species_index, region,
+                                    region_code, self.hyperparams, self.model_dir): (name, region, digest)
+                        for name, species_index, region, region_code, digest in jobs
+                    }
+                    for future in as_completed(futures):
+                        name, region, digest = futures[future]
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            reports.append({'species': name, 'region': region, 'status': 'failed',
+                                            'error': str(e), 'seconds': 0.0})
+                            continue
+                        manifest[f'{name}/{region}'] = {'hash': digest, 'version': result['version']}
+                        reports.append({'species': name, 'region': region, 'status': 'trained', **result})
+            finally:
+                shared.close()
+            self._save_manifest(manifest)
+            self.registry.refresh()
+
+        return sorted(reports, key=lambda r: (r['species'], r['region']))
+
+
+def print_report(reports: list, wall_seconds: float):
+    print(f"{'species':<10} {'region':<10} {'status':<8} {'rows':>9} {'mae':>7} {'seconds':>8}")
+    for r in reports:
+        mae = f"{r['mae']:.3f}" if 'mae' in r else '-'
+        print(f"{r['species']:<10} {r['region']:<10} {r['status']:<8} {r.get('rows', 0):>9} "
+              f"{mae:>7} {r['seconds']:>8.2f}")
+        if 'error' in r:
+            print(f"  ❌ {r['error']}")
+    job_seconds = sum(r['seconds'] for r in reports)
+    print(f"⏱️ Wall clock {wall_seconds:.2f}s for {job_seconds:.2f}s of job time")
+
+if __name__ == "__main__":
+    import argparse
+    from data_processing.satellite_loader import SatelliteDataLoader
+    from data_processing.data_cleaner import DataCleaner, CLEANER_STATS_NAME
+    from ai_models.training_features import TrainingFeatureBuilder
+
+    parser = argparse.ArgumentParser(description="Nightly per-species / per-WPP model training")
+    parser.add_argument('--species', nargs='+', default=['tuna', 'skipjack'])
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--end', default='2024-12-31')
+    parser.add_argument('--resolution', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='retrain even when inputs are unchanged')
+    args = parser.parse_args()
+
+    aoi = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+    grid = SatelliteDataLoader().load_gridded_data(
+        datetime.strptime(args.start, '%Y-%m-%d'), datetime.strptime(args.end, '%Y-%m-%d'),
+        aoi, args.resolution
+    )
+    cleaner = DataCleaner()
+    cells = grid.to_frame()
+    cleaner.fit(cells)
+    cells = cleaner.clean_ocean_data(cells)
+    training_data = TrainingFeatureBuilder(species=tuple(args.species)).build(cells)
+    training_data['region'] = assign_regions(cells, load_model_config().get('management_areas') or [])
+
+    started = time.perf_counter()
+    orchestrator = TrainingOrchestrator(max_workers=args.workers)
+    reports = orchestrator.run(training_data, args.species, force=args.force)
+    cleaner.save(os.path.join(orchestrator.model_dir, CLEANER_STATS_NAME))
+    print_report(reports, time.perf_counter() - started)
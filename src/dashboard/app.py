@@ -1,109 +1,509 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, g, render_template, jsonify, request, stream_with_context, url_for
+import json
 import sys
 import os
-import pandas as pd
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 
 # Add parent directory to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(current_dir, '..')
 sys.path.insert(0, src_dir)
 
-from regulatory_engine.compliance_checker import FisheriesCompliance
-from data_processing.satellite_loader import SatelliteDataLoader
-from data_processing.data_cleaner import DataCleaner
-from ai_models.fish_predictor import FishLocationPredictor
+from utils.metrics import metrics, SamplingProfiler
+
+# Components and the pipeline modules behind them (pandas, scikit-learn,
+# joblib) are imported on first use, so importing the app stays cheap and
+# servers decide when to pay for them by calling warm_up()
+
+# Days per chunk when streaming NDJSON prediction rows
+STREAM_CHUNK_DAYS = 31
+
+# Background jobs for long-range / large-AOI predictions. 'auto' requests
+# covering more than ASYNC_CELL_DAYS grid cell-days (a year over the
+# default Indonesia AOI is ~3.5M) are queued instead of answered inline.
+ASYNC_CELL_DAYS = float(os.environ.get('FISHERIES_ASYNC_CELL_DAYS', 2_000_000))
+JOB_DIR = os.environ.get('FISHERIES_JOB_DIR', 'data/jobs')
+JOB_WORKERS = int(os.environ.get('FISHERIES_JOB_WORKERS', 2))
+JOB_EXECUTOR = os.environ.get('FISHERIES_JOB_EXECUTOR', 'thread')
+# Finished job results are deleted this long after their last use, oldest
+# first once they take more than JOB_MAX_BYTES on disk
+JOB_TTL_SECONDS = float(os.environ.get('FISHERIES_JOB_TTL_SECONDS', 7 * 86400))
+JOB_MAX_BYTES = int(os.environ.get('FISHERIES_JOB_MAX_BYTES', 1 << 30))
+
+# Per-request sampling profiles are only honoured when this is set
+PROFILING_ENABLED = os.environ.get('FISHERIES_PROFILING', '0') == '1'
+PROFILE_DIR = os.environ.get('FISHERIES_PROFILE_DIR', 'data/profiles')
+
+HTTP_SECONDS = metrics.histogram('fisheries_http_request_seconds', 'Request latency by route',
+                                 labels=('endpoint', 'method', 'status'))
+# Counted per API request, cache hits included, so tile renders, internal
+# predictor calls and cached compliance answers count the same way
+PREDICTION_REQUESTS = metrics.counter('fisheries_prediction_requests_total',
+                                      'Fish-prediction API requests by response mode', labels=('mode',))
+COMPLIANCE_REQUESTS = metrics.counter('fisheries_compliance_checks_total',
+                                      'Compliance-check API requests by result', labels=('result',))
+SUSTAINABILITY_SCORE_SUM = metrics.counter('fisheries_sustainability_score_sum',
+                                           'Sum of sustainability scores over compliance-check requests')
+HIGH_PROBABILITY_DAYS = metrics.counter('fisheries_high_probability_days_total',
+                                        'Days with a HIGH cell in answered prediction requests',
+                                        labels=('species',))
 
 app = Flask(__name__)
 
-# Initialize components
-compliance_engine = FisheriesCompliance()
-data_loader = SatelliteDataLoader()
-data_cleaner = DataCleaner()
-predictor = FishLocationPredictor()
+class lazy_component:
+    """Build a component on first access, once, even with concurrent first requests"""
+
+    def __init__(self, build):
+        self.build = build
+        self.name = build.__name__
+        self.__doc__ = build.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        with instance._lock:
+            if self.name not in instance.__dict__:
+                # Stored on the instance, so later lookups bypass this descriptor
+                instance.__dict__[self.name] = self.build(instance)
+        return instance.__dict__[self.name]
+
+class Components:
+    """The dashboard's engines and caches, each constructed when first used"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def built(self) -> list:
+        return [name for name in vars(self) if not name.startswith('_')]
+
+    @lazy_component
+    def compliance_engine(self):
+        from regulatory_engine.compliance_checker import FisheriesCompliance
+        return FisheriesCompliance()
+
+    @lazy_component
+    def data_loader(self):
+        from data_processing.satellite_loader import SatelliteDataLoader
+        return SatelliteDataLoader()
+
+    @lazy_component
+    def data_cleaner(self):
+        from data_processing.data_cleaner import DataCleaner, CLEANER_STATS_NAME
+        cleaner = DataCleaner()
+        readiness['cleaner_stats'] = cleaner.load(os.path.join(self.predictor.model_dir, CLEANER_STATS_NAME))
+        return cleaner
+
+    @lazy_component
+    def predictor(self):
+        from ai_models.fish_predictor import FishLocationPredictor
+        return FishLocationPredictor()
+
+    @lazy_component
+    def response_cache(self):
+        from dashboard.response_cache import ResponseCache
+        return ResponseCache(ttl_seconds=300, max_entries=256)
+
+    @lazy_component
+    def tile_service(self):
+        from dashboard.tile_service import TileService
+        return TileService(self.data_loader, self.data_cleaner, self.predictor)
+
+    @lazy_component
+    def job_queue(self):
+        # The worker pool itself starts on the first submit, so it is never
+        # created in a gunicorn master and lost across the fork
+        from dashboard.job_queue import JobQueue
+        return JobQueue(run_prediction_job, JOB_DIR, max_workers=JOB_WORKERS, executor=JOB_EXECUTOR,
+                        result_ttl_seconds=JOB_TTL_SECONDS, max_result_bytes=JOB_MAX_BYTES)
+
+components = Components()
+
+def __getattr__(name):
+    """Keep ``app.predictor``-style module attributes working for scripts and benchmarks"""
+    if isinstance(vars(Components).get(name), lazy_component):
+        return getattr(components, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+readiness = {'ready': False, 'models': [], 'cleaner_stats': False}
+
+def warm_up() -> dict:
+    """Build every component, then preload and compile models so no request pays for them
+
+    With inference='lut' it also loads or builds each model's lookup table.
+    Call once before serving (serve.py does, in the gunicorn master before
+    forking); /ready reports 503 until it has run.
+    """
+    predictor = components.predictor
+    readiness['models'] = [list(key) for key in predictor.registry.preload()]
+    if predictor.inference != 'sklearn':
+        for key in readiness['models']:
+            predictor.compile(predictor.registry.get(*key))
+    if predictor.inference == 'lut':
+        for species, region, version in readiness['models']:
+            predictor.prepare_lut(predictor.registry.get(species, region, version), species, region, version)
+    for name in ('compliance_engine', 'data_loader', 'data_cleaner', 'response_cache', 'tile_service',
+                 'job_queue'):
+        getattr(components, name)
+    readiness['ready'] = True
+    return readiness
+
+def collect_component_stats():
+    """Scrape-time gauges from the caches' and registry's own stats(); never builds a component"""
+    built = components.built()
+    if 'response_cache' in built:
+        responses = components.response_cache.stats()
+        for outcome in ('hits', 'misses', 'coalesced'):
+            yield ('fisheries_response_cache_total', 'Response cache lookups by outcome',
+                   {'outcome': outcome}, responses[outcome])
+        yield 'fisheries_response_cache_entries', 'Cached API responses', {}, responses['entries']
+    if 'tile_service' in built:
+        tiles = components.tile_service.stats()
+        tile_outcomes = {'memory_hit': tiles['memory']['hits'], 'disk_hit': tiles['disk_hits'],
+                         'rendered': tiles['rendered']}
+        for outcome, count in tile_outcomes.items():
+            yield 'fisheries_tile_cache_total', 'Heatmap tile lookups by outcome', {'outcome': outcome}, count
+    if 'data_loader' in built and components.data_loader.cache is not None:
+        satellite = components.data_loader.cache.stats()
+        for outcome in ('hits', 'misses', 'evictions'):
+            yield ('fisheries_satellite_cache_total', 'Satellite tile cache lookups and evictions',
+                   {'outcome': outcome}, satellite[outcome])
+        yield 'fisheries_satellite_cache_bytes', 'Satellite tiles in the on-disk cache', {}, satellite['bytes']
+    if 'job_queue' in built:
+        yield 'fisheries_jobs_pending', 'Background jobs queued or running in this worker', {}, \
+            components.job_queue.stats()['pending']
+    if 'predictor' in built:
+        for (species, region, version), seconds in list(components.predictor.registry.load_times.items()):
+            yield ('fisheries_model_load_seconds', 'Time to load each model from disk',
+                   {'species': species, 'region': region, 'version': version}, seconds)
+
+metrics.add_collector(collect_component_stats)
+
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+    if PROFILING_ENABLED and (request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'):
+        g.profiler = SamplingProfiler().start()
+
+@app.after_request
+def record_request(response):
+    """Observe latency per route (streamed bodies: time to first byte) and save any profile"""
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    start = g.pop('request_start', None)
+    if start is not None:
+        HTTP_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint,
+                             method=request.method, status=response.status_code)
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+        path = os.path.join(PROFILE_DIR, f"{datetime.now():%Y%m%d-%H%M%S-%f}-{request.endpoint}.folded")
+        profiler.save(path)
+        response.headers['X-Profile'] = f"{path} ({profiler.samples} samples)"
+    return response
 
 @app.route('/')
 def index():
     """Main dashboard page"""
     return render_template('index.html')
 
+@app.route('/ready')
+def ready():
+    """Readiness probe: 200 once models are loaded and regulations compiled"""
+    built = components.built()
+    rules_version = components.compliance_engine.rules_version if 'compliance_engine' in built else None
+    status = {**readiness, 'pid': os.getpid(), 'components': built, 'rules_version': rules_version}
+    return jsonify(status), 200 if readiness['ready'] else 503
+
 @app.route('/api/compliance-check', methods=['POST'])
 def compliance_check():
     """API for compliance checking"""
     try:
         data = request.json
-        result = compliance_engine.check_fishing_approval(
-            species=data['species'],
-            location=[data.get('lon', 106.0), data.get('lat', -6.0)],  # Default: Jakarta area
-            date=datetime.strptime(data['date'], '%Y-%m-%d'),
-            gear_type=data['gear_type'],
-            proposed_catch=float(data['proposed_catch'])
-        )
-        return jsonify(result)
+        query = {
+            'species': data['species'],
+            'location': [float(data.get('lon', 106.0)), float(data.get('lat', -6.0))],  # Default: Jakarta area
+            'date': data['date'],
+            'gear_type': data['gear_type'],
+            'proposed_catch': float(data['proposed_catch'])
+        }
+        compliance_engine = components.compliance_engine
+        response_cache = components.response_cache
+        key = response_cache.make_key('compliance-check', query, compliance_engine.rules_version)
+        def check():
+            result = compliance_engine.check_fishing_approval(
+                species=query['species'],
+                location=query['location'],
+                date=datetime.strptime(query['date'], '%Y-%m-%d'),
+                gear_type=query['gear_type'],
+                proposed_catch=query['proposed_catch']
+            )
+            return app.json.dumps(result), result
+        body, etag, result = response_cache.get_or_compute(key, check, meta=True)
+        COMPLIANCE_REQUESTS.inc(result='approved' if result['approved'] else 'rejected')
+        SUSTAINABILITY_SCORE_SUM.inc(result['sustainability_score'])
+        return _cached_response(body, etag)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/fish-prediction', methods=['POST'])
 def fish_prediction():
-    """API for fish location prediction"""
+    """API for fish location prediction
+
+    ``mode`` is 'sync' (answer inline), 'async' (queue a background job and
+    return 202 with its id) or 'auto' (the default: async only when the
+    request covers more than ASYNC_CELL_DAYS).
+    """
     try:
+        from dashboard.serialization import iter_ndjson
+        from dashboard.job_queue import JobQueueFull
         data = request.json
+        query = _normalize_prediction_request(data)
+        mode = data.get('mode', 'auto')
+        if mode not in ('auto', 'sync', 'async'):
+            raise ValueError(f"Unknown mode: {mode}")
+        if query['format'] == 'ndjson':
+            if mode == 'async':
+                raise ValueError("ndjson responses already stream; use records or columnar for async jobs")
+            PREDICTION_REQUESTS.inc(mode='stream')
+            on_summary = lambda summary: _count_high_days(summary, query['species'])
+            return Response(stream_with_context(iter_ndjson(_iter_prediction_chunks(query), query['species'],
+                                                            on_summary)),
+                            mimetype='application/x-ndjson')
         
-        # Generate ocean data for prediction
-        aoi = {
-            'lat_min': data.get('lat_min', -8.0),   # More realistic Indonesia bounds
-            'lat_max': data.get('lat_max', 5.0),
-            'lon_min': data.get('lon_min', 95.0),
-            'lon_max': data.get('lon_max', 141.0)
-        }
-        
-        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d')
-        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d')
-        
-        # Get ocean data
-        raw_data = data_loader.load_historical_data(start_date, end_date, aoi)
-        cleaned_data = data_cleaner.clean_ocean_data(raw_data)
-        
-        # Get predictions
-        predictions = predictor.predict_fish_locations(cleaned_data, data['species'])
-        
-        # Convert to JSON-serializable format
-        results = []
-        for _, row in predictions.iterrows():
-            results.append({
-                'date': row['date'].strftime('%Y-%m-%d'),
-                'sst': float(row['sst']),
-                'chlorophyll': float(row['chlorophyll']),
-                'probability': float(row[f"{data['species']}_probability"]),
-                'recommendation': row['recommendation']
-            })
+        species_list = query['species'] if isinstance(query['species'], list) else [query['species']]
+        registry = components.predictor.registry
+        model_versions = {species: registry.latest_version(species) for species in species_list}
         
-        return jsonify({
-            'predictions': results,
-            'summary': {
-                'total_days': len(results),
-                'high_recommendations': len([r for r in results if r['recommendation'] == 'HIGH']),
-                'avg_probability': sum(r['probability'] for r in results) / len(results)
-            }
-        })
+        response_cache = components.response_cache
+        key = response_cache.make_key('fish-prediction', query, model_versions)
+        # A large 'auto' request already answered inline is served from the cache, not queued
+        cached = None
+        if mode == 'auto' and _prediction_cell_days(query) > ASYNC_CELL_DAYS:
+            cached = response_cache.get(key, meta=True)
+            if cached is None:
+                mode = 'async'
+        if mode == 'async':
+            try:
+                status = components.job_queue.submit(key, query)
+            except JobQueueFull as e:
+                return jsonify({'error': str(e)}), 503
+            PREDICTION_REQUESTS.inc(mode='async')
+            response = jsonify(_job_links(status))
+            response.status_code = 202
+            response.headers['Location'] = url_for('job_status', job_id=key)
+            return response
+
+        body, etag, high_days = cached or response_cache.get_or_compute(key, lambda: _predict_body(query),
+                                                                        meta=True)
+        PREDICTION_REQUESTS.inc(mode='sync')
+        _count_high_days(high_days, query['species'])
+        return _cached_response(body, etag)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+def _normalize_prediction_request(data: dict) -> dict:
+    """Fill defaults and canonicalize types so equivalent requests share a cache key"""
+    datetime.strptime(data['start_date'], '%Y-%m-%d')
+    datetime.strptime(data['end_date'], '%Y-%m-%d')
+    response_format = data.get('format', 'records')
+    if response_format not in ('records', 'columnar', 'ndjson'):
+        raise ValueError(f"Unknown format: {response_format}")
+    return {
+        'species': list(data['species']) if isinstance(data['species'], list) else data['species'],
+        'format': response_format,
+        'start_date': data['start_date'],
+        'end_date': data['end_date'],
+        'aoi': {
+            'lat_min': float(data.get('lat_min', -8.0)),   # More realistic Indonesia bounds
+            'lat_max': float(data.get('lat_max', 5.0)),
+            'lon_min': float(data.get('lon_min', 95.0)),
+            'lon_max': float(data.get('lon_max', 141.0))
+        }
+    }
+
+def _predictions_frame(query: dict, start_date: datetime, end_date: datetime):
+    """Run load → clean → predict for a normalized request over one date range"""
+    raw_data = components.data_loader.load_historical_data(start_date, end_date, query['aoi'])
+    cleaned_data = components.data_cleaner.clean_ocean_data(raw_data)
+    predictor = components.predictor
+    
+    # Several species share one feature matrix and one response
+    if isinstance(query['species'], list):
+        return predictor.predict_species_batch(cleaned_data, query['species'])
+    return predictor.predict_fish_locations(cleaned_data, query['species'])
+
+def _predict(query: dict) -> dict:
+    from dashboard.serialization import serialize_predictions
+    start_date = datetime.strptime(query['start_date'], '%Y-%m-%d')
+    end_date = datetime.strptime(query['end_date'], '%Y-%m-%d')
+    predictions = _predictions_frame(query, start_date, end_date)
+    return serialize_predictions(predictions, query['species'], query['format'])
+
+def _predict_body(query: dict) -> tuple:
+    """Serialized response plus its summary, which the cache keeps so hits count the same days"""
+    payload = _predict(query)
+    return app.json.dumps(payload), payload['summary']
+
+def _count_high_days(summary: dict, species):
+    per_species = summary['species'] if isinstance(species, list) else {species: summary}
+    for name, values in per_species.items():
+        HIGH_PROBABILITY_DAYS.inc(values['high_probability_days'], species=name)
+
+def _prediction_windows(query: dict, chunk_days: int = STREAM_CHUNK_DAYS):
+    """(start, end) date windows of at most chunk_days covering the requested range"""
+    start_date = datetime.strptime(query['start_date'], '%Y-%m-%d')
+    end_date = datetime.strptime(query['end_date'], '%Y-%m-%d')
+    while start_date <= end_date:
+        chunk_end = min(start_date + timedelta(days=chunk_days - 1), end_date)
+        yield start_date, chunk_end
+        start_date = chunk_end + timedelta(days=1)
+
+def _iter_prediction_chunks(query: dict, chunk_days: int = STREAM_CHUNK_DAYS):
+    """Yield prediction frames window by window so streaming starts before the range is done"""
+    for start_date, end_date in _prediction_windows(query, chunk_days):
+        yield _predictions_frame(query, start_date, end_date)
+
+def _prediction_cell_days(query: dict) -> float:
+    """Size of a request in grid cells × days at the loader's resolution, the unit its cost scales with"""
+    days = (datetime.strptime(query['end_date'], '%Y-%m-%d')
+            - datetime.strptime(query['start_date'], '%Y-%m-%d')).days + 1
+    resolution = components.data_loader.resolution
+    aoi = query['aoi']
+    cells = (max(aoi['lat_max'] - aoi['lat_min'], resolution) / resolution
+             * max(aoi['lon_max'] - aoi['lon_min'], resolution) / resolution)
+    return max(days, 0) * cells
+
+def run_prediction_job(query: dict, files) -> bytes:
+    """Background job body: predict window by window, publishing each window's rows as it finishes
+
+    Module-level so a process-pool executor can pickle it. Partial rows
+    are NDJSON; the final body has the same shape as the synchronous
+    response.
+    """
+    from dashboard.serialization import RunningSummary, prediction_fields, to_columns, to_records
+    windows = list(_prediction_windows(query))
+    files.start(total=len(windows))
+    fields = prediction_fields(query['species'])
+    summary = RunningSummary(query['species'])
+    columns = {field: [] for field in fields}
+    for done, (start_date, end_date) in enumerate(windows, 1):
+        predictions = _predictions_frame(query, start_date, end_date)
+        summary.update(predictions)
+        chunk = to_columns(predictions, fields)
+        for field, values in chunk.items():
+            columns[field].extend(values)
+        files.advance(done, ''.join(json.dumps(record) + '\n' for record in to_records(chunk)).encode())
+    payload = {
+        'predictions': columns if query['format'] == 'columnar' else to_records(columns),
+        'summary': summary.result()
+    }
+    _count_high_days(payload['summary'], query['species'])
+    return app.json.dumps(payload).encode()
+
+def _job_links(status: dict) -> dict:
+    return {
+        **status,
+        'status_url': url_for('job_status', job_id=status['job_id']),
+        'result_url': url_for('job_result', job_id=status['job_id']),
+        'partial_url': url_for('job_result', job_id=status['job_id'], partial=1)
+    }
+
+def _cached_response(body: bytes, etag: str, mimetype: str = 'application/json'):
+    """Response carrying an ETag; 304 when the client already has this body"""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    return response
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """State and progress (windows done / total) of a background prediction job"""
+    try:
+        status = components.job_queue.status(job_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    if status is None:
+        return jsonify({'error': f"Unknown job: {job_id}"}), 404
+    return jsonify(_job_links(status))
+
+@app.route('/api/jobs/<job_id>/result')
+def job_result(job_id):
+    """Finished job body; ``?partial=1`` on an unfinished job returns the NDJSON rows done so far"""
+    job_queue = components.job_queue
+    try:
+        status = job_queue.status(job_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    if status is None:
+        return jsonify({'error': f"Unknown job: {job_id}"}), 404
+    if request.args.get('partial') == '1' and status['state'] != 'done':
+        response = Response(job_queue.partial(job_id), mimetype='application/x-ndjson')
+        response.headers['X-Job-Progress'] = f"{status.get('done', 0)}/{status.get('total')}"
+        return response
+    body = job_queue.result(job_id)
+    if body is None:
+        return jsonify(_job_links(status)), 409 if status['state'] == 'failed' else 202
+    # Results are immutable for a job id (it hashes the query and model versions)
+    return _cached_response(body, job_id)
+
+@app.route('/tiles/<species>/<date>/<int:z>/<int:x>/<int:y>.<fmt>')
+def probability_tile(species, date, z, x, y, fmt):
+    """Probability heatmap tile (Web Mercator z/x/y) as PNG or uint8 .bin"""
+    from dashboard.tile_service import TILE_FORMATS
+    try:
+        body, etag = components.tile_service.get_tile(species, date, z, x, y, fmt)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    response = _cached_response(body, etag, TILE_FORMATS[fmt])
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
+
+@app.route('/api/cache-stats')
+def cache_stats():
+    """API for response and satellite tile cache statistics"""
+    data_loader = components.data_loader
+    return jsonify({
+        'responses': components.response_cache.stats(),
+        'tiles': components.tile_service.stats(),
+        'satellite_tiles': data_loader.cache.stats() if data_loader.cache else None,
+        'jobs': components.job_queue.stats()
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text exposition of this worker's metrics"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/dashboard-stats')
 def dashboard_stats():
-    """API for dashboard statistics"""
-    # Generate sample stats
+    """API for dashboard statistics, counted since this worker started
+
+    total_predictions and compliance_checks count API requests (cache hits
+    included); high_probability_days sums, over prediction requests, the
+    days with a HIGH cell.
+    """
+    checks = metrics.total('fisheries_compliance_checks_total')
     stats = {
-        'total_predictions': 247,
-        'compliance_checks': 156,
-        'avg_sustainability_score': 0.76,
-        'high_probability_days': 42,
-        'protected_areas_monitored': 18
+        'total_predictions': int(metrics.total('fisheries_prediction_requests_total')),
+        'compliance_checks': int(checks),
+        'avg_sustainability_score':
+            round(metrics.total('fisheries_sustainability_score_sum') / checks, 3) if checks else None,
+        'high_probability_days': int(metrics.total('fisheries_high_probability_days_total')),
+        'protected_areas_monitored':
+            len(components.compliance_engine.regulations.get('protected_areas') or []),
+        'metrics_enabled': metrics.enabled
     }
     return jsonify(stats)
 
 if __name__ == '__main__':
     print("🚀 Starting Fisheries AI Dashboard...")
+    warm_up()
+    print(f"🤖 Preloaded models: {len(readiness['models'])}")
     print("🌐 Access at: http://localhost:5000")
     app.run(debug=True, host='0.0.0.0', port=5000)
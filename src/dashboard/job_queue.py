@@ -0,0 +1,321 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.insert(0, src_dir)
+
+from utils.metrics import metrics
+
+JOB_ID_PATTERN = re.compile(r'[\w-]+')
+
+JOBS = metrics.counter('fisheries_jobs_total', 'Background jobs by submission outcome and result',
+                       labels=('outcome',))
+
+
+class JobQueueFull(Exception):
+    """Raised when max_pending jobs are already queued or running"""
+
+
+class JobFiles:
+    """On-disk record of one job: progress, partial NDJSON rows and the final body
+
+    Everything a status request needs lives in files keyed on the job id,
+    so any process (a process-pool worker, another gunicorn worker) can
+    report on a job and finished results survive restarts.
+    """
+
+    def __init__(self, result_dir: str, job_id: str):
+        self.job_id = job_id
+        self.result_path = os.path.join(result_dir, f'{job_id}.json')
+        self.partial_path = os.path.join(result_dir, f'{job_id}.partial.ndjson')
+        self.progress_path = os.path.join(result_dir, f'{job_id}.progress.json')
+
+    def _write_progress(self, **fields):
+        os.makedirs(os.path.dirname(self.progress_path), exist_ok=True)
+        progress = {**(self.read_progress() or {}), **fields, 'updated': time.time()}
+        tmp_path = f"{self.progress_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(progress, file)
+        os.replace(tmp_path, self.progress_path)
+
+    def queued(self):
+        self._write_progress(state='queued', done=0, total=None, submitted=time.time(),
+                             started=None, finished=None, error=None)
+
+    def start(self, total: int):
+        """Called by the worker before the first chunk"""
+        open(self.partial_path, 'wb').close()
+        self._write_progress(state='running', done=0, total=total, started=time.time())
+
+    def advance(self, done: int, rows: bytes = b''):
+        """Append one chunk's NDJSON rows and record how many chunks are finished"""
+        if rows:
+            with open(self.partial_path, 'ab') as file:
+                file.write(rows)
+        self._write_progress(done=done)
+
+    def finish(self, body: bytes):
+        tmp_path = f"{self.result_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(body)
+        os.replace(tmp_path, self.result_path)
+        self._write_progress(state='done', finished=time.time())
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+
+    def fail(self, error: Exception):
+        self._write_progress(state='failed', finished=time.time(), error=f'{type(error).__name__}: {error}')
+
+    def touch(self):
+        """Mark the job as alive without rewriting progress another process may be updating"""
+        try:
+            os.utime(self.progress_path)
+        except OSError:
+            pass
+
+    def last_update(self, progress: dict) -> float:
+        """Latest of the progress 'updated' field and the last touch()"""
+        try:
+            touched = os.path.getmtime(self.progress_path)
+        except OSError:
+            touched = 0.0
+        return max(progress.get('updated', 0), touched)
+
+    def paths(self) -> list:
+        return [self.result_path, self.partial_path, self.progress_path]
+
+    def read_progress(self):
+        try:
+            with open(self.progress_path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def has_result(self) -> bool:
+        return os.path.exists(self.result_path)
+
+
+def _run_job(work, files: JobFiles, params: dict):
+    """Pool entry point: run work(params, files) and record failure instead of raising"""
+    try:
+        files.finish(work(params, files))
+        return True
+    except Exception as e:
+        files.fail(e)
+        return False
+
+
+class JobQueue:
+    """Bounded local worker pool for slow requests, with dedupe and disk results
+
+    submit() takes a job id derived from the normalized request (and model
+    version), so identical requests share one job while it is pending and
+    reuse its stored result afterwards. While this queue holds a job it
+    touches the job's progress file every stale_seconds / 4, queued or
+    running; one not touched for stale_seconds is treated as abandoned
+    (its worker was recycled) and resubmitted. Finished jobs are deleted
+    result_ttl_seconds after their last use, and the least recently used
+    go first once results exceed max_result_bytes. ``work(params, files)``
+    must return the final body as bytes and report progress through
+    ``files.start`` / ``files.advance``; with ``executor='process'`` it
+    has to be a picklable module-level function.
+    """
+
+    def __init__(self, work, result_dir: str = "data/jobs", max_workers: int = 2,
+                 max_pending: int = 16, executor: str = 'thread', stale_seconds: float = 600,
+                 result_ttl_seconds: float = 7 * 86400, max_result_bytes: int = 1 << 30,
+                 cleanup_seconds: float = 60):
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"unknown executor: {executor}")
+        self.work = work
+        self.result_dir = result_dir
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = executor
+        self.stale_seconds = stale_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_result_bytes = max_result_bytes
+        self.cleanup_seconds = cleanup_seconds
+        self._next_cleanup = 0.0
+        self._pool = None
+        self._heartbeat = None
+        self._stop = threading.Event()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._pool is None:
+            pool_class = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.max_workers)
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name='job-heartbeat', daemon=True)
+            self._heartbeat.start()
+        return self._pool
+
+    def _heartbeat_loop(self):
+        """Keep this queue's jobs from looking abandoned while they wait or run"""
+        while not self._stop.wait(self.stale_seconds / 4):
+            with self._lock:
+                job_ids = list(self._pending)
+            for job_id in job_ids:
+                JobFiles(self.result_dir, job_id).touch()
+
+    def files(self, job_id: str) -> JobFiles:
+        if not JOB_ID_PATTERN.fullmatch(job_id):
+            raise ValueError(f"invalid job id: {job_id!r}")
+        return JobFiles(self.result_dir, job_id)
+
+    def _pending_elsewhere(self, files: JobFiles) -> bool:
+        """Another process (e.g. a sibling gunicorn worker) is queueing or running this job"""
+        progress = files.read_progress()
+        return (progress is not None and progress.get('state') in ('queued', 'running')
+                and time.time() - files.last_update(progress) < self.stale_seconds)
+
+    def submit(self, job_id: str, params: dict) -> dict:
+        """Queue a job unless an identical one is pending or already finished; returns its status"""
+        files = self.files(job_id)
+        if time.monotonic() >= self._next_cleanup:
+            self._next_cleanup = time.monotonic() + self.cleanup_seconds
+            self.cleanup()
+        with self._lock:
+            if job_id in self._pending or self._pending_elsewhere(files):
+                JOBS.inc(outcome='deduplicated')
+                return self.status(job_id)
+            if files.has_result():
+                JOBS.inc(outcome='cached')
+                files.touch()
+                return self.status(job_id)
+            if len(self._pending) >= self.max_pending:
+                JOBS.inc(outcome='rejected')
+                raise JobQueueFull(f"{len(self._pending)} jobs already pending")
+            files.queued()
+            future = self._get_pool().submit(_run_job, self.work, files, params)
+            self._pending[job_id] = future
+            JOBS.inc(outcome='submitted')
+        future.add_done_callback(lambda done: self._finished(job_id, done))
+        return self.status(job_id)
+
+    def _finished(self, job_id: str, future):
+        with self._lock:
+            self._pending.pop(job_id, None)
+        if future.cancelled():
+            JOBS.inc(outcome='cancelled')
+        else:
+            JOBS.inc(outcome='completed' if not future.exception() and future.result() else 'failed')
+
+    def status(self, job_id: str):
+        """State, progress and timestamps of a job, or None if this queue has never seen it"""
+        files = self.files(job_id)
+        progress = files.read_progress()
+        if progress is None:
+            if not files.has_result():
+                return None
+            progress = {'state': 'done'}
+        if progress.get('state') == 'done' and not files.has_result():
+            return None
+        return {'job_id': job_id, **progress}
+
+    def result(self, job_id: str):
+        """Final body bytes, or None while the job is unfinished"""
+        files = self.files(job_id)
+        try:
+            with open(files.result_path, 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def partial(self, job_id: str) -> bytes:
+        """NDJSON rows of the chunks finished so far; empty once the job is done"""
+        files = self.files(job_id)
+        try:
+            with open(files.partial_path, 'rb') as file:
+                return file.read()
+        except OSError:
+            return b''
+
+    def cleanup(self) -> int:
+        """Delete finished jobs past result_ttl_seconds, then the least recently used over max_result_bytes
+
+        Jobs queued or running here or in another process are left alone.
+        Returns the number of jobs deleted.
+        """
+        try:
+            names = os.listdir(self.result_dir)
+        except OSError:
+            return 0
+        with self._lock:
+            pending = set(self._pending)
+        jobs = {}
+        for name in names:
+            job_id = name.split('.', 1)[0]
+            if name.endswith('.tmp') or job_id in pending or not JOB_ID_PATTERN.fullmatch(job_id):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.result_dir, name))
+            except OSError:
+                continue
+            size, used = jobs.get(job_id, (0, 0.0))
+            jobs[job_id] = (size + stat.st_size, max(used, stat.st_mtime))
+
+        now = time.time()
+        total = sum(size for size, _ in jobs.values())
+        deleted = 0
+        for job_id, (size, used) in sorted(jobs.items(), key=lambda item: item[1][1]):
+            if now - used < self.result_ttl_seconds and total <= self.max_result_bytes:
+                break
+            files = JobFiles(self.result_dir, job_id)
+            if self._pending_elsewhere(files):
+                continue
+            for path in files.paths():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            deleted += 1
+        if deleted:
+            JOBS.inc(deleted, outcome='expired')
+        return deleted
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'pending': len(self._pending), 'max_pending': self.max_pending,
+                    'workers': self.max_workers, 'executor': self.executor}
+
+    def shutdown(self, wait: bool = True):
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+
+
+def _demo_work(params: dict, files: JobFiles) -> bytes:
+    files.start(total=params['chunks'])
+    for chunk in range(params['chunks']):
+        time.sleep(params['seconds'])
+        files.advance(chunk + 1, (json.dumps({'chunk': chunk}) + '\n').encode())
+    return json.dumps({'chunks': params['chunks']}).encode()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as result_dir:
+        jobs = JobQueue(_demo_work, result_dir, max_workers=2)
+        first = jobs.submit('demo', {'chunks': 5, 'seconds': 0.05})
+        duplicate = jobs.submit('demo', {'chunks': 5, 'seconds': 0.05})
+        print(f"📥 submitted: {first['state']}, duplicate shares it: {duplicate['job_id'] == first['job_id']}")
+        while jobs.status('demo')['state'] in ('queued', 'running'):
+            status = jobs.status('demo')
+            print(f"   {status['state']} {status['done']}/{status['total']}, "
+                  f"{len(jobs.partial('demo').splitlines())} partial rows")
+            time.sleep(0.06)
+        print(f"✅ {jobs.status('demo')['state']}: {jobs.result('demo').decode()}")
+        print(f"💾 resubmitted after completion: {jobs.submit('demo', {'chunks': 5, 'seconds': 0.05})['state']}")
+        jobs.shutdown()
+        print(f"📊 {jobs.stats()}")
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """One in-progress computation that concurrent identical requests wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+class ResponseCache:
+    """TTL + LRU cache of serialized API responses with request coalescing
+
+    Entries are keyed on the normalized request plus the version of whatever
+    produced it (model or rule set), so publishing a new model naturally
+    misses. Concurrent misses for the same key run the computation once; the
+    other callers wait for its result.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.saved_seconds = 0.0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, request_data: dict, version) -> str:
+        raw = json.dumps([endpoint, request_data, version], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str, meta: bool = False):
+        """Fresh cached result for key, as get_or_compute returns it, or None; never computes"""
+        with self._lock:
+            return self._get_locked(key, meta)
+
+    def _get_locked(self, key: str, meta: bool):
+        entry = self._entries.get(key)
+        if entry is None or entry['expires'] <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.saved_seconds += entry['compute_seconds']
+        return self._result(entry, meta)
+
+    def get_or_compute(self, key: str, compute, meta: bool = False):
+        """Return (body, etag) for key, running compute() -> bytes|str only on a miss
+
+        With meta=True, compute() returns (body, meta) and every call,
+        hits included, returns (body, etag, meta).
+        """
+        with self._lock:
+            cached = self._get_locked(key, meta)
+            if cached is not None:
+                return cached
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self._lock:
+                self.saved_seconds += flight.entry['compute_seconds']
+            return self._result(flight.entry, meta)
+
+        try:
+            start = time.perf_counter()
+            body, extra = compute() if meta else (compute(), None)
+            if isinstance(body, str):
+                body = body.encode()
+            entry = {
+                'body': body,
+                'etag': hashlib.sha1(body).hexdigest(),
+                'meta': extra,
+                'compute_seconds': time.perf_counter() - start,
+                'expires': time.monotonic() + self.ttl_seconds
+            }
+            flight.entry = entry
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return self._result(entry, meta)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    @staticmethod
+    def _result(entry: dict, meta: bool) -> tuple:
+        if meta:
+            return entry['body'], entry['etag'], entry['meta']
+        return entry['body'], entry['etag']
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses + self.coalesced
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_rate': (self.hits + self.coalesced) / requests if requests else 0.0,
+                'saved_seconds': round(self.saved_seconds, 6)
+            }
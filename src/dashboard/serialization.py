@@ -0,0 +1,128 @@
+import json
+import numpy as np
+import pandas as pd
+
+from data_processing.schema import FLOAT32_DECIMALS
+
+
+def prediction_fields(species) -> dict:
+    """Response field -> prediction frame column, for one species or a list of them"""
+    fields = {'date': 'date', 'sst': 'sst', 'chlorophyll': 'chlorophyll'}
+    if isinstance(species, list):
+        for name in species:
+            fields[f'{name}_probability'] = f'{name}_probability'
+            fields[f'{name}_recommendation'] = f'{name}_recommendation'
+    else:
+        fields['probability'] = f'{species}_probability'
+        fields['recommendation'] = 'recommendation'
+    return fields
+
+
+def to_columns(predictions: pd.DataFrame, fields: dict) -> dict:
+    """Convert whole columns at once into JSON-ready Python lists"""
+    columns = {}
+    for field, column in fields.items():
+        values = predictions[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            columns[field] = values.dt.strftime('%Y-%m-%d').tolist()
+        elif values.dtype == np.float32:
+            columns[field] = np.round(values.to_numpy(np.float64), FLOAT32_DECIMALS).tolist()
+        elif pd.api.types.is_numeric_dtype(values):
+            columns[field] = values.to_numpy(np.float64).tolist()
+        else:
+            columns[field] = values.astype(str).tolist()
+    return columns
+
+
+def to_records(columns: dict) -> list:
+    """Row-oriented view of to_columns output"""
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def high_probability_days(predictions: pd.DataFrame, recommendation_column: str) -> int:
+    """Distinct dates with at least one HIGH cell"""
+    high = predictions[recommendation_column].to_numpy() == 'HIGH'
+    return int(pd.unique(predictions['date'].to_numpy()[high]).size)
+
+
+def summarize(predictions: pd.DataFrame, species) -> dict:
+    """Summary statistics computed with array reductions"""
+    def species_summary(probability_column, recommendation_column):
+        probability = predictions[probability_column].to_numpy(np.float64)
+        return {
+            'high_recommendations': int(np.count_nonzero(predictions[recommendation_column].to_numpy() == 'HIGH')),
+            'high_probability_days': high_probability_days(predictions, recommendation_column),
+            'avg_probability': float(probability.mean()) if len(probability) else None
+        }
+
+    if isinstance(species, list):
+        return {
+            'total_days': len(predictions),
+            'species': {name: species_summary(f'{name}_probability', f'{name}_recommendation')
+                        for name in species}
+        }
+    return {'total_days': len(predictions), **species_summary(f'{species}_probability', 'recommendation')}
+
+
+def serialize_predictions(predictions: pd.DataFrame, species, shape: str = 'records') -> dict:
+    """Response payload in 'records' (list of rows) or 'columnar' ({field: [...]}) shape"""
+    columns = to_columns(predictions, prediction_fields(species))
+    return {
+        'predictions': columns if shape == 'columnar' else to_records(columns),
+        'summary': summarize(predictions, species)
+    }
+
+
+class RunningSummary:
+    """Incrementally merged summary for streamed prediction chunks
+
+    Chunks cover disjoint date windows, so per-chunk high-probability
+    day counts add up.
+    """
+
+    def __init__(self, species):
+        self.species = species
+        self.names = species if isinstance(species, list) else [species]
+        self.total_days = 0
+        self.high = dict.fromkeys(self.names, 0)
+        self.high_days = dict.fromkeys(self.names, 0)
+        self.probability_sum = dict.fromkeys(self.names, 0.0)
+
+    def update(self, predictions: pd.DataFrame):
+        self.total_days += len(predictions)
+        for name in self.names:
+            recommendation = 'recommendation' if name == self.species else f'{name}_recommendation'
+            self.high[name] += int(np.count_nonzero(predictions[recommendation].to_numpy() == 'HIGH'))
+            self.high_days[name] += high_probability_days(predictions, recommendation)
+            self.probability_sum[name] += float(predictions[f'{name}_probability'].to_numpy(np.float64).sum())
+
+    def result(self) -> dict:
+        def species_summary(name):
+            return {
+                'high_recommendations': self.high[name],
+                'high_probability_days': self.high_days[name],
+                'avg_probability': self.probability_sum[name] / self.total_days if self.total_days else None
+            }
+        if isinstance(self.species, list):
+            return {'total_days': self.total_days,
+                    'species': {name: species_summary(name) for name in self.names}}
+        return {'total_days': self.total_days, **species_summary(self.species)}
+
+
+def iter_ndjson(prediction_chunks, species, on_summary=None):
+    """Stream one JSON line per row as each chunk arrives, then a final summary line
+
+    on_summary(summary), if given, sees the final summary once the stream completes.
+    """
+    fields = prediction_fields(species)
+    summary = RunningSummary(species)
+    for predictions in prediction_chunks:
+        summary.update(predictions)
+        lines = [json.dumps(record) for record in to_records(to_columns(predictions, fields))]
+        if lines:
+            yield ('\n'.join(lines) + '\n').encode()
+    result = summary.result()
+    if on_summary is not None:
+        on_summary(result)
+    yield (json.dumps({'summary': result}) + '\n').encode()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Production server for the dashboard: prefork workers sharing one warm parent
+
+The Flask app (models, compiled regulation tables, spatial index) is
+imported once in the gunicorn master and the workers are forked from it,
+so they share those pages copy-on-write. Workers are recycled gracefully
+after --max-requests requests (with jitter so they don't restart together).
+
+    python src/dashboard/serve.py --workers 4 --bind 0.0.0.0:5000
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.insert(0, src_dir)
+
+
+def build_options(args) -> dict:
+    return {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'preload_app': True,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests_jitter,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'keepalive': 5,
+        'accesslog': '-' if args.access_log else None,
+    }
+
+
+def serve(args):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        from dashboard.app import app, warm_up
+        print("⚠️ gunicorn not installed; falling back to a single-process threaded server.")
+        warm_up()
+        app.run(host=args.bind.rsplit(':', 1)[0], port=int(args.bind.rsplit(':', 1)[1]),
+                threaded=True, debug=False)
+        return
+
+    class DashboardServer(BaseApplication):
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            # With preload_app this runs once in the master, before forking
+            from dashboard.app import app, warm_up
+            warm_up()
+            return app
+
+    print(f"🚀 Serving Fisheries AI Dashboard on http://{args.bind} with {args.workers} workers")
+    DashboardServer(build_options(args)).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Fisheries AI dashboard with prefork workers")
+    parser.add_argument('--bind', default=os.environ.get('FISHERIES_BIND', '0.0.0.0:5000'))
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('FISHERIES_WORKERS', multiprocessing.cpu_count())))
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--max-requests', type=int, default=1000,
+                        help='recycle a worker after this many requests (0 disables)')
+    parser.add_argument('--max-requests-jitter', type=int, default=100)
+    parser.add_argument('--timeout', type=int, default=60)
+    parser.add_argument('--graceful-timeout', type=int, default=30)
+    parser.add_argument('--access-log', action='store_true')
+    serve(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
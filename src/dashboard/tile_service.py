@@ -0,0 +1,304 @@
+import numpy as np
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from dashboard.response_cache import ResponseCache
+
+TILE_SIZE = 256
+TILE_FORMATS = {'png': 'image/png', 'bin': 'application/octet-stream'}
+# .bin tiles: 256 x 256 uint8, row-major from the north-west corner,
+# probability = value / 254, 255 = no data
+BIN_NODATA = 255
+SPECIES_PATTERN = re.compile(r'^[a-z_]+$')
+DEFAULT_AOI = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+
+# Colour ramp stops (probability, RGB): low blue → medium yellow → high red
+_RAMP = [(0.0, (49, 54, 149)), (0.4, (116, 173, 209)), (0.55, (254, 224, 144)),
+         (0.7, (244, 109, 67)), (1.0, (165, 0, 38))]
+
+
+def _colormap(alpha: int = 190) -> np.ndarray:
+    """256 x 4 RGBA lookup, index = round(probability * 254); index 255 is transparent"""
+    levels = np.linspace(0, 1, 255)
+    stops = np.array([stop for stop, _ in _RAMP])
+    colours = np.array([rgb for _, rgb in _RAMP], dtype=float)
+    table = np.zeros((256, 4), dtype=np.uint8)
+    for channel in range(3):
+        table[:255, channel] = np.round(np.interp(levels, stops, colours[:, channel]))
+    table[:255, 3] = alpha
+    return table
+
+
+COLORMAP = _colormap()
+
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    """Minimal RGBA PNG encoder (zlib only, filter type 0 on every row)"""
+    height, width = rgba.shape[:2]
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)) +
+            chunk(b'IEND', b''))
+
+
+def tiles_covering(aoi: dict, z: int):
+    """(x, y) of every tile at zoom z that intersects the AOI"""
+    n = 2 ** z
+    to_x = lambda lon: int(np.clip((lon + 180) / 360 * n, 0, n - 1))
+    to_y = lambda lat: int(np.clip(
+        (1 - np.log(np.tan(np.radians(lat)) + 1 / np.cos(np.radians(lat))) / np.pi) / 2 * n, 0, n - 1))
+    for x in range(to_x(aoi['lon_min']), to_x(aoi['lon_max']) + 1):
+        for y in range(to_y(aoi['lat_max']), to_y(aoi['lat_min']) + 1):
+            yield x, y
+
+
+class ProbabilityPyramid:
+    """A day's probability raster plus 2x-downsampled levels for lower zooms
+
+    Level k has cells of ``resolution * 2**k`` degrees, each the NaN-aware
+    mean of the 2x2 cells below it, all anchored at the same south-west
+    corner. Rows run south to north.
+    """
+
+    def __init__(self, levels: list, lat0: float, lon0: float, resolution: float):
+        self.levels = levels
+        self.lat0 = lat0
+        self.lon0 = lon0
+        self.resolution = resolution
+
+    @classmethod
+    def from_raster(cls, raster: np.ndarray, lat0: float, lon0: float, resolution: float):
+        levels = [raster.astype(np.float32)]
+        while max(levels[-1].shape) > 1:
+            previous = levels[-1]
+            rows, cols = -(-previous.shape[0] // 2) * 2, -(-previous.shape[1] // 2) * 2
+            padded = np.full((rows, cols), np.nan, dtype=np.float32)
+            padded[:previous.shape[0], :previous.shape[1]] = previous
+            blocks = padded.reshape(rows // 2, 2, cols // 2, 2)
+            counts = np.count_nonzero(~np.isnan(blocks), axis=(1, 3))
+            sums = np.nansum(blocks, axis=(1, 3))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                levels.append(np.where(counts > 0, sums / counts, np.nan).astype(np.float32))
+        return cls(levels, lat0, lon0, resolution)
+
+    def sample(self, z: int, x: int, y: int) -> np.ndarray:
+        """Probabilities at the centre of every pixel of tile (z, x, y), NaN off the raster"""
+        n = 2 ** z
+        pixel = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+        lons = (x + pixel) / n * 360 - 180
+        lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + pixel) / n))))
+
+        # Coarsest level still at least as fine as one screen pixel
+        pixel_degrees = 360 / (TILE_SIZE * n)
+        level = int(np.clip(np.floor(np.log2(pixel_degrees / self.resolution)), 0, len(self.levels) - 1))
+        raster = self.levels[level]
+        cell = self.resolution * 2 ** level
+
+        rows = np.floor((lats - self.lat0) / cell).astype(np.int64)
+        cols = np.floor((lons - self.lon0) / cell).astype(np.int64)
+        row_ok = (rows >= 0) & (rows < raster.shape[0])
+        col_ok = (cols >= 0) & (cols < raster.shape[1])
+        values = np.full((TILE_SIZE, TILE_SIZE), np.nan, dtype=np.float32)
+        if row_ok.any() and col_ok.any():
+            values[np.ix_(row_ok, col_ok)] = raster[np.ix_(rows[row_ok], cols[col_ok])]
+        return values
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            np.savez(file, origin=np.array([self.lat0, self.lon0, self.resolution]),
+                     **{f'level_{k}': level for k, level in enumerate(self.levels)})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            lat0, lon0, resolution = data['origin'].tolist()
+            levels = [data[f'level_{k}'] for k in range(len(data.files) - 1)]
+        return cls(levels, lat0, lon0, resolution)
+
+
+class TileService:
+    """Lazily rendered, two-level cached probability heatmap tiles
+
+    The first request for a (species, date, model version) predicts the
+    whole AOI on the base grid once and keeps the resulting pyramid in
+    memory and on disk. Tiles are cut from the pyramid on demand and cached
+    in memory (ResponseCache, with request coalescing) and on disk under
+    ``{cache_dir}/{species}/{version}/{date}/{z}/{x}/{y}.{fmt}``; a new model
+    version gets fresh paths, so stale tiles are never served.
+    """
+
+    def __init__(self, data_loader, data_cleaner, predictor, cache_dir: str = "data/tiles",
+                 aoi: dict = None, resolution: float = 0.05, max_zoom: int = 12,
+                 memory_tiles: int = 4096, memory_pyramids: int = 8):
+        self.data_loader = data_loader
+        self.data_cleaner = data_cleaner
+        self.predictor = predictor
+        self.cache_dir = cache_dir
+        self.aoi = aoi or DEFAULT_AOI
+        self.resolution = resolution
+        self.max_zoom = max_zoom
+        self.memory_pyramids = memory_pyramids
+        self.tile_cache = ResponseCache(ttl_seconds=24 * 3600, max_entries=memory_tiles)
+        self.rendered = 0
+        self.disk_hits = 0
+        self._pyramids = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def model_version(self, species: str) -> str:
+        return self.predictor.registry.latest_version(species) or 'heuristic'
+
+    def _day_dir(self, species: str, version: str, date: str) -> str:
+        return os.path.join(self.cache_dir, species, version, date)
+
+    def pyramid(self, species: str, date: str, version: str = None) -> ProbabilityPyramid:
+        """Probability pyramid for one day, from memory, disk or a fresh prediction"""
+        version = version or self.model_version(species)
+        key = (species, date, version)
+        with self._lock:
+            if key in self._pyramids:
+                self._pyramids.move_to_end(key)
+                return self._pyramids[key]
+
+        # One build at a time: concurrent first requests wait and then reuse it
+        with self._build_lock:
+            with self._lock:
+                if key in self._pyramids:
+                    return self._pyramids[key]
+            path = os.path.join(self._day_dir(species, version, date), 'pyramid.npz')
+            if os.path.exists(path):
+                pyramid = ProbabilityPyramid.load(path)
+            else:
+                pyramid = self._build_pyramid(species, date)
+                pyramid.save(path)
+            with self._lock:
+                self._pyramids[key] = pyramid
+                while len(self._pyramids) > self.memory_pyramids:
+                    self._pyramids.popitem(last=False)
+        return pyramid
+
+    def _build_pyramid(self, species: str, date: str) -> ProbabilityPyramid:
+        day = datetime.strptime(date, '%Y-%m-%d')
+        grid = self.data_loader.load_gridded_data(day, day, self.aoi, self.resolution)
+        cleaned = self.data_cleaner.clean_ocean_data(grid.to_frame())
+        predictions = self.predictor.predict_species_batch(cleaned, [species])
+
+        raster = np.full(len(grid.lats) * len(grid.lons), np.nan, dtype=np.float32)
+        raster[predictions.index.to_numpy()] = predictions[f'{species}_probability'].to_numpy(np.float32)
+        return ProbabilityPyramid.from_raster(
+            raster.reshape(len(grid.lats), len(grid.lons)),
+            lat0=grid.lats[0] - grid.resolution / 2, lon0=grid.lons[0] - grid.resolution / 2,
+            resolution=grid.resolution
+        )
+
+    def render(self, species: str, date: str, z: int, x: int, y: int, fmt: str = 'png',
+               version: str = None) -> bytes:
+        values = self.pyramid(species, date, version).sample(z, x, y)
+        codes = np.full(values.shape, BIN_NODATA, dtype=np.uint8)
+        valid = ~np.isnan(values)
+        codes[valid] = np.round(np.clip(values[valid], 0, 1) * 254).astype(np.uint8)
+        with self._lock:
+            self.rendered += 1
+        if fmt == 'bin':
+            return codes.tobytes()
+        return encode_png(COLORMAP[codes])
+
+    def get_tile(self, species: str, date: str, z: int, x: int, y: int, fmt: str = 'png'):
+        """(body, etag) for one tile: memory, then disk, then render and store"""
+        if fmt not in TILE_FORMATS:
+            raise ValueError(f"Unknown tile format: {fmt}")
+        if not SPECIES_PATTERN.match(species):
+            raise ValueError(f"Invalid species: {species}")
+        if not 0 <= z <= self.max_zoom or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise ValueError(f"Tile {z}/{x}/{y} out of range")
+        datetime.strptime(date, '%Y-%m-%d')
+        version = self.model_version(species)
+        key = ResponseCache.make_key('tile', [species, date, z, x, y, fmt], version)
+        return self.tile_cache.get_or_compute(
+            key, lambda: self._disk_tile(species, date, z, x, y, fmt, version))
+
+    def _disk_tile(self, species: str, date: str, z: int, x: int, y: int, fmt: str,
+                   version: str) -> bytes:
+        path = os.path.join(self._day_dir(species, version, date), str(z), str(x), f'{y}.{fmt}')
+        try:
+            with open(path, 'rb') as file:
+                body = file.read()
+            with self._lock:
+                self.disk_hits += 1
+            return body
+        except FileNotFoundError:
+            pass
+        body = self.render(species, date, z, x, y, fmt, version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(body)
+        os.replace(tmp_path, path)
+        return body
+
+    def prerender(self, species_list: list, date: str, max_zoom: int = 8,
+                  formats: tuple = ('png',)) -> dict:
+        """Render every AOI tile up to max_zoom into the disk cache (skips existing files)"""
+        counts = {'tiles': 0, 'rendered': 0}
+        for species in species_list:
+            for z in range(max_zoom + 1):
+                for x, y in tiles_covering(self.aoi, z):
+                    for fmt in formats:
+                        before = self.rendered
+                        self.get_tile(species, date, z, x, y, fmt)
+                        counts['tiles'] += 1
+                        counts['rendered'] += self.rendered - before
+        return counts
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'memory': self.tile_cache.stats(), 'disk_hits': self.disk_hits,
+                    'rendered': self.rendered, 'pyramids': len(self._pyramids)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from data_processing.satellite_loader import SatelliteDataLoader
+    from data_processing.data_cleaner import DataCleaner, CLEANER_STATS_NAME
+    from ai_models.fish_predictor import FishLocationPredictor
+
+    parser = argparse.ArgumentParser(description="Pre-render heatmap tiles for a forecast day")
+    parser.add_argument('--species', nargs='+', default=['tuna', 'skipjack'])
+    parser.add_argument('--date', default=(datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d'),
+                        help='forecast day (default: tomorrow)')
+    parser.add_argument('--max-zoom', type=int, default=7)
+    parser.add_argument('--formats', nargs='+', choices=list(TILE_FORMATS), default=['png'])
+    parser.add_argument('--cache-dir', default='data/tiles')
+    args = parser.parse_args()
+
+    predictor = FishLocationPredictor()
+    cleaner = DataCleaner()
+    cleaner.load(os.path.join(predictor.model_dir, CLEANER_STATS_NAME))
+    service = TileService(SatelliteDataLoader(), cleaner, predictor, cache_dir=args.cache_dir)
+
+    print(f"🗺️ Pre-rendering {', '.join(args.species)} tiles for {args.date}, zoom 0-{args.max_zoom}")
+    started = time.perf_counter()
+    counts = service.prerender(args.species, args.date, args.max_zoom, tuple(args.formats))
+    print(f"✅ {counts['tiles']} tiles ({counts['rendered']} newly rendered) in "
+          f"{time.perf_counter() - started:.1f}s → {args.cache_dir}")
@@ -1,51 +1,244 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.impute import SimpleImputer
+import json
+import os
+import sys
+
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from data_processing.schema import apply_schema
+from utils.metrics import timed
+
+CLEANER_STATS_NAME = 'cleaner_stats.json'
+
+class RunningStats:
+    """Streaming per-column count / mean / M2, merged chunk by chunk, NaN-aware"""
 
-class DataCleaner:
     def __init__(self):
-        self.scaler = StandardScaler()
-        self.imputer = SimpleImputer(strategy='mean')
-    
-    def clean_ocean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and preprocess oceanographic data"""
-        df_clean = df.copy()
-        
-        # Handle missing values
+        self.count = {}
+        self.mean = {}
+        self.m2 = {}
+
+    def update(self, frame: pd.DataFrame):
+        """Merge one chunk's statistics (Chan et al. parallel variance update)"""
+        for column in frame.select_dtypes(include=[np.number]).columns:
+            values = frame[column].to_numpy(np.float64)
+            values = values[~np.isnan(values)]
+            n = len(values)
+            if n == 0:
+                continue
+            mean = values.mean()
+            m2 = np.square(values - mean).sum()
+
+            count = self.count.get(column, 0)
+            if count == 0:
+                self.count[column], self.mean[column], self.m2[column] = n, mean, m2
+                continue
+            total = count + n
+            delta = mean - self.mean[column]
+            self.mean[column] += delta * n / total
+            self.m2[column] += m2 + delta * delta * count * n / total
+            self.count[column] = total
+        return self
+
+    def std(self, column: str) -> float:
+        """Population standard deviation (as StandardScaler), 1.0 for constant columns"""
+        std = np.sqrt(self.m2[column] / self.count[column])
+        return std if std > 0 else 1.0
+
+    def to_dict(self) -> dict:
+        return {column: {'count': self.count[column], 'mean': float(self.mean[column]),
+                         'm2': float(self.m2[column])} for column in self.count}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        stats = cls()
+        for column, values in data.items():
+            stats.count[column] = values['count']
+            stats.mean[column] = values['mean']
+            stats.m2[column] = values['m2']
+        return stats
+
+class SeenRowHashes:
+    """Row hashes passed by incremental dedupe, bucketed by day and bounded to a window
+
+    Identical rows share their date, so a chunk is only checked against the
+    buckets of the days it contains. Each bucket is a few sorted runs that
+    merge when a new run reaches half the size of the one before it
+    (log-many runs, no full re-sort per chunk). Days more than window_days
+    older than the newest day seen are dropped; rows arriving for a dropped
+    day can no longer be recognised as duplicates.
+    """
+
+    def __init__(self, window_days: int = 31):
+        self.window_days = window_days
+        self._runs = {}
+        self._newest = None
+
+    def __len__(self) -> int:
+        return sum(len(run) for runs in self._runs.values() for run in runs)
+
+    def clear(self):
+        self._runs.clear()
+        self._newest = None
+
+    @staticmethod
+    def _contains(runs: list, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in runs:
+            position = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[position] == hashes
+        return found
+
+    @staticmethod
+    def _add(runs: list, hashes: np.ndarray):
+        runs.append(np.sort(hashes))
+        while len(runs) > 1 and 2 * len(runs[-1]) >= len(runs[-2]):
+            merged = np.concatenate([runs.pop(-2), runs.pop()])
+            merged.sort(kind='stable')  # two sorted runs: a linear merge
+            runs.append(merged)
+
+    def filter_new(self, hashes: np.ndarray, days: np.ndarray = None) -> np.ndarray:
+        """Mask of rows not seen before (first occurrence within the chunk wins); records them
+
+        ``days`` holds each row's day number; without it every row shares
+        one bucket that is never evicted.
+        """
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        candidates = np.flatnonzero(keep)
+        if days is None:
+            groups = [(None, candidates)]
+        else:
+            order = np.argsort(days[candidates], kind='stable')
+            candidates = candidates[order]
+            unique_days, starts = np.unique(days[candidates], return_index=True)
+            groups = zip(unique_days.tolist(), np.split(candidates, starts[1:]))
+
+        for day, rows in groups:
+            runs = self._runs.setdefault(day, [])
+            if runs:
+                seen = self._contains(runs, hashes[rows])
+                keep[rows[seen]] = False
+                rows = rows[~seen]
+            if len(rows):
+                self._add(runs, hashes[rows])
+
+        if days is not None and len(days) and self.window_days is not None:
+            newest = int(days.max())
+            self._newest = newest if self._newest is None else max(self._newest, newest)
+            for day in [day for day in self._runs if day is not None and day < self._newest - self.window_days]:
+                del self._runs[day]
+        return keep
+
+
+class DataCleaner:
+    def __init__(self, dedupe_window_days: int = 31):
+        self.stats = None
+        self.seen_rows = SeenRowHashes(dedupe_window_days)
+
+    @property
+    def fitted(self) -> bool:
+        return self.stats is not None
+
+    def partial_fit(self, df: pd.DataFrame):
+        """Update the imputation/scaling statistics with one chunk"""
+        if self.stats is None:
+            self.stats = RunningStats()
+        self.stats.update(self.create_fishing_features(self._add_temporal_features(df.copy(deep=False))))
+        return self
+
+    def fit(self, df: pd.DataFrame):
+        """Fit statistics from scratch (use partial_fit to feed years of data chunk by chunk)"""
+        self.stats = None
+        return self.partial_fit(df)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(self.stats.to_dict(), file, indent=2)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        """Load fitted statistics if the file exists; returns whether it did"""
+        if not os.path.exists(path):
+            return False
+        with open(path, 'r') as file:
+            self.stats = RunningStats.from_dict(json.load(file))
+        return True
+
+    @timed('cleaner.clean')
+    def clean_ocean_data(self, df: pd.DataFrame, incremental_dedupe: bool = False) -> pd.DataFrame:
+        """Clean and preprocess oceanographic data into the compact schema
+
+        Works on a shallow copy: columns are replaced or added, never written
+        in place, so the caller's frame is untouched without duplicating it.
+        """
+        df_clean = apply_schema(df.copy(deep=False))
+
+        # Handle missing values: fitted means if available, else this batch's means
+        stats = self.stats if self.fitted else RunningStats().update(df_clean)
         numeric_columns = df_clean.select_dtypes(include=[np.number]).columns
-        if len(numeric_columns) > 0:
-            df_clean[numeric_columns] = self.imputer.fit_transform(df_clean[numeric_columns])
-        
+        fill_values = {column: stats.mean[column] for column in numeric_columns
+                       if column in stats.mean and df_clean[column].isna().any()}
+        if fill_values:
+            df_clean = df_clean.fillna(fill_values)
+
         # Remove duplicates
-        df_clean = df_clean.drop_duplicates()
-        
+        df_clean = self.drop_duplicates(df_clean, incremental=incremental_dedupe)
+
         # Add temporal features
-        if 'date' in df_clean.columns:
-            df_clean['date'] = pd.to_datetime(df_clean['date'])
-            df_clean['day_of_year'] = df_clean['date'].dt.dayofyear
-            df_clean['month'] = df_clean['date'].dt.month
-            df_clean['season'] = (df_clean['month'] % 12 + 3) // 3
-        
-        return df_clean
-    
-    def create_fishing_features(self, ocean_data: pd.DataFrame, 
+        return self._add_temporal_features(df_clean)
+
+    def drop_duplicates(self, df: pd.DataFrame, incremental: bool = False) -> pd.DataFrame:
+        """Hash-based dedupe; with incremental=True rows seen in earlier chunks are dropped too
+
+        Incremental state spans calls until reset_dedupe(), limited to the
+        cleaner's dedupe window of days when rows carry a date.
+        """
+        if not incremental:
+            return df.drop_duplicates()
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy(np.uint64)
+        days = None
+        if 'date' in df.columns:
+            days = pd.to_datetime(df['date']).to_numpy().astype('datetime64[D]').astype(np.int64)
+        return df[self.seen_rows.filter_new(hashes, days)]
+
+    def reset_dedupe(self):
+        """Forget rows seen by incremental dedupe, e.g. at the start of a new run"""
+        self.seen_rows.clear()
+
+    def _add_temporal_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        if 'date' in df.columns:
+            if not pd.api.types.is_datetime64_any_dtype(df['date']):
+                df['date'] = pd.to_datetime(df['date'])
+            df['day_of_year'] = df['date'].dt.dayofyear.astype(np.int16)
+            df['month'] = df['date'].dt.month.astype(np.int8)
+            df['season'] = (df['month'] % 12 + 3) // 3
+        return df
+
+    def create_fishing_features(self, ocean_data: pd.DataFrame,
                               historical_catch: pd.DataFrame = None) -> pd.DataFrame:
         """Create features for fish prediction model"""
-        features = ocean_data.copy()
-        
+        features = ocean_data.copy(deep=False)
+
         # Basic feature engineering
         if 'sst' in features.columns and 'chlorophyll' in features.columns:
             features['sst_chlorophyll_interaction'] = features['sst'] * features['chlorophyll']
-        
+
         return features
-    
+
     def scale_features(self, features: pd.DataFrame) -> pd.DataFrame:
         """Scale features for machine learning"""
         numeric_columns = features.select_dtypes(include=[np.number]).columns
         if len(numeric_columns) > 0:
-            features_scaled = features.copy()
-            features_scaled[numeric_columns] = self.scaler.fit_transform(features[numeric_columns])
+            stats = self.stats if self.fitted else RunningStats().update(features[numeric_columns])
+            features_scaled = features.copy(deep=False)
+            for column in numeric_columns:
+                if column in stats.mean:
+                    features_scaled[column] = (features[column] - stats.mean[column]) / stats.std(column)
             return features_scaled
         return features
 
@@ -57,15 +250,20 @@ if __name__ == "__main__":
         'sst': [28.5, 29.1, 27.8],
         'chlorophyll': [0.8, 0.9, 0.6]
     })
-    
+
     cleaner = DataCleaner()
     cleaned_data = cleaner.clean_ocean_data(sample_data)
-    
+
     print("Original Data:")
     print(sample_data)
     print("\nCleaned Data:")
     print(cleaned_data)
-    
+
     features = cleaner.create_fishing_features(cleaned_data)
     print("\nFeatures:")
     print(features)
+
+    # Fit once, chunk by chunk, then transform with the stored statistics
+    cleaner.partial_fit(sample_data.iloc[:2]).partial_fit(sample_data.iloc[2:])
+    print("\nScaled Features (fitted statistics):")
+    print(cleaner.scale_features(features[['sst', 'chlorophyll']]))
@@ -0,0 +1,332 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+import os
+import sys
+
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from utils.metrics import timed
+
+DEFAULT_WINDOWS = (3, 7, 30)
+KM_PER_DEGREE = 111.32
+
+# Days per batch in transform(): bounds the cumulative-sum scratch space
+TRANSFORM_CHUNK_DAYS = 64
+
+
+def front_strength(field: np.ndarray, lats: np.ndarray, resolution: float) -> np.ndarray:
+    """Horizontal gradient magnitude per km with a 3x3 Sobel stencil
+
+    Works on a (lat, lon) field or a (time, lat, lon) cube; edges are
+    padded by repetition and cells next to NaN (land, cloud) give NaN.
+    """
+    field = np.asarray(field, dtype=np.float32)
+    padded = np.pad(field, [(0, 0)] * (field.ndim - 2) + [(1, 1), (1, 1)], mode='edge')
+    before, row, after = padded[..., :-2, :], padded[..., 1:-1, :], padded[..., 2:, :]
+    # Sobel response of a unit-per-cell ramp is 8, hence the 1/8
+    gx = ((before[..., 2:] - before[..., :-2]) + 2 * (row[..., 2:] - row[..., :-2]) +
+          (after[..., 2:] - after[..., :-2])) / 8
+    gy = ((after[..., :-2] - before[..., :-2]) + 2 * (after[..., 1:-1] - before[..., 1:-1]) +
+          (after[..., 2:] - before[..., 2:])) / 8
+    cell_km_y = np.float32(resolution * KM_PER_DEGREE)
+    cell_km_x = (cell_km_y * np.cos(np.deg2rad(lats))).astype(np.float32)[:, None]
+    return np.hypot(gx / cell_km_x, gy / cell_km_y).astype(np.float32)
+
+
+class RollingWindows:
+    """NaN-aware rolling means per cell from a ring buffer of daily fields
+
+    Running float64 sums and valid counts are kept per window: each new
+    day adds its field and subtracts the one leaving the window, so an
+    update costs O(cells) whatever the window lengths. Sums are rebuilt
+    from the buffer once per lap to stop floating-point drift.
+    """
+
+    def __init__(self, windows: tuple, shape: tuple):
+        self.windows = tuple(sorted(windows))
+        self.capacity = self.windows[-1]
+        self.buffer = np.full((self.capacity,) + tuple(shape), np.nan, dtype=np.float32)
+        self.sums = np.zeros((len(self.windows),) + tuple(shape), dtype=np.float64)
+        self.counts = np.zeros((len(self.windows),) + tuple(shape), dtype=np.int32)
+        self.days = 0
+
+    def push(self, field: np.ndarray) -> np.ndarray:
+        """Add one day; returns the (windows, lat, lon) means including it"""
+        valid = ~np.isnan(field)
+        values = np.where(valid, field, 0.0)
+        for k, window in enumerate(self.windows):
+            if self.days >= window:
+                leaving = self.buffer[(self.days - window) % self.capacity]
+                leaving_valid = ~np.isnan(leaving)
+                self.sums[k] -= np.where(leaving_valid, leaving, 0.0)
+                self.counts[k] -= leaving_valid
+            self.sums[k] += values
+            self.counts[k] += valid
+        self.buffer[self.days % self.capacity] = field
+        self.days += 1
+        if self.days % self.capacity == 0:
+            self._resync()
+        return self.means()
+
+    def extend(self, cube: np.ndarray) -> np.ndarray:
+        """Add many days at once with cumulative sums; returns (days, windows, lat, lon) means"""
+        history = self.chronological()
+        series = np.concatenate([history, np.asarray(cube, dtype=np.float32)])
+        valid = ~np.isnan(series)
+        sums = np.zeros((len(series) + 1,) + series.shape[1:], dtype=np.float64)
+        counts = np.zeros((len(series) + 1,) + series.shape[1:], dtype=np.int32)
+        np.cumsum(np.where(valid, series, 0.0), axis=0, out=sums[1:])
+        np.cumsum(valid, axis=0, out=counts[1:])
+
+        end = np.arange(len(history) + 1, len(series) + 1)
+        means = np.empty((len(cube), len(self.windows)) + series.shape[1:], dtype=np.float32)
+        for k, window in enumerate(self.windows):
+            total = sums[end] - sums[end - window]
+            count = counts[end] - counts[end - window]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means[:, k] = np.where(count > 0, total / count, np.nan)
+
+        # Day d lives in slot d % capacity; slots before day 0 keep NaN
+        self.days += len(cube)
+        slots = (self.days - self.capacity + np.arange(self.capacity)) % self.capacity
+        self.buffer[slots] = series[-self.capacity:]
+        self._resync()
+        return means
+
+    def chronological(self) -> np.ndarray:
+        """The buffer oldest day first; days never pushed stay NaN"""
+        return np.roll(self.buffer, -(self.days % self.capacity), axis=0)
+
+    def means(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.counts > 0, self.sums / self.counts, np.nan).astype(np.float32)
+
+    def _resync(self):
+        history = self.chronological()
+        valid = ~np.isnan(history)
+        values = np.where(valid, history, 0.0)
+        for k, window in enumerate(self.windows):
+            self.sums[k] = values[-window:].sum(axis=0, dtype=np.float64)
+            self.counts[k] = valid[-window:].sum(axis=0)
+
+
+class MonthlyClimatology:
+    """Per-cell calendar-month means, accumulated as running sums and counts"""
+
+    def __init__(self, shape: tuple):
+        self.sums = np.zeros((12,) + tuple(shape), dtype=np.float64)
+        self.counts = np.zeros((12,) + tuple(shape), dtype=np.int32)
+
+    def update(self, cube: np.ndarray, months: np.ndarray):
+        """Fold (days, lat, lon) fields observed in the given calendar months into the means"""
+        cube = np.asarray(cube)
+        months = np.asarray(months)
+        for month in np.unique(months):
+            days = cube[months == month]
+            valid = ~np.isnan(days)
+            self.sums[month - 1] += np.where(valid, days, 0.0).sum(axis=0)
+            self.counts[month - 1] += valid.sum(axis=0)
+        return self
+
+    def mean(self, months) -> np.ndarray:
+        """Climatological field(s) for one month or an array of months; NaN where unseen"""
+        index = np.asarray(months) - 1
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.counts[index] > 0, self.sums[index] / self.counts[index],
+                            np.nan).astype(np.float32)
+
+    @property
+    def fitted(self) -> bool:
+        return bool(self.counts.any())
+
+
+class OceanFeatureEngine:
+    """Rolling means, climatology anomalies and front strength on a fixed grid
+
+    transform() processes a whole OceanGrid with cumulative sums and
+    stencils over the cube; update() takes one new day and touches only
+    that day's fields plus the ring buffers. Both leave the engine in the
+    same state, so a backfill can be followed by cheap daily refreshes.
+    Chlorophyll statistics use log10(chlorophyll), as it is log-normal.
+
+    Features per variable: ``{var}_mean_{n}d`` for each window,
+    ``{var}_anomaly`` (needs a fitted climatology) and ``{var}_front``.
+    """
+
+    def __init__(self, lats: np.ndarray, lons: np.ndarray, resolution: float,
+                 variables: tuple = ('sst', 'chlorophyll'), windows: tuple = DEFAULT_WINDOWS):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.resolution = resolution
+        self.variables = tuple(variables)
+        self.windows = tuple(sorted(windows))
+        shape = (len(self.lats), len(self.lons))
+        self.rolling = {name: RollingWindows(self.windows, shape) for name in self.variables}
+        self.climatology = {name: MonthlyClimatology(shape) for name in self.variables}
+        self.last_date = None
+
+    @classmethod
+    def for_grid(cls, grid, **options):
+        return cls(grid.lats, grid.lons, grid.resolution, **options)
+
+    @property
+    def feature_names(self) -> list:
+        names = []
+        for name in self.variables:
+            names += [f'{name}_mean_{window}d' for window in self.windows]
+            names += [f'{name}_anomaly', f'{name}_front']
+        return names
+
+    def _prepare(self, name: str, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float32)
+        if name == 'chlorophyll':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = np.log10(np.where(values > 0, values, np.nan)).astype(np.float32)
+        return values
+
+    def _check(self, grid):
+        if grid.shape[1:] != (len(self.lats), len(self.lons)) or \
+                not np.allclose(grid.lats, self.lats) or not np.allclose(grid.lons, self.lons):
+            raise ValueError("grid does not match the engine's lat/lon axes")
+
+    def fit_climatology(self, grid):
+        """Add a reference period (ideally several years) to the monthly climatology"""
+        self._check(grid)
+        months = pd.DatetimeIndex(grid.dates).month.to_numpy()
+        for name in self.variables:
+            self.climatology[name].update(self._prepare(name, grid[name]), months)
+        return self
+
+    def _anomaly_and_front(self, name: str, values: np.ndarray, months) -> dict:
+        climatology = self.climatology[name]
+        anomaly = values - climatology.mean(months) if climatology.fitted else \
+            np.full(values.shape, np.nan, dtype=np.float32)
+        return {f'{name}_anomaly': anomaly.astype(np.float32),
+                f'{name}_front': front_strength(values, self.lats, self.resolution)}
+
+    @timed('features.update')
+    def update(self, date: datetime, fields: dict) -> dict:
+        """Features for one new day from its (lat, lon) fields; missed days count as gaps"""
+        day = np.datetime64(date, 'D')
+        if self.last_date is not None:
+            if day <= self.last_date:
+                raise ValueError(f"{day} is not after the last processed day {self.last_date}")
+            gap = np.full((len(self.lats), len(self.lons)), np.nan, dtype=np.float32)
+            for _ in range(int((day - self.last_date).astype(int)) - 1):
+                for name in self.variables:
+                    self.rolling[name].push(gap)
+
+        month = pd.Timestamp(day).month
+        features = {}
+        for name in self.variables:
+            values = self._prepare(name, fields[name])
+            means = self.rolling[name].push(values)
+            features.update({f'{name}_mean_{window}d': means[k] for k, window in enumerate(self.windows)})
+            features.update(self._anomaly_and_front(name, values, month))
+        self.last_date = day
+        return features
+
+    @timed('features.transform')
+    def transform(self, grid, chunk_days: int = TRANSFORM_CHUNK_DAYS) -> dict:
+        """Features for every day of grid as (time, lat, lon) cubes, chunk by chunk"""
+        self._check(grid)
+        if self.last_date is not None and grid.dates[0] != self.last_date + 1:
+            raise ValueError(f"grid starts {grid.dates[0]}, expected {self.last_date + 1}")
+        months = pd.DatetimeIndex(grid.dates).month.to_numpy()
+        features = {feature: np.empty(grid.shape, dtype=np.float32) for feature in self.feature_names}
+
+        for start in range(0, len(grid.dates), chunk_days):
+            days = slice(start, start + chunk_days)
+            for name in self.variables:
+                values = self._prepare(name, grid[name][days])
+                means = self.rolling[name].extend(values)
+                for k, window in enumerate(self.windows):
+                    features[f'{name}_mean_{window}d'][days] = means[:, k]
+                for feature, cube in self._anomaly_and_front(name, values, months[days]).items():
+                    features[feature][days] = cube
+        self.last_date = grid.dates[-1]
+        return features
+
+    @staticmethod
+    def add_to_frame(frame: pd.DataFrame, features: dict) -> pd.DataFrame:
+        """Attach feature cubes to grid.to_frame() output (same date, lat, lon row order)"""
+        for feature, cube in features.items():
+            frame[feature] = cube.reshape(-1)
+        return frame
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        state = {'lats': self.lats, 'lons': self.lons, 'resolution': self.resolution,
+                 'variables': np.array(self.variables), 'windows': np.array(self.windows),
+                 'last_date': np.array(self.last_date if self.last_date is not None else 'NaT',
+                                       dtype='datetime64[D]')}
+        for name in self.variables:
+            rolling, climatology = self.rolling[name], self.climatology[name]
+            state.update({f'{name}.buffer': rolling.buffer, f'{name}.days': rolling.days,
+                          f'{name}.climatology_sums': climatology.sums,
+                          f'{name}.climatology_counts': climatology.counts})
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            np.savez(file, **state)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'OceanFeatureEngine':
+        with np.load(path) as state:
+            engine = cls(state['lats'], state['lons'], float(state['resolution']),
+                         tuple(state['variables'].tolist()), tuple(state['windows'].tolist()))
+            last_date = state['last_date'][()]
+            engine.last_date = None if np.isnat(last_date) else last_date
+            for name in engine.variables:
+                rolling, climatology = engine.rolling[name], engine.climatology[name]
+                rolling.buffer[:] = state[f'{name}.buffer']
+                rolling.days = int(state[f'{name}.days'])
+                rolling._resync()
+                climatology.sums[:] = state[f'{name}.climatology_sums']
+                climatology.counts[:] = state[f'{name}.climatology_counts']
+        return engine
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from data_processing.satellite_loader import SatelliteDataLoader
+
+    parser = argparse.ArgumentParser(description="Daily refresh of gridded ocean features")
+    parser.add_argument('--date', default='2024-03-01', help='day to add (YYYY-MM-DD)')
+    parser.add_argument('--state', default='data/features/engine_state.npz')
+    parser.add_argument('--history-days', type=int, default=365,
+                        help='backfill (and climatology period) when no state exists yet')
+    parser.add_argument('--resolution', type=float, default=0.25)
+    args = parser.parse_args()
+
+    aoi = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+    loader = SatelliteDataLoader(resolution=args.resolution)
+    day = datetime.strptime(args.date, '%Y-%m-%d')
+
+    if os.path.exists(args.state):
+        engine = OceanFeatureEngine.load(args.state)
+        if engine.last_date is not None and np.datetime64(day, 'D') <= engine.last_date:
+            print(f"✅ {args.date} already processed (state is at {engine.last_date}); nothing to do")
+            sys.exit(0)
+    else:
+        start = time.perf_counter()
+        history = loader.load_gridded_data(day - timedelta(days=args.history_days), day - timedelta(days=1), aoi)
+        engine = OceanFeatureEngine.for_grid(history).fit_climatology(history)
+        engine.transform(history)
+        print(f"📚 Backfilled {args.history_days} days on a {history.shape[1]}x{history.shape[2]} grid "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    grid = loader.load_gridded_data(day, day, aoi)
+    features = engine.update(day, {name: grid[name][0] for name in engine.variables})
+    engine.save(args.state)
+    print(f"✅ {args.date} refreshed in {time.perf_counter() - start:.3f}s → {args.state}")
+    for feature, field in features.items():
+        if np.isnan(field).all():
+            print(f"   {feature:<24} n/a (climatology has no data for this month)")
+        else:
+            print(f"   {feature:<24} mean {np.nanmean(field):9.4f}  max {np.nanmax(field):9.4f}")
@@ -0,0 +1,227 @@
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from data_processing.satellite_cache import SatelliteCache
+
+DEFAULT_URL_TEMPLATE = "{base_url}/{variable}/{resolution:g}/{day}/{row}_{col}.npy"
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError)
+
+
+class FetchError(Exception):
+    """A non-retryable response for a tile, such as 404"""
+
+
+class RemoteTileFetcher:
+    """Concurrent downloader of daily satellite tiles into a SatelliteCache
+
+    Tiles are fetched on a bounded thread pool that lives as long as the
+    fetcher, and each worker thread keeps its own keep-alive
+    ``requests.Session``, so repeated fetch() calls reuse at most
+    max_workers connections until close(). Downloads stream into a
+    ``.part`` file next to the cache entry, resume with an HTTP Range request
+    after a dropped connection and are retried with exponential backoff on
+    transient errors. Finished files are moved into the cache as-is.
+    """
+
+    def __init__(self, base_url: str, cache: SatelliteCache, max_workers: int = 8,
+                 retries: int = 4, backoff_seconds: float = 0.25, timeout_seconds: float = 30.0,
+                 url_template: str = DEFAULT_URL_TEMPLATE, chunk_bytes: int = 16 * 1024):
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.url_template = url_template
+        self.chunk_bytes = chunk_bytes
+        self._local = threading.local()
+        self._pool = None
+        self._sessions = []
+        self._lock = threading.Lock()
+        self.counters = {'fetched': 0, 'skipped': 0, 'failed': 0, 'bytes': 0,
+                         'resumed': 0, 'retries': 0}
+
+    def tile_url(self, variable: str, date, resolution: float, tile: tuple) -> str:
+        day = str(np.datetime64(date, 'D')).replace('-', '')
+        return self.url_template.format(base_url=self.base_url, variable=variable,
+                                        resolution=resolution, day=day,
+                                        row=tile[0], col=tile[1])
+
+    def _session(self) -> requests.Session:
+        """Per-thread session so each worker reuses its own keep-alive connection"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='tile-fetch')
+            return self._pool
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self.counters[name] += value
+
+    def fetch(self, variables, dates, resolution: float, tiles) -> dict:
+        """Download every (variable, date, tile) not already cached; returns a summary"""
+        started = time.perf_counter()
+        jobs = []
+        skipped = 0
+        for variable, date, tile in itertools.product(variables, dates, tiles):
+            if self.cache.contains(variable, date, resolution, tile):
+                skipped += 1
+            else:
+                jobs.append((variable, date, resolution, tuple(tile)))
+        self._count(skipped=skipped)
+
+        failed = []
+        downloaded = 0
+        if jobs:
+            for job, result in zip(jobs, self._get_pool().map(self._fetch_tile, jobs)):
+                if isinstance(result, Exception):
+                    failed.append((job, str(result)))
+                else:
+                    downloaded += result
+
+        return {
+            'requested': len(jobs) + skipped,
+            'fetched': len(jobs) - len(failed),
+            'skipped': skipped,
+            'failed': failed,
+            'bytes': downloaded,
+            'seconds': time.perf_counter() - started
+        }
+
+    def _fetch_tile(self, job):
+        """Download one tile with retries; returns bytes received or the final error"""
+        variable, date, resolution, tile = job
+        url = self.tile_url(variable, date, resolution, tile)
+        part_path = self.cache.tile_path(variable, date, resolution, tile) + '.part'
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+
+        received = 0
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count(retries=1)
+                delay = self.backoff_seconds * 2 ** (attempt - 1)
+                time.sleep(delay * random.uniform(0.5, 1.5))
+            try:
+                received += self._download(url, part_path)
+                self._validate(part_path)
+                self.cache.put_file(variable, date, resolution, tile, part_path)
+                self._count(fetched=1, bytes=received)
+                return received
+            except FetchError as e:
+                error = e
+                break
+            except TRANSIENT_ERRORS as e:
+                error = e
+            except ValueError as e:
+                # Corrupt body: start over rather than resuming onto it
+                error = e
+                self._discard(part_path)
+
+        self._count(failed=1, bytes=received)
+        return error
+
+    def _download(self, url: str, part_path: str) -> int:
+        """Stream url into part_path, resuming from its current size"""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        with self._session().get(url, headers=headers, stream=True,
+                                 timeout=self.timeout_seconds) as response:
+            if response.status_code == 416:
+                # Our partial file is no prefix of the remote one any more
+                self._discard(part_path)
+                raise requests.ConnectionError(f"range not satisfiable for {url}")
+            if response.status_code in RETRY_STATUS:
+                raise requests.ConnectionError(f"HTTP {response.status_code} for {url}")
+            if response.status_code not in (200, 206):
+                raise FetchError(f"HTTP {response.status_code} for {url}")
+
+            resumed = response.status_code == 206
+            if offset and resumed:
+                self._count(resumed=1)
+            expected = response.headers.get('Content-Length')
+            received = 0
+            with open(part_path, 'ab' if resumed else 'wb') as file:
+                for block in response.iter_content(self.chunk_bytes):
+                    file.write(block)
+                    received += len(block)
+            if expected is not None and received < int(expected):
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"connection closed after {received} of {expected} bytes for {url}")
+            return received
+
+    def _validate(self, part_path: str):
+        """Reject anything that is not a full tile_size x tile_size array"""
+        array = np.load(part_path, mmap_mode='r')
+        size = self.cache.tile_size
+        if array.shape != (size, size):
+            raise ValueError(f"unexpected tile shape {array.shape}")
+
+    @staticmethod
+    def _discard(part_path: str):
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+            sessions, self._sessions = self._sessions, []
+        if pool is not None:
+            pool.shutdown(wait=True)
+        for session in sessions:
+            session.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from datetime import datetime
+
+    sys.path.insert(0, os.path.join(current_dir, '..', '..', 'benchmarks'))
+    from fake_satellite_server import FakeSatelliteServer
+
+    with FakeSatelliteServer(latency_seconds=0.01, failure_rate=0.1) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        cache = SatelliteCache(cache_dir)
+        fetcher = RemoteTileFetcher(server.url, cache, max_workers=8, backoff_seconds=0.01)
+        dates = np.arange(np.datetime64(datetime(2024, 1, 1), 'D'),
+                          np.datetime64(datetime(2024, 1, 8), 'D'))
+        summary = fetcher.fetch(('sst', 'chlorophyll'), dates, 0.25, [(0, 2), (0, 3)])
+        print(f"Fetched {summary['fetched']} tiles ({summary['bytes'] / 1e6:.1f} MB) "
+              f"in {summary['seconds']:.2f}s, {len(summary['failed'])} failed")
+        print(f"Fetcher: {fetcher.stats()}")
+        print(f"Server: {server.stats()}")
+        fetcher.close()
@@ -0,0 +1,123 @@
+import numpy as np
+import os
+import threading
+from collections import OrderedDict
+
+
+class SatelliteCache:
+    """On-disk tile cache for gridded satellite variables
+
+    Each chunk holds one variable for one day over one spatial tile of
+    ``tile_size`` x ``tile_size`` global grid cells, stored as a raw ``.npy``
+    file so reads are zero-copy memory maps. Total size is capped with
+    least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 * 1024 * 1024,
+                 tile_size: int = 128):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.tile_size = tile_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self):
+        """Rebuild the LRU index from disk, oldest files first"""
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.npy'):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    found.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._bytes += size
+        self._evict()
+
+    def tile_path(self, variable: str, date, resolution: float, tile: tuple) -> str:
+        day = str(np.datetime64(date, 'D')).replace('-', '')
+        return os.path.join(self.cache_dir, variable, f"{resolution:g}", day,
+                            f"{tile[0]}_{tile[1]}.npy")
+
+    def get(self, variable: str, date, resolution: float, tile: tuple):
+        """Return the cached tile as a read-only memory map, or None on a miss"""
+        path = self.tile_path(variable, date, resolution, tile)
+        with self._lock:
+            if path not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            # Evicted by another process or truncated: treat as a miss
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+                self._forget(path)
+            return None
+
+    def put(self, variable: str, date, resolution: float, tile: tuple, array: np.ndarray):
+        """Store one tile atomically and evict old tiles if over the size cap"""
+        path = self.tile_path(variable, date, resolution, tile)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, path)
+        self._register(path)
+
+    def contains(self, variable: str, date, resolution: float, tile: tuple) -> bool:
+        """Whether the tile is cached, without counting a hit or miss"""
+        with self._lock:
+            return self.tile_path(variable, date, resolution, tile) in self._entries
+
+    def put_file(self, variable: str, date, resolution: float, tile: tuple, source_path: str):
+        """Move an already-written .npy file (e.g. a finished download) into the cache"""
+        path = self.tile_path(variable, date, resolution, tile)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source_path, path)
+        self._register(path)
+
+    def _register(self, path: str):
+        size = os.path.getsize(path)
+        with self._lock:
+            self._forget(path)
+            self._entries[path] = size
+            self._bytes += size
+            self._evict()
+
+    def _forget(self, path: str):
+        size = self._entries.pop(path, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'tiles': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
@@ -1,32 +1,265 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+import logging
 import os
+import sys
+import warnings
+
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from data_processing.satellite_cache import SatelliteCache
+from data_processing.schema import apply_schema, constant_category
+from utils.metrics import metrics, timed
+
+logger = logging.getLogger(__name__)
+
+MISSING_TILES = metrics.counter('fisheries_satellite_tiles_missing_total',
+                                'Remote (variable, day, tile)s that failed to download and load as NaN',
+                                labels=('variable',))
+
+# Synthetic generator constants: one draw per day keeps the familiar
+# 28-30°C / 0.5-1.0 mg/m³ daily ranges, the grid adds a smooth spatial
+# pattern plus separable lat/lon noise on top of it.
+_SALT = {'sst': 0x5F3759DF, 'chlorophyll': 0x2545F491}
+
+
+def _hash_uniform(*keys) -> np.ndarray:
+    """Deterministic uniform [0, 1) noise from broadcastable integer keys"""
+    h = np.uint32(0x9E3779B9)
+    for key, prime in zip(keys, (73856093, 19349663, 83492791)):
+        h = h ^ (np.asarray(key, dtype=np.int64).astype(np.uint32) * np.uint32(prime))
+    h = np.asarray(h, dtype=np.uint32)
+    h = h ^ (h >> np.uint32(16))
+    h = h * np.uint32(0x7FEB352D)
+    h = h ^ (h >> np.uint32(15))
+    h = h * np.uint32(0x846CA68B)
+    h = h ^ (h >> np.uint32(16))
+    return h.astype(np.float32) / np.float32(2 ** 32)
+
+
+def grid_axis(lo: float, hi: float, resolution: float, origin: float):
+    """Global cell indices and cell-centre coordinates covering [lo, hi)"""
+    first = int(np.floor((lo - origin) / resolution + 1e-9))
+    last = int(np.ceil((hi - origin) / resolution - 1e-9))
+    index = np.arange(first, max(last, first + 1), dtype=np.int64)
+    return index, origin + (index + 0.5) * resolution
+
+
+class OceanGrid:
+    """Gridded ocean conditions as time x lat x lon cubes, one per variable
+
+    ``missing_tiles`` counts remote (variable, day, tile)s that could not
+    be downloaded; their cells are NaN and the grid is ``degraded``.
+    """
+
+    def __init__(self, dates: np.ndarray, lats: np.ndarray, lons: np.ndarray,
+                 variables: dict, resolution: float,
+                 location: str = 'indonesia_waters', missing_tiles: int = 0):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.lats = lats
+        self.lons = lons
+        self.variables = variables
+        self.resolution = resolution
+        self.location = location
+        self.missing_tiles = missing_tiles
+
+    @property
+    def degraded(self) -> bool:
+        return self.missing_tiles > 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.variables[name]
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.dates), len(self.lats), len(self.lons))
+
+    def to_daily_frame(self) -> pd.DataFrame:
+        """Area-averaged daily view: one row per date, as load_historical_data returns"""
+        frame = pd.DataFrame({'date': pd.to_datetime(self.dates)})
+        with warnings.catch_warnings():
+            # Days whose tiles all failed to download average to NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for name, cube in self.variables.items():
+                frame[name] = np.nanmean(cube, axis=(1, 2), dtype=np.float64)
+        frame['location'] = constant_category(self.location, len(frame))
+        frame.attrs['missing_tiles'] = self.missing_tiles
+        return apply_schema(frame)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long per-cell view: one row per (date, lat, lon)"""
+        n_days, n_lat, n_lon = self.shape
+        frame = pd.DataFrame({
+            'date': pd.to_datetime(np.repeat(self.dates, n_lat * n_lon)),
+            'lat': np.tile(np.repeat(self.lats.astype(np.float32), n_lon), n_days),
+            'lon': np.tile(self.lons.astype(np.float32), n_days * n_lat),
+        })
+        for name, cube in self.variables.items():
+            frame[name] = cube.reshape(-1)
+        frame['location'] = constant_category(self.location, len(frame))
+        frame.attrs['missing_tiles'] = self.missing_tiles
+        return apply_schema(frame)
+
+    def to_xarray(self):
+        """Convert to an xarray.Dataset (requires xarray)"""
+        import xarray as xr
+        return xr.Dataset(
+            {name: (('time', 'lat', 'lon'), cube) for name, cube in self.variables.items()},
+            coords={'time': self.dates.astype('datetime64[ns]'),
+                    'lat': self.lats, 'lon': self.lons},
+            attrs={'resolution': self.resolution, 'location': self.location}
+        )
+
 
 class SatelliteDataLoader:
-    def __init__(self, data_dir: str = "data/raw/satellite"):
+    def __init__(self, data_dir: str = "data/raw/satellite", resolution: float = 0.25,
+                 cache_size_mb: int = 1024, use_cache: bool = None,
+                 remote_url: str = None, fetch_workers: int = 8):
         self.data_dir = data_dir
-        os.makedirs(data_dir, exist_ok=True)
-    
-    def load_historical_data(self, start_date: datetime, end_date: datetime, 
+        self.resolution = resolution
+        # Synthetic tiles are ~15x cheaper to regenerate than to read back one
+        # (tile, day) file at a time, so by default only downloads are cached
+        if use_cache is None:
+            use_cache = remote_url is not None
+        self.cache = SatelliteCache(data_dir, max_bytes=cache_size_mb * 1024 * 1024) \
+            if use_cache else None
+        self.fetcher = None
+        if remote_url and self.cache is not None:
+            from data_processing.remote_fetcher import RemoteTileFetcher
+            self.fetcher = RemoteTileFetcher(remote_url, self.cache, max_workers=fetch_workers)
+
+    @timed('loader.historical')
+    def load_historical_data(self, start_date: datetime, end_date: datetime,
                            area_of_interest: dict) -> pd.DataFrame:
-        """Load or generate historical ocean data"""
-        current_date = start_date
-        all_data = []
-        
-        while current_date <= end_date:
-            # Generate synthetic data for each day
-            all_data.append({
-                'date': current_date,
-                'sst': 28 + 2 * np.random.random(),  # Random SST around 28°C
-                'chlorophyll': 0.5 + 0.5 * np.random.random(),  # Random chlorophyll
-                'location': 'indonesia_waters'
-            })
-            
-            current_date += timedelta(days=1)
-        
-        return pd.DataFrame(all_data)
-    
+        """Load or generate historical ocean data (daily AOI averages)"""
+        return self.load_gridded_data(start_date, end_date, area_of_interest).to_daily_frame()
+
+    @timed('loader.gridded')
+    def load_gridded_data(self, start_date: datetime, end_date: datetime,
+                          area_of_interest: dict, resolution: float = None) -> OceanGrid:
+        """Load or generate a time x lat x lon grid of SST and chlorophyll for the AOI"""
+        resolution = resolution or self.resolution
+        dates = np.arange(np.datetime64(start_date, 'D'),
+                          np.datetime64(end_date, 'D') + 1, dtype='datetime64[D]')
+        lat_index, lats = grid_axis(area_of_interest['lat_min'], area_of_interest['lat_max'],
+                                    resolution, -90.0)
+        lon_index, lons = grid_axis(area_of_interest['lon_min'], area_of_interest['lon_max'],
+                                    resolution, -180.0)
+
+        missing = 0
+        if self.cache is None:
+            variables = {
+                name: self._synthesize(name, dates, lat_index, lon_index, resolution)
+                for name in ('sst', 'chlorophyll')
+            }
+        else:
+            if self.fetcher is not None:
+                self._fetch_remote(dates, lat_index, lon_index, resolution)
+            variables = {}
+            for name in ('sst', 'chlorophyll'):
+                variables[name], unavailable = self._load_tiles(name, dates, lat_index, lon_index,
+                                                                resolution)
+                missing += unavailable
+        return OceanGrid(dates, lats, lons, variables, resolution, missing_tiles=missing)
+
+    def _fetch_remote(self, dates: np.ndarray, lat_index: np.ndarray,
+                      lon_index: np.ndarray, resolution: float):
+        """Download every missing tile of the AOI concurrently before assembling it"""
+        size = self.cache.tile_size
+        tiles = [(row, col)
+                 for row in range(lat_index[0] // size, lat_index[-1] // size + 1)
+                 for col in range(lon_index[0] // size, lon_index[-1] // size + 1)]
+        summary = self.fetcher.fetch(('sst', 'chlorophyll'), dates, resolution, tiles)
+        if summary['failed']:
+            logger.warning("%d of %d remote tiles failed and load as NaN (first error: %s)",
+                           len(summary['failed']), summary['requested'], summary['failed'][0][1])
+        return summary
+
+    def _load_tiles(self, variable: str, dates: np.ndarray, lat_index: np.ndarray,
+                    lon_index: np.ndarray, resolution: float) -> tuple:
+        """Assemble the AOI cube from cached tiles; returns it and the number of missing tiles
+
+        Without a remote source misses are synthesized in one batch per
+        tile and cached like any tile. With one, a miss means the download
+        failed: those cells are NaN, never made-up data, and nothing is
+        cached, so the next load retries the download.
+        """
+        size = self.cache.tile_size
+        cube = np.empty((len(dates), len(lat_index), len(lon_index)), dtype=np.float32)
+        unavailable = 0
+
+        for tile_row in range(lat_index[0] // size, lat_index[-1] // size + 1):
+            r0 = max(lat_index[0], tile_row * size)
+            r1 = min(lat_index[-1] + 1, (tile_row + 1) * size)
+            out_rows = slice(r0 - lat_index[0], r1 - lat_index[0])
+            tile_rows = slice(r0 - tile_row * size, r1 - tile_row * size)
+
+            for tile_col in range(lon_index[0] // size, lon_index[-1] // size + 1):
+                c0 = max(lon_index[0], tile_col * size)
+                c1 = min(lon_index[-1] + 1, (tile_col + 1) * size)
+                out_cols = slice(c0 - lon_index[0], c1 - lon_index[0])
+                tile_cols = slice(c0 - tile_col * size, c1 - tile_col * size)
+                tile = (tile_row, tile_col)
+
+                missing = []
+                for t, date in enumerate(dates):
+                    chunk = self.cache.get(variable, date, resolution, tile)
+                    if chunk is None:
+                        missing.append(t)
+                    else:
+                        cube[t, out_rows, out_cols] = chunk[tile_rows, tile_cols]
+
+                if missing and self.fetcher is not None:
+                    cube[missing, out_rows, out_cols] = np.nan
+                    unavailable += len(missing)
+                elif missing:
+                    fresh = self._synthesize(
+                        variable, dates[missing],
+                        np.arange(tile_row * size, (tile_row + 1) * size),
+                        np.arange(tile_col * size, (tile_col + 1) * size),
+                        resolution
+                    )
+                    for t, chunk in zip(missing, fresh):
+                        self.cache.put(variable, dates[t], resolution, tile, chunk)
+                        cube[t, out_rows, out_cols] = chunk[tile_rows, tile_cols]
+
+        if unavailable:
+            MISSING_TILES.inc(unavailable, variable=variable)
+        return cube, unavailable
+
+    def _synthesize(self, variable: str, dates: np.ndarray, lat_index: np.ndarray,
+                    lon_index: np.ndarray, resolution: float) -> np.ndarray:
+        """Generate a synthetic cube in one vectorized step
+
+        Values depend only on (date, global cell, resolution), so overlapping
+        requests and cached tiles agree on the cells they share.
+        """
+        lats = -90.0 + (lat_index + 0.5) * resolution
+        lons = -180.0 + (lon_index + 0.5) * resolution
+        day = dates.astype(np.int64)
+        salt = _SALT[variable] + int(round(1.0 / resolution))
+        daily = _hash_uniform(day, salt)
+        row_noise = _hash_uniform(day[:, None], lat_index[None, :], salt + 1) - np.float32(0.5)
+        col_noise = _hash_uniform(day[:, None], lon_index[None, :], salt + 2) - np.float32(0.5)
+        spatial = (np.sin(np.deg2rad(lons) * 4)[None, :] *
+                   np.cos(np.deg2rad(lats) * 6)[:, None]).astype(np.float32)
+
+        if variable == 'sst':
+            base, scale, amplitude, noise = 28.0, 2.0, 0.5, 0.3
+        else:
+            base, scale, amplitude, noise = 0.5, 0.5, 0.1, 0.05
+
+        cube = np.empty((len(day), len(lats), len(lons)), dtype=np.float32)
+        np.add((base + scale * daily)[:, None, None], amplitude * spatial[None, :, :], out=cube)
+        cube += (noise * row_noise)[:, :, None]
+        cube += (noise * col_noise)[:, None, :]
+        if variable == 'chlorophyll':
+            np.maximum(cube, 0.01, out=cube)
+        return cube
+
     def fetch_sample_data(self):
         """Simple sample data for testing"""
         return pd.DataFrame({
@@ -39,13 +272,19 @@ if __name__ == "__main__":
     loader = SatelliteDataLoader()
     print("Sample Data:")
     print(loader.fetch_sample_data())
-    
+
     # Test historical data
     aoi = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
     historical_data = loader.load_historical_data(
-        datetime(2024, 1, 1), 
-        datetime(2024, 1, 5), 
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 5),
         aoi
     )
     print("\nHistorical Data:")
     print(historical_data)
+
+    # Gridded cube for a full year at 0.05°
+    grid = loader.load_gridded_data(datetime(2024, 1, 1), datetime(2024, 12, 31), aoi, 0.05)
+    print(f"\nGridded Data: {grid.shape} cells (time x lat x lon)")
+    if loader.cache is not None:
+        print(f"Cache: {loader.cache.stats()}")
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# Compact dtypes for every column the ocean-data pipeline produces.
+# float32 keeps ~7 significant digits: far finer than satellite SST
+# (±0.1°C) or chlorophyll retrievals, and sklearn trees split on float32
+# anyway. Calendar fields fit in int8/int16, repeated labels are categorical.
+RECOMMENDATION_DTYPE = pd.CategoricalDtype(['LOW', 'MEDIUM', 'HIGH', 'HEURISTIC'])
+
+# Decimal places float32 columns are published with (28.7, not
+# 28.700000762939453); recommendation labels are cut from values rounded
+# the same way, so a probability shown as 0.7 is never labelled HIGH
+FLOAT32_DECIMALS = 5
+
+COLUMN_DTYPES = {
+    'lat': np.float32,
+    'lon': np.float32,
+    'sst': np.float32,
+    'chlorophyll': np.float32,
+    'sst_chlorophyll_interaction': np.float32,
+    'day_of_year': np.int16,
+    'month': np.int8,
+    'season': np.int8,
+    'location': 'category',
+    'species': 'category',
+    'probability': np.float32,
+    'recommendation': RECOMMENDATION_DTYPE,
+}
+
+# Per-species columns such as tuna_probability / tuna_recommendation
+SUFFIX_DTYPES = {
+    '_probability': np.float32,
+    '_recommendation': RECOMMENDATION_DTYPE,
+}
+
+
+def dtype_for(column: str):
+    """Schema dtype for a column name, None for columns the schema leaves alone"""
+    if column in COLUMN_DTYPES:
+        return COLUMN_DTYPES[column]
+    for suffix, dtype in SUFFIX_DTYPES.items():
+        if column.endswith(suffix):
+            return dtype
+    return None
+
+
+def apply_schema(frame: pd.DataFrame, columns=None) -> pd.DataFrame:
+    """Cast schema columns of frame in place (only those not already compact) and return it
+
+    Integer fields with missing values are left as they are rather than
+    failing the cast. Pass ``columns`` to limit the work to columns a
+    stage just added.
+    """
+    for column in frame.columns if columns is None else columns:
+        dtype = dtype_for(column)
+        if dtype is None or frame[column].dtype == dtype:
+            continue
+        if pd.api.types.is_integer_dtype(dtype) and frame[column].isna().any():
+            continue
+        frame[column] = frame[column].astype(dtype)
+    return frame
+
+
+def constant_category(value: str, length: int) -> pd.Categorical:
+    """A column repeating one label, built from int8 codes without materializing strings"""
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
+def frame_bytes(frame: pd.DataFrame) -> int:
+    """Deep memory footprint of a frame, string contents included"""
+    return int(frame.memory_usage(deep=True, index=True).sum())
+
+
+if __name__ == "__main__":
+    frame = pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=100_000, freq='min'),
+        'sst': np.random.default_rng(0).normal(28.5, 0.5, 100_000),
+        'chlorophyll': np.random.default_rng(1).gamma(2.0, 0.3, 100_000),
+        'location': 'indonesia_waters',
+    })
+    frame['month'] = frame['date'].dt.month
+    frame['season'] = (frame['month'] % 12 + 3) // 3
+    before = frame_bytes(frame)
+    apply_schema(frame)
+    print(frame.dtypes)
+    print(f"📊 {before / 1e6:.1f} MB → {frame_bytes(frame) / 1e6:.1f} MB")
@@ -6,7 +6,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from regulatory_engine.compliance_checker import FisheriesCompliance
 from data_processing.satellite_loader import SatelliteDataLoader
-from data_processing.data_cleaner import DataCleaner
+from data_processing.data_cleaner import DataCleaner, CLEANER_STATS_NAME
 from ai_models.fish_predictor import FishLocationPredictor
 from datetime import datetime
 
@@ -37,6 +37,7 @@ def main():
         aoi
     )
     
+    cleaner.fit(raw_data)
     cleaned_data = cleaner.clean_ocean_data(raw_data)
     print(f"🌊 Ocean Data: {len(cleaned_data)} days collected")
     
@@ -48,6 +49,7 @@ def main():
     
     print(f"🤖 Training AI Model with {len(training_data)} samples...")
     predictor.train_model(training_data, 'tuna')
+    cleaner.save(os.path.join(predictor.model_dir, CLEANER_STATS_NAME))
     
     # Get predictions
     predictions = predictor.predict_fish_locations(cleaned_data, 'tuna')
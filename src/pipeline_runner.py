@@ -0,0 +1,265 @@
+import sys
+import math
+import os
+import queue
+import resource
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+# Fix Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_processing.satellite_loader import SatelliteDataLoader
+from data_processing.data_cleaner import DataCleaner, CLEANER_STATS_NAME
+from ai_models.fish_predictor import FishLocationPredictor
+
+STAGES = ('load', 'clean', 'predict')
+_STOP = object()
+# How often blocked queue operations check whether the run was stopped
+_POLL_SECONDS = 0.1
+
+
+class _Failure:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up once stop is set; returns whether the item was queued"""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(source: queue.Queue, stop: threading.Event):
+    """Blocking get that returns _STOP once stop is set"""
+    while not stop.is_set():
+        try:
+            return source.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            pass
+    return _STOP
+
+
+# Per-process components for the process executor, built on first use
+_worker_components = {}
+
+
+def _run_in_worker(stage: str, payload, settings: dict):
+    if not _worker_components:
+        _worker_components['runner'] = PipelineRunner(**settings)
+    return _worker_components['runner'].run_stage(stage, payload)
+
+
+class PipelineRunner:
+    """Streaming loader → cleaner → predictor pipeline over time/space chunks
+
+    Each stage runs in its own thread connected by bounded queues, and each
+    stage keeps at most ``workers[stage]`` chunks in flight (on a thread or
+    process pool), so no more than a handful of chunks are alive at once and
+    peak memory is independent of the date range. Results are appended to
+    the output CSV as each chunk finishes. A failing stage stops the whole
+    run: every stage thread and the feeder exit and are joined before the
+    error is raised.
+    """
+
+    def __init__(self, species: tuple = ('tuna',), data_dir: str = "data/raw/satellite",
+                 model_dir: str = "models/trained_models", resolution: float = 0.25,
+                 chunk_days: int = 31, tile_degrees: float = None, queue_size: int = 2,
+                 workers: dict = None, executor: str = 'thread'):
+        if tile_degrees:
+            cells = tile_degrees / resolution
+            if cells < 1 - 1e-9 or abs(cells - round(cells)) > 1e-6:
+                raise ValueError(f"tile_degrees ({tile_degrees:g}) must be a whole multiple of "
+                                 f"resolution ({resolution:g}), or tiles would share grid cells")
+        self.species = list(species)
+        self.data_dir = data_dir
+        self.model_dir = model_dir
+        self.resolution = resolution
+        self.chunk_days = chunk_days
+        self.tile_degrees = tile_degrees
+        self.queue_size = queue_size
+        self.workers = {stage: 1 for stage in STAGES}
+        self.workers.update(workers or {})
+        self.executor = executor
+
+        self.loader = SatelliteDataLoader(data_dir, resolution=resolution)
+        self.cleaner = DataCleaner()
+        self.cleaner.load(os.path.join(model_dir, CLEANER_STATS_NAME))
+        self.predictor = FishLocationPredictor(model_dir)
+
+    def _settings(self) -> dict:
+        return {'species': tuple(self.species), 'data_dir': self.data_dir,
+                'model_dir': self.model_dir, 'resolution': self.resolution,
+                'chunk_days': self.chunk_days, 'tile_degrees': self.tile_degrees}
+
+    def chunks(self, start_date: datetime, end_date: datetime, area_of_interest: dict):
+        """Yield (start, end, aoi) work units: date windows x spatial tiles"""
+        while start_date <= end_date:
+            chunk_end = min(start_date + timedelta(days=self.chunk_days - 1), end_date)
+            for tile in self._tiles(area_of_interest):
+                yield start_date, chunk_end, tile
+            start_date = chunk_end + timedelta(days=1)
+
+    def _tiles(self, aoi: dict):
+        if not self.tile_degrees:
+            yield aoi
+            return
+        # -90 / -180 are the loader's global grid origins
+        for lat_min, lat_max in self._tile_edges(aoi['lat_min'], aoi['lat_max'], -90.0):
+            for lon_min, lon_max in self._tile_edges(aoi['lon_min'], aoi['lon_max'], -180.0):
+                yield {'lat_min': lat_min, 'lat_max': lat_max, 'lon_min': lon_min, 'lon_max': lon_max}
+
+    def _tile_edges(self, lo: float, hi: float, origin: float):
+        """Split [lo, hi) every tile_degrees at grid-cell edges, so no cell lands in two tiles"""
+        cells = int(round(self.tile_degrees / self.resolution))
+        index = math.floor((lo - origin) / self.resolution + 1e-9) + cells
+        edge = lo
+        while edge < hi:
+            next_edge = min(origin + index * self.resolution, hi)
+            yield edge, next_edge
+            edge = next_edge
+            index += cells
+
+    def run_stage(self, stage: str, payload):
+        if stage == 'load':
+            start_date, end_date, aoi = payload
+            return self.loader.load_gridded_data(start_date, end_date, aoi).to_frame()
+        if stage == 'clean':
+            return self.cleaner.clean_ocean_data(payload)
+        predictions = self.predictor.predict_species_batch(payload, self.species)
+        columns = ['date', 'lat', 'lon', 'sst', 'chlorophyll']
+        for species in self.species:
+            columns += [f'{species}_probability', f'{species}_recommendation']
+        return predictions[columns]
+
+    def _stage_worker(self, stage: str, inbox: queue.Queue, outbox: queue.Queue, pool,
+                      stop: threading.Event):
+        """Apply one stage in order with at most workers[stage] chunks in flight"""
+        pending = deque()
+        try:
+            while True:
+                item = _get(inbox, stop)
+                if item is _STOP or isinstance(item, _Failure):
+                    break
+                if pool is None:
+                    if not _put(outbox, self.run_stage(stage, item), stop):
+                        return
+                    continue
+                if self.executor == 'process':
+                    pending.append(pool.submit(_run_in_worker, stage, item, self._settings()))
+                else:
+                    pending.append(pool.submit(self.run_stage, stage, item))
+                if len(pending) >= self.workers[stage]:
+                    if not _put(outbox, pending.popleft().result(), stop):
+                        return
+            while pending:
+                if not _put(outbox, pending.popleft().result(), stop):
+                    return
+            _put(outbox, item, stop)
+        except Exception as e:
+            _put(outbox, _Failure(e), stop)
+
+    def run(self, start_date: datetime, end_date: datetime, area_of_interest: dict,
+            output_path: str) -> dict:
+        """Stream the whole range through the pipeline, appending results to output_path"""
+        started = time.perf_counter()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(STAGES) + 1)]
+        pools = {}
+        for stage in STAGES:
+            if self.workers[stage] > 1:
+                pool_class = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+                pools[stage] = pool_class(max_workers=self.workers[stage])
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=self._stage_worker, daemon=True,
+                             args=(stage, queues[i], queues[i + 1], pools.get(stage), stop))
+            for i, stage in enumerate(STAGES)
+        ]
+
+        def feed():
+            for chunk in self.chunks(start_date, end_date, area_of_interest):
+                if not _put(queues[0], chunk, stop):
+                    return
+            _put(queues[0], _STOP, stop)
+        threads.append(threading.Thread(target=feed, daemon=True))
+        for thread in threads:
+            thread.start()
+
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        rows = chunks = 0
+        try:
+            with open(tmp_path, 'w') as output:
+                while True:
+                    result = queues[-1].get()
+                    if result is _STOP:
+                        break
+                    if isinstance(result, _Failure):
+                        raise result.error
+                    result.to_csv(output, header=(chunks == 0), index=False, date_format='%Y-%m-%d')
+                    rows += len(result)
+                    chunks += 1
+            os.replace(tmp_path, output_path)
+        finally:
+            # On failure upstream stages may be blocked on full queues: release
+            # them, cancel queued work and wait for every thread to exit
+            stop.set()
+            for pool in pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            for thread in threads:
+                thread.join()
+            for stage_queue in queues:
+                while not stage_queue.empty():
+                    stage_queue.get_nowait()
+            for pool in pools.values():
+                pool.shutdown()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return {
+            'chunks': chunks,
+            'rows': rows,
+            'seconds': time.perf_counter() - started,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'output': output_path
+        }
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Out-of-core backfill: load → clean → predict → CSV")
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--end', default='2024-12-31')
+    parser.add_argument('--species', nargs='+', default=['tuna'])
+    parser.add_argument('--resolution', type=float, default=0.25)
+    parser.add_argument('--chunk-days', type=int, default=31)
+    parser.add_argument('--tile-degrees', type=float, default=None)
+    parser.add_argument('--queue-size', type=int, default=2)
+    parser.add_argument('--workers', nargs='*', default=[],
+                        help='per-stage parallelism, e.g. predict=4 clean=2')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--output', default='data/processed/predictions.csv')
+    args = parser.parse_args()
+
+    workers = {name: int(count) for name, count in (item.split('=') for item in args.workers)}
+    runner = PipelineRunner(species=args.species, resolution=args.resolution,
+                            chunk_days=args.chunk_days, tile_degrees=args.tile_degrees,
+                            queue_size=args.queue_size, workers=workers, executor=args.executor)
+    aoi = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+
+    print(f"🚚 Backfill {args.start} → {args.end} for {', '.join(args.species)}")
+    summary = runner.run(datetime.strptime(args.start, '%Y-%m-%d'),
+                         datetime.strptime(args.end, '%Y-%m-%d'), aoi, args.output)
+    print(f"✅ {summary['rows']:,} rows in {summary['chunks']} chunks, {summary['seconds']:.1f}s, "
+          f"peak RSS {summary['peak_rss_mb']:.0f} MB → {summary['output']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,156 @@
 import yaml
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+import os
+import sys
 from datetime import datetime
 
+# Add parent directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+from regulatory_engine.spatial_index import ZoneIndex
+from utils.metrics import metrics, timed
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+BASE_SUSTAINABILITY_SCORE = 0.8
+
+# Rule evaluations by the engine, whoever asks; cached API answers never
+# reach it, so the dashboard counts compliance requests in its route instead
+COMPLIANCE_EVALUATIONS = metrics.counter('fisheries_compliance_evaluations_total',
+                                         'Trip declarations evaluated by the engine, by outcome',
+                                         labels=('result',))
+EVALUATION_SCORE_SUM = metrics.counter('fisheries_compliance_evaluation_score_sum',
+                                       'Sum of sustainability scores over all evaluations')
+
+def _count_checks(approved: int, rejected: int, score_sum: float):
+    if not metrics.enabled:
+        return
+    COMPLIANCE_EVALUATIONS.inc(approved, result='approved')
+    COMPLIANCE_EVALUATIONS.inc(rejected, result='rejected')
+    EVALUATION_SCORE_SUM.inc(score_sum)
+
+def closed_season_violation(species: str) -> str:
+    return f"Closed season for {species}"
+
+def prohibited_gear_violation(gear_type: str) -> str:
+    return "Prohibited gear type"
+
+def catch_limit_violation(species: str, proposed_catch: float, limit: float) -> str:
+    return f"Proposed catch {proposed_catch:g} kg exceeds {species} limit of {limit:g} kg"
+
+def no_take_violation(zone_name: str) -> str:
+    return f"Location inside no-take zone: {zone_name}"
+
 class FisheriesCompliance:
     def __init__(self, config_path: str = "config/regulatory_rules.yaml"):
         self.regulations = self.load_regulations(config_path)
-    
+        self.compile_rules()
+
     def load_regulations(self, config_path: str):
+        if not os.path.isabs(config_path) and not os.path.exists(config_path):
+            config_path = os.path.join(PROJECT_ROOT, config_path)
         try:
             with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
+                return yaml.safe_load(file) or {}
         except Exception as e:
             print(f"Error loading regulations: {e}")
             return {}
-    
-    def check_fishing_approval(self, species: str, location: list, 
+
+    def compile_rules(self):
+        """Compile the regulations into lookup tables shared by single and batch checks"""
+        self.rules_version = hashlib.sha1(
+            json.dumps(self.regulations, sort_keys=True, default=str).encode()
+        ).hexdigest()[:12]
+        seasons = self.regulations.get('fishing_seasons') or {}
+        # Bit m of a species mask is set when month m (1-12) is closed
+        self.closure_masks = {
+            species: sum(1 << int(month) for month in (rules or {}).get('closed_months') or [])
+            for species, rules in seasons.items()
+        }
+        gear = self.regulations.get('gear_restrictions') or {}
+        self.prohibited_gear = frozenset(gear.get('prohibited') or [])
+        self.catch_limits = {
+            species: float(limit)
+            for species, limit in (self.regulations.get('catch_limits') or {}).items()
+        }
+        self.zone_index = ZoneIndex(
+            (self.regulations.get('protected_areas') or []) + (self.regulations.get('zoning') or [])
+        )
+
+    @timed('compliance.check')
+    def check_fishing_approval(self, species: str, location: list,
                              date: datetime, gear_type: str, proposed_catch: float):
         violations = []
-        
-        # Simple check for demo
-        if species == "tuna" and date.month in [1, 2]:  # Jan-Feb closed
-            violations.append(f"Closed season for {species}")
-        
-        if gear_type == "dynamite":
-            violations.append("Prohibited gear type")
-            
+
+        if (self.closure_masks.get(species, 0) >> date.month) & 1:
+            violations.append(closed_season_violation(species))
+
+        if gear_type in self.prohibited_gear:
+            violations.append(prohibited_gear_violation(gear_type))
+
+        limit = self.catch_limits.get(species)
+        if limit is not None and proposed_catch > limit:
+            violations.append(catch_limit_violation(species, proposed_catch, limit))
+
+        if location is not None:
+            zone_id = self.zone_index.locate(location[0], location[1], 'no_take')
+            if zone_id >= 0:
+                violations.append(no_take_violation(self.zone_index.names[zone_id]))
+
+        _count_checks(int(not violations), int(bool(violations)), BASE_SUSTAINABILITY_SCORE)
         return {
             "approved": len(violations) == 0,
             "violations": violations,
-            "sustainability_score": 0.8
+            "sustainability_score": BASE_SUSTAINABILITY_SCORE
         }
 
+    @timed('compliance.batch')
+    def check_batch(self, trips: pd.DataFrame) -> pd.DataFrame:
+        """Check many trip declarations in one vectorized pass
+
+        Expects species, date, gear_type and proposed_catch columns, plus
+        optional lon/lat; returns approved, violations and sustainability_score
+        per row, matching check_fishing_approval exactly.
+        """
+        species = trips['species']
+        month = pd.to_datetime(trips['date']).dt.month.to_numpy(np.int64)
+        catch = trips['proposed_catch'].to_numpy(np.float64)
+
+        masks = species.map(self.closure_masks).fillna(0).to_numpy(np.int64)
+        closed = ((masks >> month) & 1).astype(bool)
+        prohibited = trips['gear_type'].isin(self.prohibited_gear).to_numpy()
+        limits = species.map(self.catch_limits).to_numpy(np.float64, na_value=np.nan)
+        over_limit = catch > limits
+        if 'lon' in trips.columns and 'lat' in trips.columns:
+            no_take = self.zone_index.locate_points(trips['lon'], trips['lat'], 'no_take')
+        else:
+            no_take = np.full(len(trips), -1)
+        flagged = closed | prohibited | over_limit | (no_take >= 0)
+
+        violations = [[] for _ in range(len(trips))]
+        species_values = species.to_numpy(object)
+        gear_values = trips['gear_type'].to_numpy(object)
+        for i in np.flatnonzero(flagged):
+            if closed[i]:
+                violations[i].append(closed_season_violation(species_values[i]))
+            if prohibited[i]:
+                violations[i].append(prohibited_gear_violation(gear_values[i]))
+            if over_limit[i]:
+                violations[i].append(catch_limit_violation(species_values[i], catch[i], limits[i]))
+            if no_take[i] >= 0:
+                violations[i].append(no_take_violation(self.zone_index.names[no_take[i]]))
+
+        rejected = int(flagged.sum())
+        _count_checks(len(trips) - rejected, rejected, BASE_SUSTAINABILITY_SCORE * len(trips))
+        return pd.DataFrame({
+            'approved': ~flagged,
+            'violations': violations,
+            'sustainability_score': BASE_SUSTAINABILITY_SCORE
+        }, index=trips.index)
+
 if __name__ == "__main__":
     compliance = FisheriesCompliance()
     result = compliance.check_fishing_approval(
@@ -40,3 +161,11 @@ if __name__ == "__main__":
         proposed_catch=3000
     )
     print(f"Result: {result}")
+
+    trips = pd.DataFrame({
+        'species': ['tuna', 'skipjack', 'anchovy'],
+        'date': ['2024-01-15', '2024-03-01', '2024-06-10'],
+        'gear_type': ['hand_line', 'poison', 'purse_seine'],
+        'proposed_catch': [3000, 2000, 8000]
+    })
+    print(compliance.check_batch(trips))
@@ -0,0 +1,123 @@
+import numpy as np
+import math
+
+_OFFSET = 1 << 20
+
+
+def _point_in_polygon(x: float, y: float, vertices: list) -> bool:
+    """Even-odd ray casting for one point (pure Python, no array overhead)"""
+    inside = False
+    xj, yj = vertices[-1]
+    for xi, yi in vertices:
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        xj, yj = xi, yi
+    return inside
+
+
+def _points_in_polygon(x: np.ndarray, y: np.ndarray, vertices: list) -> np.ndarray:
+    """Even-odd ray casting for many points, one vectorized pass per edge"""
+    inside = np.zeros(len(x), dtype=bool)
+    xj, yj = vertices[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for xi, yi in vertices:
+            inside ^= ((yi > y) != (yj > y)) & (x < (xj - xi) * (y - yi) / (yj - yi) + xi)
+            xj, yj = xi, yi
+    return inside
+
+
+class ZoneIndex:
+    """Uniform-grid spatial index over zone polygons
+
+    Each zone is registered in every grid cell its bounding box touches, so a
+    lookup only runs point-in-polygon tests against the few zones sharing the
+    point's cell. Zones are dicts with ``name``, ``type`` and ``geometry``
+    (a list of [lon, lat] vertices); when several zones contain a point the
+    one declared first wins.
+    """
+
+    def __init__(self, zones: list, cell_size: float = 0.5):
+        self.cell_size = cell_size
+        self.names = []
+        self.types = []
+        self.polygons = []
+        self._cells = {}
+
+        for zone in zones:
+            geometry = zone.get('geometry')
+            if not geometry:
+                continue
+            zone_id = len(self.polygons)
+            vertices = [(float(lon), float(lat)) for lon, lat in geometry]
+            self.names.append(zone['name'])
+            self.types.append(zone.get('type', 'unknown'))
+            self.polygons.append(vertices)
+
+            lons = [v[0] for v in vertices]
+            lats = [v[1] for v in vertices]
+            for ix in range(self._cell(min(lons)), self._cell(max(lons)) + 1):
+                for iy in range(self._cell(min(lats)), self._cell(max(lats)) + 1):
+                    self._cells.setdefault(self._key(ix, iy), []).append(zone_id)
+
+    def __len__(self) -> int:
+        return len(self.polygons)
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_size)
+
+    def _key(self, ix: int, iy: int) -> int:
+        return (ix + _OFFSET) * (2 * _OFFSET) + (iy + _OFFSET)
+
+    def locate(self, lon: float, lat: float, zone_type: str = None) -> int:
+        """Id of the first zone (optionally of zone_type) containing the point, or -1"""
+        if not (math.isfinite(lon) and math.isfinite(lat)):
+            return -1
+        candidates = self._cells.get(self._key(self._cell(lon), self._cell(lat)))
+        if candidates:
+            for zone_id in candidates:
+                if zone_type is not None and self.types[zone_id] != zone_type:
+                    continue
+                if _point_in_polygon(lon, lat, self.polygons[zone_id]):
+                    return zone_id
+        return -1
+
+    def query(self, lon: float, lat: float) -> list:
+        """Names of every zone containing the point"""
+        if not (math.isfinite(lon) and math.isfinite(lat)):
+            return []
+        candidates = self._cells.get(self._key(self._cell(lon), self._cell(lat)), [])
+        return [self.names[zone_id] for zone_id in candidates
+                if _point_in_polygon(lon, lat, self.polygons[zone_id])]
+
+    def locate_points(self, lons, lats, zone_type: str = None) -> np.ndarray:
+        """Bulk locate: first containing zone id per point, -1 where none (or not finite)"""
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        result = np.full(len(lons), -1, dtype=np.int64)
+        if not self._cells or len(lons) == 0:
+            return result
+
+        finite = np.flatnonzero(np.isfinite(lons) & np.isfinite(lats))
+        ix = np.floor(lons[finite] / self.cell_size).astype(np.int64)
+        iy = np.floor(lats[finite] / self.cell_size).astype(np.int64)
+        keys = (ix + _OFFSET) * (2 * _OFFSET) + (iy + _OFFSET)
+        by_key = np.argsort(keys, kind='stable')
+        order = finite[by_key]
+        unique_keys, starts = np.unique(keys[by_key], return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        for key, start, end in zip(unique_keys.tolist(), starts.tolist(), ends.tolist()):
+            candidates = self._cells.get(key)
+            if not candidates:
+                continue
+            points = order[start:end]
+            for zone_id in candidates:
+                if zone_type is not None and self.types[zone_id] != zone_type:
+                    continue
+                open_points = points[result[points] < 0]
+                if len(open_points) == 0:
+                    break
+                hit = _points_in_polygon(lons[open_points], lats[open_points],
+                                         self.polygons[zone_id])
+                result[open_points[hit]] = zone_id
+        return result
@@ -0,0 +1,315 @@
+import bisect
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from sub-millisecond cache hits to minute-long training
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_text(names: tuple, values: tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+             for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _value_text(value) -> str:
+    """Exact sample value: integers in full, floats with every significant digit"""
+    value = float(value)
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    if value.is_integer() and abs(value) < 2 ** 53:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name: str, help_text: str, labels: tuple):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, '') for name in self.labels)
+
+
+class Counter(_Metric):
+    """Monotonic total per label set"""
+    kind = 'counter'
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.values = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def clear(self):
+        with self._lock:
+            self.values.clear()
+
+    def total(self, **labels) -> float:
+        """Sum over every label set matching the given labels"""
+        with self._lock:
+            return sum(value for key, value in self.values.items()
+                       if all(key[self.labels.index(name)] == str(wanted)
+                              for name, wanted in labels.items()))
+
+    def samples(self):
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                yield self.name, _label_text(self.labels, key), value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set, Prometheus style"""
+    kind = 'histogram'
+
+    def __init__(self, *args, buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(buckets)
+        self.series = {}
+
+    def observe(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self.series.clear()
+
+    def summary(self, **labels) -> dict:
+        """count / sum / approximate p50 and p99 (bucket upper bounds) over matching series"""
+        counts = [0] * (len(self.buckets) + 1)
+        total, count = 0.0, 0
+        with self._lock:
+            for key, (bucket_counts, series_sum, series_count) in self.series.items():
+                if all(key[self.labels.index(name)] == str(wanted) for name, wanted in labels.items()):
+                    counts = [a + b for a, b in zip(counts, bucket_counts)]
+                    total += series_sum
+                    count += series_count
+
+        def quantile(q):
+            if not count:
+                return None
+            running = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                running += bucket_count
+                if running >= q * count:
+                    return bound
+        return {'count': count, 'sum': total, 'p50': quantile(0.5), 'p99': quantile(0.99)}
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(c), s, n)) for key, (c, s, n) in self.series.items())
+        for key, (counts, total, count) in items:
+            running = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                running += bucket_count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                yield f'{self.name}_bucket', _label_text(self.labels, key, f'le="{le}"'), running
+            yield f'{self.name}_sum', _label_text(self.labels, key), total
+            yield f'{self.name}_count', _label_text(self.labels, key), count
+
+
+class MetricsRegistry:
+    """Process-local counters, histograms and scrape-time gauges
+
+    Every recording call first checks ``enabled``, so with metrics switched
+    off (FISHERIES_METRICS=0) instrumentation costs one attribute lookup.
+    Gauges are pulled from collector callbacks when ``/metrics`` is
+    scraped, so existing ``stats()`` methods need no extra bookkeeping.
+    Values are per process: scrape each gunicorn worker, or sum them.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, labels: tuple, **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, help_text, labels, **options)
+            return metric
+
+    def counter(self, name: str, help_text: str = '', labels: tuple = ()) -> Counter:
+        return self._get(Counter, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str = '', labels: tuple = (),
+                  buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def total(self, name: str, **labels) -> float:
+        """Counter total by name, 0 if nothing has registered it yet"""
+        metric = self._metrics.get(name)
+        return metric.total(**labels) if isinstance(metric, Counter) else 0.0
+
+    def add_collector(self, collect):
+        """collect() -> iterable of (name, help, labels dict, value), read at scrape time
+
+        Names ending in ``_total`` are exported as counters, the rest as gauges.
+        """
+        self._collectors.append(collect)
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(f'{name}{labels} {_value_text(value)}' for name, labels, value in metric.samples())
+
+        gauges = {}
+        for collect in self._collectors:
+            try:
+                for name, help_text, labels, value in collect():
+                    gauges.setdefault(name, (help_text, []))[1].append((labels, value))
+            except Exception as e:
+                lines.append(f'# collector error: {e}')
+        for name, (help_text, values) in sorted(gauges.items()):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {"counter" if name.endswith("_total") else "gauge"}')
+            for labels, value in values:
+                names = tuple(labels)
+                label_text = _label_text(names, tuple(labels[n] for n in names))
+                lines.append(f'{name}{label_text} {_value_text(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Zero every metric; the objects modules hold stay registered and exported"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+metrics = MetricsRegistry(enabled=os.environ.get('FISHERIES_METRICS', '1') != '0')
+
+STAGE_SECONDS = metrics.histogram('fisheries_stage_seconds',
+                                  'Wall time of pipeline stages', labels=('stage',))
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block into fisheries_stage_seconds{stage=...}"""
+    if not metrics.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def timed(stage: str):
+    """Decorator form of span() for stage methods"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        return wrapper
+    return decorate
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval
+
+    Meant to be switched on for a single request: start() in the request
+    thread, stop() at the end, then collapsed() gives ``frame;frame;frame
+    count`` lines that flamegraph tools read directly.
+    """
+
+    def __init__(self, interval: float = 0.002, thread_id: int = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks = StackCounter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self.thread_id = self.thread_id or threading.get_ident()
+        self._sampler = threading.Thread(target=self._run, daemon=True)
+        self._sampler.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        return self
+
+    def collapsed(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(self.collapsed())
+
+
+if __name__ == "__main__":
+    requests_total = metrics.counter('demo_requests_total', 'Demo requests', labels=('route',))
+    for route in ('/a', '/a', '/b'):
+        requests_total.inc(route=route)
+        with span('demo.sleep'):
+            time.sleep(0.003)
+
+    profiler = SamplingProfiler(interval=0.001).start()
+    sum(i * i for i in range(2_000_000))
+    profiler.stop()
+
+    print(metrics.render_prometheus())
+    print(f"Profile: {profiler.samples} samples, top stack:")
+    print(profiler.collapsed().splitlines()[0])
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules import their siblings as top-level packages (data_processing, ai_models, ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+from sklearn.ensemble import RandomForestRegressor
+
+from ai_models.compiled_forest import CompiledForest
+
+
+def ocean_features(n_rows, seed):
+    """sst / chlorophyll / month / season-like features, as float64 like a DataFrame gives"""
+    rng = np.random.default_rng(seed)
+    month = rng.integers(1, 13, n_rows)
+    return np.column_stack([
+        rng.normal(28.5, 1.0, n_rows),
+        rng.gamma(2.0, 0.3, n_rows),
+        month,
+        (month % 12 + 3) // 3,
+    ]).astype(np.float64)
+
+
+def target(X, seed):
+    rng = np.random.default_rng(seed)
+    return np.clip(0.3 * (X[:, 0] - 27) + 0.4 * X[:, 1] + rng.normal(0, 0.05, len(X)), 0, 1)
+
+
+@pytest.mark.parametrize('params', [
+    {'n_estimators': 25, 'max_depth': 8},
+    {'n_estimators': 10, 'max_depth': None, 'min_samples_leaf': 1},
+    {'n_estimators': 1, 'max_depth': 3},
+])
+def test_predict_is_bit_identical_to_sklearn(params):
+    X_train, X_test = ocean_features(2000, seed=0), ocean_features(5000, seed=1)
+    model = RandomForestRegressor(random_state=42, **params).fit(X_train, target(X_train, 2))
+    compiled = CompiledForest.from_sklearn(model)
+    np.testing.assert_array_equal(compiled.predict(X_test), model.predict(X_test))
+
+
+def test_predict_matches_on_threshold_values_and_float32_inputs():
+    X_train = ocean_features(1000, seed=3)
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X_train, target(X_train, 4))
+    compiled = CompiledForest.from_sklearn(model)
+    # Rows sitting exactly on split thresholds exercise the <= comparison and float32 rounding
+    thresholds = model.estimators_[0].tree_.threshold
+    features = model.estimators_[0].tree_.feature
+    X = np.repeat(ocean_features(1, seed=5), (features >= 0).sum(), axis=0)
+    X[np.arange(len(X)), features[features >= 0]] = thresholds[features >= 0]
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+    X32 = ocean_features(500, seed=6).astype(np.float32)
+    np.testing.assert_array_equal(compiled.predict(X32), model.predict(X32))
+
+
+def test_predict_matches_with_missing_values():
+    X_train = ocean_features(2000, seed=7)
+    X_train[::17, 1] = np.nan
+    model = RandomForestRegressor(n_estimators=15, max_depth=10, random_state=1).fit(
+        X_train, target(np.nan_to_num(X_train), 8))
+    compiled = CompiledForest.from_sklearn(model)
+    X_test = ocean_features(3000, seed=9)
+    X_test[::5, 1] = np.nan
+    np.testing.assert_array_equal(compiled.predict(X_test), model.predict(X_test))
+
+
+def test_rejects_wrong_feature_count():
+    X_train = ocean_features(200, seed=10)
+    compiled = CompiledForest.from_sklearn(
+        RandomForestRegressor(n_estimators=2, random_state=0).fit(X_train, target(X_train, 11)))
+    with pytest.raises(ValueError):
+        compiled.predict(X_train[:, :3])
@@ -0,0 +1,75 @@
+import itertools
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from regulatory_engine.compliance_checker import FisheriesCompliance
+
+SPECIES = ['tuna', 'skipjack', 'anchovy', 'marlin']
+GEAR = ['hand_line', 'purse_seine', 'dynamite', 'poison']
+CATCHES = [0.0, 4999.5, 5000.0, 10000.0, 10000.5, 25000.0]
+LOCATIONS = [
+    (106.0, -6.0),     # open water off Jakarta
+    (130.5, -0.8),     # Raja Ampat core (no-take)
+    (130.0, 0.0),      # Raja Ampat traditional zone, outside the core
+    (119.5, -8.6),     # Komodo core (no-take)
+    (95.30, 5.85),     # Marine Protected Area 1 (no-take)
+    (95.45, 5.75),     # on the corner of Marine Protected Area 1
+]
+
+
+@pytest.fixture(scope='module')
+def compliance():
+    return FisheriesCompliance()
+
+
+def trip_grid(months, locations=True):
+    rows = []
+    for species, month, gear, catch in itertools.product(SPECIES, months, GEAR, CATCHES):
+        row = {'species': species, 'date': f'2024-{month:02d}-15', 'gear_type': gear,
+               'proposed_catch': catch}
+        if locations:
+            for lon, lat in LOCATIONS:
+                rows.append({**row, 'lon': lon, 'lat': lat})
+        else:
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def single(compliance, trip, location):
+    return compliance.check_fishing_approval(
+        species=trip['species'],
+        location=location,
+        date=datetime.strptime(trip['date'], '%Y-%m-%d'),
+        gear_type=trip['gear_type'],
+        proposed_catch=trip['proposed_catch']
+    )
+
+
+def test_check_batch_matches_single_checks(compliance):
+    trips = trip_grid(months=range(1, 13))
+    batch = compliance.check_batch(trips)
+    assert len(batch) == len(trips)
+    for i, trip in trips.iterrows():
+        expected = single(compliance, trip, [trip['lon'], trip['lat']])
+        assert bool(batch.at[i, 'approved']) == expected['approved'], trip.to_dict()
+        assert batch.at[i, 'violations'] == expected['violations'], trip.to_dict()
+        assert batch.at[i, 'sustainability_score'] == expected['sustainability_score']
+
+
+def test_check_batch_without_locations_matches_single_checks(compliance):
+    trips = trip_grid(months=[1, 3, 6], locations=False)
+    batch = compliance.check_batch(trips)
+    for i, trip in trips.iterrows():
+        expected = single(compliance, trip, None)
+        assert bool(batch.at[i, 'approved']) == expected['approved']
+        assert batch.at[i, 'violations'] == expected['violations']
+
+
+def test_grid_covers_every_violation_kind(compliance):
+    violations = [v for row in compliance.check_batch(trip_grid(months=[1, 6]))['violations'] for v in row]
+    assert any(v.startswith('Closed season') for v in violations)
+    assert any(v == 'Prohibited gear type' for v in violations)
+    assert any('exceeds' in v for v in violations)
+    assert any(v.startswith('Location inside no-take zone') for v in violations)
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip('flask')
+
+from dashboard import app as dashboard
+from utils.metrics import metrics
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    metrics.reset()
+    dashboard.components.response_cache.clear()
+    return dashboard.app.test_client()
+
+
+def test_compliance_checks_count_requests_including_cache_hits(client):
+    query = {'species': 'tuna', 'date': '2024-03-01', 'gear_type': 'longline', 'proposed_catch': 100}
+    for _ in range(5):
+        assert client.post('/api/compliance-check', json=query).status_code == 200
+    stats = client.get('/api/dashboard-stats').json
+    if metrics.enabled:
+        assert stats['compliance_checks'] == 5
+        assert metrics.total('fisheries_compliance_evaluations_total') == 1
+
+
+def test_predictions_count_requests_not_rows(client):
+    query = {'species': 'tuna', 'start_date': '2024-03-01', 'end_date': '2024-03-05', 'mode': 'sync'}
+    for _ in range(3):
+        assert client.post('/api/fish-prediction', json=query).status_code == 200
+    stats = client.get('/api/dashboard-stats').json
+    if metrics.enabled:
+        assert stats['total_predictions'] == 3
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from data_processing.data_cleaner import DataCleaner
+
+
+def overlapping_chunks(frame, size, overlap):
+    start = 0
+    while start < len(frame):
+        end = min(start + size, len(frame))
+        yield frame.iloc[max(0, start - overlap):end]
+        start = end
+
+
+def daily_frame(days=120, cells=40):
+    dates = pd.date_range('2024-01-01', periods=days)
+    return pd.DataFrame({'date': np.repeat(dates, cells), 'sst': np.tile(np.arange(cells, dtype=float), days)})
+
+
+def test_incremental_dedupe_matches_whole_frame_dedupe():
+    frame = daily_frame()
+    cleaner = DataCleaner()
+    streamed = pd.concat([cleaner.drop_duplicates(chunk, incremental=True)
+                          for chunk in overlapping_chunks(frame, size=500, overlap=120)])
+    assert streamed.equals(frame.drop_duplicates())
+
+
+def test_incremental_dedupe_forgets_days_outside_the_window():
+    frame = daily_frame(days=100, cells=10)
+    cleaner = DataCleaner(dedupe_window_days=5)
+    for chunk in overlapping_chunks(frame, size=100, overlap=0):
+        cleaner.drop_duplicates(chunk, incremental=True)
+    assert len(cleaner.seen_rows) == 6 * 10
+    cleaner.reset_dedupe()
+    assert len(cleaner.seen_rows) == 0
+    assert len(cleaner.drop_duplicates(frame.tail(10), incremental=True)) == 10
+
+
+def test_incremental_dedupe_without_dates():
+    rng = np.random.default_rng(0)
+    cleaner = DataCleaner()
+    kept = pd.concat([cleaner.drop_duplicates(pd.DataFrame({'x': rng.integers(0, 3000, 500)}), incremental=True)
+                      for _ in range(30)])
+    assert kept['x'].is_unique
+    assert len(kept) == len(cleaner.seen_rows)
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from data_processing.feature_engine import OceanFeatureEngine
+from data_processing.satellite_loader import OceanGrid
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'src', 'data_processing', 'feature_engine.py')
+
+
+def cloudy_grid(days=70, seed=0):
+    """Random fields with a permanently masked land cell and scattered cloud gaps"""
+    rng = np.random.default_rng(seed)
+    shape = (days, 6, 8)
+    sst = rng.normal(28, 1.5, shape).astype(np.float32)
+    chlorophyll = rng.lognormal(-1, 0.5, shape).astype(np.float32)
+    cloud = rng.random(shape) < 0.2
+    sst[cloud] = np.nan
+    chlorophyll[cloud | (rng.random(shape) < 0.1)] = np.nan
+    sst[:, 2, 3] = chlorophyll[:, 2, 3] = np.nan
+    dates = np.arange(np.datetime64('2024-01-01'), np.datetime64('2024-01-01') + days)
+    return OceanGrid(dates, np.arange(-2.5, 3.5), np.arange(100.5, 108.5),
+                     {'sst': sst, 'chlorophyll': chlorophyll}, resolution=1.0)
+
+
+def days_of(grid, days):
+    return OceanGrid(grid.dates[days], grid.lats, grid.lons,
+                     {name: cube[days] for name, cube in grid.variables.items()}, grid.resolution)
+
+
+def test_daily_updates_match_a_full_transform(tmp_path):
+    grid = cloudy_grid()
+    full = OceanFeatureEngine.for_grid(grid).fit_climatology(grid).transform(grid, chunk_days=16)
+
+    engine = OceanFeatureEngine.for_grid(grid).fit_climatology(grid)
+    engine.transform(days_of(grid, slice(0, 20)))
+    state_path = str(tmp_path / 'state.npz')
+    for day in range(20, len(grid.dates)):
+        if day == 45:
+            # Persisting mid-stream must not change the results
+            engine.save(state_path)
+            engine = OceanFeatureEngine.load(state_path)
+        features = engine.update(grid.dates[day], {name: grid[name][day] for name in engine.variables})
+        for feature, field in features.items():
+            np.testing.assert_allclose(field, full[feature][day], rtol=1e-5, atol=1e-6,
+                                       err_msg=f'{feature} on day {day}')
+
+
+def test_update_refuses_a_day_already_processed():
+    grid = cloudy_grid(days=10)
+    engine = OceanFeatureEngine.for_grid(grid)
+    engine.transform(grid)
+    with pytest.raises(ValueError, match='not after the last processed day'):
+        engine.update(grid.dates[-1], {name: grid[name][-1] for name in engine.variables})
+
+
+def test_cli_rerun_for_a_processed_day_is_a_no_op(tmp_path):
+    command = [sys.executable, SCRIPT, '--date', '2024-03-01', '--history-days', '5', '--resolution', '1.0',
+               '--state', str(tmp_path / 'state.npz')]
+    first = subprocess.run(command, cwd=tmp_path, capture_output=True, text=True, timeout=120)
+    assert first.returncode == 0, first.stderr
+    state = (tmp_path / 'state.npz').read_bytes()
+
+    rerun = subprocess.run(command, cwd=tmp_path, capture_output=True, text=True, timeout=120)
+    assert rerun.returncode == 0, rerun.stderr
+    assert 'already processed' in rerun.stdout
+    assert (tmp_path / 'state.npz').read_bytes() == state
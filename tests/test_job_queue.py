@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+import time
+
+from dashboard.job_queue import JobFiles, JobQueue
+from utils.metrics import metrics
+
+
+def echo_work(params, files):
+    files.start(total=1)
+    files.advance(1)
+    return json.dumps(params).encode()
+
+
+def blocking_work(params, files):
+    params['release'].wait(10)
+    return b'{}'
+
+
+def wait_done(jobs, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while jobs.status(job_id)['state'] in ('queued', 'running'):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def age(files, seconds):
+    past = time.time() - seconds
+    for path in files.paths():
+        if os.path.exists(path):
+            os.utime(path, (past, past))
+
+
+def test_cleanup_deletes_results_past_their_ttl(tmp_path):
+    jobs = JobQueue(echo_work, str(tmp_path), result_ttl_seconds=60)
+    for job_id in ('old', 'new'):
+        jobs.submit(job_id, {'job': job_id})
+        wait_done(jobs, job_id)
+    age(jobs.files('old'), 120)
+
+    assert jobs.cleanup() == 1
+    assert jobs.status('old') is None and jobs.result('old') is None
+    assert jobs.result('new') == b'{"job": "new"}'
+    jobs.shutdown()
+
+
+def test_cleanup_evicts_least_recently_used_over_the_size_cap(tmp_path):
+    jobs = JobQueue(echo_work, str(tmp_path), result_ttl_seconds=3600)
+    for n, job_id in enumerate(('a', 'b', 'c')):
+        jobs.submit(job_id, {'job': job_id})
+        wait_done(jobs, job_id)
+        age(jobs.files(job_id), 30 - n)
+    jobs.submit('a', {'job': 'a'})  # a cached hit marks 'a' as recently used
+    jobs.max_result_bytes = sum(os.path.getsize(path) for job_id in ('a', 'c')
+                                for path in jobs.files(job_id).paths() if os.path.exists(path))
+
+    assert jobs.cleanup() == 1
+    assert jobs.result('b') is None
+    assert jobs.result('a') is not None and jobs.result('c') is not None
+    jobs.shutdown()
+
+
+def test_queued_job_is_kept_alive_for_sibling_workers(tmp_path):
+    release = threading.Event()
+    jobs = JobQueue(blocking_work, str(tmp_path), max_workers=1, stale_seconds=0.2)
+    jobs.submit('busy', {'release': release})
+    jobs.submit('waiting', {'release': release})
+    sibling = JobQueue(blocking_work, str(tmp_path), stale_seconds=0.2)
+    time.sleep(0.5)
+
+    assert jobs.status('waiting')['state'] == 'queued'
+    assert sibling._pending_elsewhere(sibling.files('waiting'))
+    release.set()
+    jobs.shutdown()
+    sibling.shutdown()
+
+
+def test_jobs_cancelled_at_shutdown_are_recorded(tmp_path):
+    cancelled = metrics.total('fisheries_jobs_total', outcome='cancelled')
+    release = threading.Event()
+    jobs = JobQueue(blocking_work, str(tmp_path), max_workers=1)
+    jobs.submit('running', {'release': release})
+    jobs.submit('queued', {'release': release})
+    jobs._pool.shutdown(wait=False, cancel_futures=True)
+    release.set()
+    jobs.shutdown()
+    assert jobs.stats()['pending'] == 0
+    if metrics.enabled:
+        assert metrics.total('fisheries_jobs_total', outcome='cancelled') == cancelled + 1
+
+
+def test_touch_does_not_rewrite_progress(tmp_path):
+    files = JobFiles(str(tmp_path), 'job')
+    files.queued()
+    before = files.read_progress()
+    time.sleep(0.01)
+    files.touch()
+    assert files.read_progress() == before
+    assert files.last_update(before) > before['updated']
@@ -0,0 +1,29 @@
+from utils.metrics import MetricsRegistry
+
+
+def test_large_counters_are_exported_exactly():
+    registry = MetricsRegistry()
+    rows = registry.counter('rows_total', 'Rows', labels=('species',))
+    rows.inc(1234567, species='tuna')
+    rows.inc(2 ** 40 + 1, species='skipjack')
+    seconds = registry.histogram('seconds', 'Latency', buckets=(0.5,))
+    seconds.observe(0.1234567891)
+    registry.add_collector(lambda: [('cache_bytes', 'Bytes', {}, 9876543210)])
+
+    text = registry.render_prometheus()
+    assert 'rows_total{species="tuna"} 1234567\n' in text
+    assert f'rows_total{{species="skipjack"}} {2 ** 40 + 1}\n' in text
+    assert 'seconds_sum 0.1234567891\n' in text
+    assert 'cache_bytes 9876543210\n' in text
+    assert 'e+' not in text
+
+
+def test_reset_zeroes_metrics_but_keeps_exporting_them():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests')
+    requests.inc(5)
+    registry.reset()
+    assert registry.total('requests_total') == 0
+    requests.inc()
+    assert registry.total('requests_total') == 1
+    assert 'requests_total 1\n' in registry.render_prometheus()
@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+joblib = pytest.importorskip('joblib')
+
+from ai_models.model_registry import ModelRegistry
+
+
+def test_a_slow_load_blocks_neither_other_keys_nor_loads_twice(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path))
+    registry.publish({'model': 'tuna'}, 'tuna', version='1')
+    registry.publish({'model': 'skipjack'}, 'skipjack', version='1')
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.get('skipjack') == {'model': 'skipjack'}
+
+    loading, release, loads = threading.Event(), threading.Event(), []
+    original = joblib.load
+
+    def slow_load(path, **kwargs):
+        loads.append(path)
+        loading.set()
+        release.wait(5)
+        return original(path, **kwargs)
+
+    monkeypatch.setattr(joblib, 'load', slow_load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('tuna'))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert loading.wait(5)
+
+    # The registry lock is free while tuna unpickles
+    served = []
+    reader = threading.Thread(target=lambda: served.append((registry.get('skipjack'), registry.stats())))
+    reader.start()
+    reader.join(1)
+    blocked = reader.is_alive()
+    release.set()
+    reader.join()
+    assert not blocked
+    assert served[0][0] == {'model': 'skipjack'}
+    for thread in threads:
+        thread.join()
+    assert results == [{'model': 'tuna'}] * 3
+    assert len(loads) == 1
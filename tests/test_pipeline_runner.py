@@ -0,0 +1,61 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from pipeline_runner import PipelineRunner
+
+AOI = {'lat_min': -2.0, 'lat_max': 2.0, 'lon_min': 100.0, 'lon_max': 104.0}
+
+
+def scrambled_stages(runner, fail_on=None):
+    """Stand-in stages that finish out of order; 'clean' raises for the chunk starting on fail_on"""
+    jitter = random.Random(0)
+
+    def run_stage(stage, payload):
+        time.sleep(jitter.uniform(0, 0.02))
+        if stage == 'load':
+            start_date, end_date, aoi = payload
+            return pd.DataFrame({'date': [start_date], 'lat': [aoi['lat_min']], 'lon': [aoi['lon_min']]})
+        if stage == 'clean' and payload['date'].iloc[0] == fail_on:
+            raise RuntimeError(f"bad chunk {fail_on:%Y-%m-%d}")
+        return payload
+
+    runner.run_stage = run_stage
+
+
+def make_runner(tmp_path, **kwargs):
+    return PipelineRunner(data_dir=str(tmp_path / 'raw'), model_dir=str(tmp_path / 'models'),
+                          resolution=1.0, chunk_days=2, tile_degrees=2.0, queue_size=1,
+                          workers={'load': 3, 'clean': 2, 'predict': 3}, **kwargs)
+
+
+def test_output_rows_follow_chunk_order_with_parallel_stages(tmp_path):
+    runner = make_runner(tmp_path)
+    scrambled_stages(runner)
+    start, end = datetime(2024, 3, 1), datetime(2024, 3, 10)
+    output = tmp_path / 'out.csv'
+    summary = runner.run(start, end, AOI, str(output))
+
+    expected = [(f"{chunk_start:%Y-%m-%d}", tile['lat_min'], tile['lon_min'])
+                for chunk_start, _, tile in runner.chunks(start, end, AOI)]
+    written = pd.read_csv(output)
+    assert summary['chunks'] == len(expected) == 20
+    assert list(written.itertuples(index=False, name=None)) == expected
+
+
+def test_chunk_failure_stops_the_run_and_writes_nothing(tmp_path):
+    runner = make_runner(tmp_path)
+    scrambled_stages(runner, fail_on=datetime(2024, 3, 5))
+    threads_before = threading.active_count()
+    output = tmp_path / 'out.csv'
+
+    with pytest.raises(RuntimeError, match='bad chunk 2024-03-05'):
+        runner.run(datetime(2024, 3, 1), datetime(2024, 3, 30), AOI, str(output))
+    assert not output.exists()
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    assert threading.active_count() == threads_before
@@ -0,0 +1,109 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sklearn')
+from sklearn.ensemble import RandomForestRegressor
+
+from ai_models.fish_predictor import FEATURES, FishLocationPredictor
+from ai_models.prediction_lut import PredictionLUT
+
+# Coarse grid so a build takes milliseconds
+COARSE = {'sst_step': 0.5, 'chlorophyll_step': 0.25}
+
+
+def ocean_conditions(n_rows, seed):
+    rng = np.random.default_rng(seed)
+    month = rng.integers(1, 13, n_rows)
+    return pd.DataFrame({'sst': rng.uniform(24, 32, n_rows), 'chlorophyll': rng.uniform(0, 2, n_rows),
+                         'month': month, 'season': (month % 12 + 3) // 3})
+
+
+def published_predictor(tmp_path, max_error):
+    predictor = FishLocationPredictor(str(tmp_path), inference='lut',
+                                      lut_options={**COARSE, 'max_error': max_error})
+    X = ocean_conditions(500, seed=0)[FEATURES]
+    model = RandomForestRegressor(n_estimators=5, max_depth=4, random_state=0).fit(
+        X, np.clip((X['sst'] - 24) / 8, 0, 1))
+    version = predictor.registry.publish(model, 'tuna', 'default')
+    return predictor, model, version
+
+
+def test_request_path_never_builds_a_table(tmp_path, monkeypatch):
+    predictor, model, version = published_predictor(tmp_path, max_error=1.0)
+    monkeypatch.setattr(PredictionLUT, 'build', classmethod(lambda *args, **kwargs: pytest.fail('built')))
+
+    assert predictor.lut(model, 'tuna') is None
+    results = predictor.predict_fish_locations(ocean_conditions(50, seed=1), 'tuna')
+    np.testing.assert_allclose(results['tuna_probability'],
+                               model.predict(ocean_conditions(50, seed=1)[FEATURES]).astype(np.float32))
+
+
+def test_prepare_lut_saves_a_table_the_request_path_loads(tmp_path):
+    predictor, model, version = published_predictor(tmp_path, max_error=1.0)
+    assert predictor.prepare_lut(model, 'tuna') is not None
+    assert os.path.exists(predictor.lut_path('tuna', 'default', version))
+
+    sibling = FishLocationPredictor(str(tmp_path), inference='lut',
+                                    lut_options={**COARSE, 'max_error': 1.0})
+    assert sibling.lut(model, 'tuna') is not None
+
+
+def test_gate_failure_raises_at_build_time_and_is_not_retried(tmp_path, monkeypatch):
+    predictor, model, version = published_predictor(tmp_path, max_error=0.0)
+    with pytest.raises(ValueError, match='max error'):
+        predictor.build_lut(model, 'tuna', 'default', version)
+    assert not os.path.exists(predictor.lut_path('tuna', 'default', version))
+
+    monkeypatch.setattr(PredictionLUT, 'build', classmethod(lambda *args, **kwargs: pytest.fail('rebuilt')))
+    assert predictor.prepare_lut(model, 'tuna') is None
+    assert predictor.lut(model, 'tuna') is None
+
+
+def test_concurrent_prepare_builds_once(tmp_path, monkeypatch):
+    predictor, model, version = published_predictor(tmp_path, max_error=1.0)
+    builds = []
+    original = PredictionLUT.build.__func__
+
+    def counting_build(cls, *args, **kwargs):
+        builds.append(1)
+        return original(cls, *args, **kwargs)
+
+    monkeypatch.setattr(PredictionLUT, 'build', classmethod(counting_build))
+    threads = [threading.Thread(target=predictor.prepare_lut, args=(model, 'tuna')) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+
+
+def test_gate_failure_falls_back_to_the_exact_model(tmp_path):
+    predictor, model, version = published_predictor(tmp_path, max_error=0.0)
+    assert predictor.prepare_lut(model, 'tuna') is None
+    conditions = ocean_conditions(300, seed=2)
+    results = predictor.predict_fish_locations(conditions.copy(), 'tuna')
+    np.testing.assert_array_equal(results['tuna_probability'],
+                                  model.predict(conditions[FEATURES]).astype(np.float32))
+
+
+def test_default_forest_passes_the_default_gate(tmp_path):
+    from ai_models.fish_predictor import fit_random_forest
+    from ai_models.training_features import TrainingFeatureBuilder
+    from data_processing.data_cleaner import DataCleaner
+    from data_processing.satellite_loader import SatelliteDataLoader
+
+    aoi = {'lat_min': -11.0, 'lat_max': 6.0, 'lon_min': 95.0, 'lon_max': 141.0}
+    cells = SatelliteDataLoader(use_cache=False).load_gridded_data(
+        pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-20'), aoi, 1.0).to_frame()
+    training = TrainingFeatureBuilder().build(DataCleaner().clean_ocean_data(cells))
+    model, _ = fit_random_forest(training[FEATURES], training['tuna_probability'])
+
+    predictor = FishLocationPredictor(str(tmp_path), inference='lut')
+    version = predictor.registry.publish(model, 'tuna', 'default')
+    lut = predictor.prepare_lut(model, 'tuna', sample=training)
+    assert lut is not None and lut.max_error <= 0.05
+    assert os.path.exists(predictor.lut_path('tuna', 'default', version))
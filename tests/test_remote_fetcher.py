@@ -0,0 +1,141 @@
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+pytest.importorskip('requests')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from data_processing import remote_fetcher
+from data_processing.remote_fetcher import RemoteTileFetcher
+from data_processing.satellite_cache import SatelliteCache
+from data_processing.satellite_loader import SatelliteDataLoader
+from fake_satellite_server import FakeSatelliteServer
+
+RESOLUTION = 0.25
+TILE = (0, 2)
+DATES = np.arange(np.datetime64('2024-01-01'), np.datetime64('2024-01-04'))
+
+
+def expected_tile(variable, date, tile=TILE, size=128):
+    loader = SatelliteDataLoader(use_cache=False)
+    return loader._synthesize(variable, np.array([date]), np.arange(tile[0] * size, (tile[0] + 1) * size),
+                              np.arange(tile[1] * size, (tile[1] + 1) * size), RESOLUTION)[0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SatelliteCache(str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping through them"""
+    delays = []
+    monkeypatch.setattr(remote_fetcher.time, 'sleep', delays.append)
+    return delays
+
+
+def fetch(server, cache, variables=('sst',), dates=DATES[:1], **options):
+    fetcher = RemoteTileFetcher(server.url, cache, max_workers=1, **options)
+    try:
+        return fetcher.fetch(variables, dates, RESOLUTION, [TILE]), fetcher.stats()
+    finally:
+        fetcher.close()
+
+
+def test_fetches_tiles_and_skips_cached_ones(cache):
+    with FakeSatelliteServer() as server:
+        summary, _ = fetch(server, cache, ('sst', 'chlorophyll'), DATES)
+        assert (summary['fetched'], summary['failed']) == (6, [])
+        for variable in ('sst', 'chlorophyll'):
+            for date in DATES:
+                np.testing.assert_array_equal(cache.get(variable, date, RESOLUTION, TILE),
+                                              expected_tile(variable, date))
+        requests_before = server.stats()['requests']
+        again, _ = fetch(server, cache, ('sst', 'chlorophyll'), DATES)
+        assert (again['fetched'], again['skipped']) == (0, 6)
+        assert server.stats()['requests'] == requests_before
+
+
+def test_resumes_dropped_download_with_range_request(cache, sleeps):
+    with FakeSatelliteServer(faults=['drop']) as server:
+        summary, stats = fetch(server, cache)
+        assert summary['fetched'] == 1
+        assert stats['resumed'] == 1 and stats['retries'] == 1
+        assert server.stats()['range_requests'] == 1
+        sent = server.stats()['bytes']
+    # Half the body on the first attempt, the rest on the resumed one: at most the
+    # partial read block lost with the connection is sent twice
+    size = os.path.getsize(cache.tile_path('sst', DATES[0], RESOLUTION, TILE))
+    assert size <= sent < size + RemoteTileFetcher(server.url, cache).chunk_bytes
+    np.testing.assert_array_equal(cache.get('sst', DATES[0], RESOLUTION, TILE), expected_tile('sst', DATES[0]))
+    assert not os.path.exists(cache.tile_path('sst', DATES[0], RESOLUTION, TILE) + '.part')
+
+
+def test_retries_transient_errors_with_exponential_backoff(cache, sleeps):
+    with FakeSatelliteServer(faults=['error', 'error', 'error']) as server:
+        summary, stats = fetch(server, cache, backoff_seconds=0.1, retries=4)
+        assert summary['fetched'] == 1 and stats['retries'] == 3
+        assert server.stats()['errors'] == 3
+    # Delay n is backoff * 2**n with ±50% jitter
+    assert len(sleeps) == 3
+    for attempt, delay in enumerate(sleeps):
+        assert 0.05 * 2 ** attempt <= delay <= 0.15 * 2 ** attempt
+
+
+def test_gives_up_after_retries_and_caches_nothing(cache, sleeps):
+    with FakeSatelliteServer(faults=['error'] * 3) as server:
+        summary, stats = fetch(server, cache, retries=2)
+        assert summary['fetched'] == 0 and len(summary['failed']) == 1
+        assert 'HTTP 503' in summary['failed'][0][1]
+        assert stats['failed'] == 1 and server.stats()['requests'] == 3
+    assert not cache.contains('sst', DATES[0], RESOLUTION, TILE)
+
+
+def test_missing_tile_is_not_retried(cache, sleeps):
+    with FakeSatelliteServer() as server:
+        summary, stats = fetch(server, cache, variables=('salinity',))
+        assert len(summary['failed']) == 1 and 'HTTP 404' in summary['failed'][0][1]
+        assert stats['retries'] == 0 and sleeps == []
+
+
+def test_loader_serves_failed_downloads_as_nan_and_caches_nothing(tmp_path, sleeps, caplog):
+    aoi = {'lat_min': -10.0, 'lat_max': -5.0, 'lon_min': 100.0, 'lon_max': 105.0}
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 2)
+    with FakeSatelliteServer(faults=['error'] * 100) as server:
+        loader = SatelliteDataLoader(str(tmp_path / 'satellite'), remote_url=server.url, fetch_workers=1)
+        loader.fetcher.retries = 0
+        degraded = loader.load_gridded_data(start, end, aoi)
+        assert degraded.degraded and degraded.missing_tiles == 4
+        assert all(np.isnan(degraded[name]).all() for name in ('sst', 'chlorophyll'))
+        assert degraded.to_daily_frame().attrs['missing_tiles'] == 4
+        assert loader.cache.stats()['tiles'] == 0
+        assert 'failed and load as NaN' in caplog.text
+        server._scripted.clear()
+
+        # Once the server recovers the same load downloads the real tiles
+        recovered = loader.load_gridded_data(start, end, aoi)
+        assert not recovered.degraded
+        assert loader.cache.stats()['tiles'] == 4
+        assert loader.fetcher.stats()['fetched'] == 4
+        loader.fetcher.close()
+    expected = SatelliteDataLoader(use_cache=False).load_gridded_data(start, end, aoi)
+    for name in ('sst', 'chlorophyll'):
+        np.testing.assert_array_equal(recovered[name], expected[name])
+
+
+def test_repeated_fetches_reuse_sessions_and_connections(cache):
+    with FakeSatelliteServer() as server:
+        fetcher = RemoteTileFetcher(server.url, cache, max_workers=4)
+        try:
+            for date in DATES:
+                fetcher.fetch(('sst', 'chlorophyll'), [date], RESOLUTION, [(0, 2), (0, 3)])
+            assert len(fetcher._sessions) <= 4
+            assert server.stats()['connections'] <= 4
+            assert server.stats()['requests'] == len(DATES) * 4
+        finally:
+            fetcher.close()
+        assert fetcher._sessions == []
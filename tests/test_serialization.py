@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from ai_models.fish_predictor import recommendation_labels
+from dashboard.response_cache import ResponseCache
+from dashboard.serialization import RunningSummary, prediction_fields, summarize, to_columns
+
+
+def predictions_frame():
+    """Three cells per day for six days; days 0, 2 and 3 have at least one HIGH cell"""
+    dates = np.repeat(pd.date_range('2024-03-01', periods=6), 3)
+    probability = np.full(len(dates), 0.5, dtype=np.float32)
+    probability[[0, 1, 7, 9]] = 0.9
+    recommendation = np.where(probability > 0.7, 'HIGH', 'MEDIUM')
+    return pd.DataFrame({'date': dates, 'tuna_probability': probability, 'recommendation': recommendation})
+
+
+def test_high_probability_days_counts_dates_not_cells():
+    summary = summarize(predictions_frame(), 'tuna')
+    assert summary['high_recommendations'] == 4
+    assert summary['high_probability_days'] == 3
+
+
+def test_running_summary_matches_summarize_over_date_windows():
+    predictions = predictions_frame()
+    running = RunningSummary('tuna')
+    for start in range(0, len(predictions), 6):
+        running.update(predictions.iloc[start:start + 6])
+    assert running.result() == summarize(predictions, 'tuna')
+
+
+def test_float32_columns_are_published_at_short_decimals():
+    frame = pd.DataFrame({'date': pd.date_range('2024-03-01', periods=3),
+                          'sst': np.array([28.7, 30.05, np.nan], dtype=np.float32),
+                          'chlorophyll': np.array([0.25, 1.1, 0.0], dtype=np.float32),
+                          'tuna_probability': np.array([0.7, 0.123456, 1.0], dtype=np.float32),
+                          'recommendation': ['MEDIUM', 'LOW', 'HIGH']})
+    columns = to_columns(frame, prediction_fields('tuna'))
+    assert columns['sst'][:2] == [28.7, 30.05]
+    assert np.isnan(columns['sst'][2])
+    assert columns['chlorophyll'] == [0.25, 1.1, 0.0]
+    assert columns['probability'] == [0.7, 0.12346, 1.0]
+
+
+def test_labels_agree_with_the_published_probability():
+    # float64 predictions around the bins, several of which float32 + rounding publish as exactly 0.4 / 0.7
+    predictions = np.concatenate([0.7 + np.linspace(-2e-6, 2e-6, 401), 0.4 + np.linspace(-2e-6, 2e-6, 401)])
+    frame = pd.DataFrame({'date': pd.Timestamp('2024-03-01'),
+                          'tuna_probability': predictions.astype(np.float32),
+                          'recommendation': recommendation_labels(predictions.astype(np.float32))})
+    published = np.array(to_columns(frame, {'probability': 'tuna_probability'})['probability'])
+    expected = np.where(published > 0.7, 'HIGH', np.where(published > 0.4, 'MEDIUM', 'LOW'))
+    np.testing.assert_array_equal(frame['recommendation'].astype(str).to_numpy(), expected)
+
+
+def test_response_cache_returns_meta_on_hits():
+    cache = ResponseCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return b'{}', {'high_probability_days': 3}
+
+    first = cache.get_or_compute('key', compute, meta=True)
+    second = cache.get_or_compute('key', compute, meta=True)
+    assert first == second
+    assert second[2] == {'high_probability_days': 3}
+    assert len(calls) == 1
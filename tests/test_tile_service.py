@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.tile_service import BIN_NODATA, DEFAULT_AOI, TILE_SIZE, TileService, tiles_covering
+from data_processing.satellite_loader import SatelliteDataLoader
+
+DATE = '2024-03-01'
+
+
+class CountingLoader(SatelliteDataLoader):
+    def __init__(self, data_dir):
+        super().__init__(data_dir, resolution=1.0, use_cache=False)
+        self.builds = 0
+
+    def load_gridded_data(self, *args, **kwargs):
+        self.builds += 1
+        return super().load_gridded_data(*args, **kwargs)
+
+
+def north_high_predictor(version='v1'):
+    """0.9 north of the equator, 0.1 south of it"""
+    def predict_species_batch(frame, species):
+        return frame.assign(**{f'{species[0]}_probability': np.where(frame['lat'] > 0, 0.9, 0.1)})
+    return SimpleNamespace(registry=SimpleNamespace(latest_version=lambda species: version),
+                           predict_species_batch=predict_species_batch)
+
+
+def make_service(tmp_path, predictor=None):
+    cleaner = SimpleNamespace(clean_ocean_data=lambda frame: frame)
+    return TileService(CountingLoader(str(tmp_path / 'raw')), cleaner, predictor or north_high_predictor(),
+                       cache_dir=str(tmp_path / 'tiles'), resolution=1.0)
+
+
+def pixel_centres(z, x, y):
+    n = 2 ** z
+    pixel = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+    lons = (x + pixel) / n * 360 - 180
+    lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + pixel) / n))))
+    return lats[:, None], lons[None, :]
+
+
+def test_tiles_hold_data_exactly_inside_the_aoi(tmp_path):
+    service = make_service(tmp_path)
+    z = 4
+    covering = set(tiles_covering(DEFAULT_AOI, z))
+    for x in range(2 ** z):
+        for y in range(2 ** z):
+            body, _ = service.get_tile('tuna', DATE, z, x, y, 'bin')
+            codes = np.frombuffer(body, dtype=np.uint8).reshape(TILE_SIZE, TILE_SIZE)
+            lats, lons = pixel_centres(z, x, y)
+            inside = ((lats >= DEFAULT_AOI['lat_min']) & (lats < DEFAULT_AOI['lat_max']) &
+                      (lons >= DEFAULT_AOI['lon_min']) & (lons < DEFAULT_AOI['lon_max']))
+            expected = np.where(inside, np.where(lats > 0, round(0.9 * 254), round(0.1 * 254)), BIN_NODATA)
+            np.testing.assert_array_equal(codes, expected, err_msg=f'tile {z}/{x}/{y}')
+            assert ((x, y) in covering) == bool(inside.any())
+
+
+@pytest.mark.parametrize('z, x, y', [(-1, 0, 0), (13, 0, 0), (3, 8, 0), (3, 0, 8), (3, -1, 0)])
+def test_out_of_range_tiles_are_rejected(tmp_path, z, x, y):
+    with pytest.raises(ValueError, match='out of range'):
+        make_service(tmp_path).get_tile('tuna', DATE, z, x, y)
+
+
+def test_tiles_are_cached_in_memory_then_on_disk_per_model_version(tmp_path):
+    service = make_service(tmp_path)
+    first = service.get_tile('tuna', DATE, 5, 27, 15)
+    assert service.get_tile('tuna', DATE, 5, 27, 15) == first
+    service.get_tile('tuna', DATE, 5, 28, 15)
+    stats = service.stats()
+    assert (service.data_loader.builds, stats['rendered'], stats['memory']['hits']) == (1, 2, 1)
+
+    # A fresh process reads tiles and the pyramid back from disk
+    restarted = make_service(tmp_path)
+    assert restarted.get_tile('tuna', DATE, 5, 27, 15) == first
+    restarted.get_tile('tuna', DATE, 5, 27, 16)
+    stats = restarted.stats()
+    assert (restarted.data_loader.builds, stats['rendered'], stats['disk_hits']) == (0, 1, 1)
+
+    # A new model version never serves the old tiles
+    retrained = make_service(tmp_path, north_high_predictor(version='v2'))
+    retrained.get_tile('tuna', DATE, 5, 27, 15)
+    assert (retrained.data_loader.builds, retrained.stats()['rendered']) == (1, 1)
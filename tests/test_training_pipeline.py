@@ -0,0 +1,78 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sklearn')
+
+from ai_models import training_pipeline
+from ai_models.training_pipeline import TrainingOrchestrator
+
+SMALL_FOREST = {'n_estimators': 3, 'max_depth': 3}
+
+
+def training_frame(n_rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    month = rng.integers(1, 13, n_rows)
+    frame = pd.DataFrame({'sst': rng.uniform(24, 32, n_rows), 'chlorophyll': rng.uniform(0, 2, n_rows),
+                          'month': month, 'season': (month % 12 + 3) // 3})
+    frame['tuna_probability'] = np.clip((frame['sst'] - 24) / 8, 0, 1)
+    frame['region'] = np.where(frame['sst'] > 28, 'WPP-A', 'WPP-B')
+    return frame
+
+
+def recorded_blocks(monkeypatch):
+    """Capture every _SharedArrays the orchestrator creates"""
+    created = []
+    original = training_pipeline._SharedArrays.__init__
+
+    def recording_init(self, arrays):
+        original(self, arrays)
+        created.append(self)
+
+    monkeypatch.setattr(training_pipeline._SharedArrays, '__init__', recording_init)
+    return created
+
+
+def assert_released(shared):
+    for block_name, _, _ in shared.specs.values():
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=block_name)
+
+
+def test_rerun_with_unchanged_inputs_skips_every_job(tmp_path):
+    orchestrator = TrainingOrchestrator(str(tmp_path), max_workers=2, hyperparams=SMALL_FOREST)
+    frame = training_frame()
+    first = orchestrator.run(frame, ['tuna'])
+    assert [(r['region'], r['status']) for r in first] == [
+        ('WPP-A', 'trained'), ('WPP-B', 'trained'), ('default', 'trained')]
+
+    second = orchestrator.run(frame, ['tuna'])
+    assert {r['status'] for r in second} == {'skipped'}
+    assert [r['version'] for r in second] == [r['version'] for r in first]
+
+    # Changing one area's rows retrains that area and the all-rows model only
+    frame.loc[frame['region'] == 'WPP-B', 'chlorophyll'] += 0.1
+    third = {r['region']: r['status'] for r in orchestrator.run(frame, ['tuna'])}
+    assert third == {'WPP-A': 'skipped', 'WPP-B': 'trained', 'default': 'trained'}
+
+
+def test_shared_feature_matrix_is_float32_and_released(tmp_path, monkeypatch):
+    created = recorded_blocks(monkeypatch)
+    orchestrator = TrainingOrchestrator(str(tmp_path), max_workers=1, hyperparams=SMALL_FOREST)
+    orchestrator.run(training_frame(), ['tuna'], regions=['default'])
+
+    assert len(created) == 1
+    assert np.dtype(created[0].specs['X'][2]) == np.float32
+    assert_released(created[0])
+
+
+def test_shared_feature_matrix_is_released_when_jobs_fail(tmp_path, monkeypatch):
+    created = recorded_blocks(monkeypatch)
+    orchestrator = TrainingOrchestrator(str(tmp_path), max_workers=1,
+                                        hyperparams={**SMALL_FOREST, 'n_estimators': -1})
+    reports = orchestrator.run(training_frame(), ['tuna'], regions=['default'])
+
+    assert [r['status'] for r in reports] == ['failed']
+    assert_released(created[0])
@@ -0,0 +1,60 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from regulatory_engine.vessel_monitor import VesselTrackMonitor
+
+# Recorded-CSV style reports: missing gear, ISO-string times and missing positions
+CSV = """vessel_id,time,lon,lat,gear,species
+KM-001,2024-01-10T05:00:00,106.0,-6.0,,tuna
+KM-002,2024-01-10T05:00:00,106.0,-6.0,longline,tuna
+KM-003,2024-01-10T05:00:00,,,longline,tuna
+KM-004,2024-01-10T06:00:00,130.5,-0.8,hand_line,skipjack
+KM-004,2024-01-10T07:00:00,130.5,-0.8,hand_line,skipjack
+KM-005,2024-03-10T06:00:00,130.5,,none,skipjack
+KM-006,2024-06-01T00:00:00,119.5,-8.6,purse_seine,anchovy
+KM-001,2024-01-10T08:00:00,106.0,-6.0,longline,tuna
+"""
+
+
+def events_key(events):
+    return [(event['event'], event['vessel_id'], event.get('zone'), event.get('species'))
+            for event in events]
+
+
+def test_process_and_process_frame_agree_on_csv_reports():
+    frame = pd.read_csv(io.StringIO(CSV))
+    single = VesselTrackMonitor()
+    one_by_one = [event for report in frame.itertuples(index=False) for event in single.process(*report)]
+    chunked = VesselTrackMonitor().process_frame(frame)
+    assert events_key(one_by_one) == events_key(chunked)
+    assert events_key(chunked) == [
+        ('closed_season', 'KM-002', None, 'tuna'),
+        ('closed_season', 'KM-003', None, 'tuna'),
+        ('enter_no_take', 'KM-004', 'Raja Ampat Core Zone', None),
+        ('enter_no_take', 'KM-006', 'Komodo Core Zone', None),
+        ('closed_season', 'KM-006', None, 'anchovy'),
+        ('closed_season', 'KM-001', None, 'tuna'),
+    ]
+
+
+def test_epoch_seconds_and_datetimes_give_the_same_months():
+    frame = pd.read_csv(io.StringIO(CSV))
+    seconds = (pd.to_datetime(frame['time']) - pd.Timestamp('1970-01-01')) // pd.Timedelta(seconds=1)
+    as_epoch = frame.assign(time=seconds)
+    as_datetime = frame.assign(time=pd.to_datetime(frame['time']).dt.to_pydatetime())
+    expected = events_key(VesselTrackMonitor().process_frame(frame))
+    for variant in (as_epoch, as_datetime):
+        monitor = VesselTrackMonitor()
+        assert events_key([e for r in variant.itertuples(index=False) for e in monitor.process(*r)]) == expected
+        assert events_key(VesselTrackMonitor().process_frame(variant)) == expected
+
+
+def test_non_finite_positions_are_outside_every_zone():
+    index = VesselTrackMonitor().zone_index
+    assert index.locate(np.nan, -0.8) == -1
+    assert index.locate(130.5, np.inf) == -1
+    assert index.query(np.nan, np.nan) == []
+    located = index.locate_points([130.5, np.nan, 130.5], [-0.8, -0.8, np.nan], 'no_take')
+    assert located[0] >= 0 and list(located[1:]) == [-1, -1]